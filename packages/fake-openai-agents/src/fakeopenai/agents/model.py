@@ -2,13 +2,31 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import base64
+import dataclasses
+import functools
+import json
+import math
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Iterable
 from typing import Any
+from typing import Literal
+from typing import cast
 from typing import override
 
 from agents import realtime as rt
+from agents.realtime import audio_formats as rt_formats
+from agents.realtime import items as rt_items
 from agents.realtime import model_events
 from agents.realtime import model_inputs
 from fakeopenai.agents import idgen
+from fakeopenai.agents import recording
+from openai.types.realtime import conversation_item_created_event
+from openai.types.realtime import conversation_item_truncated_event
+from openai.types.realtime import input_audio_buffer_cleared_event
+from openai.types.realtime import input_audio_buffer_committed_event
+from openai.types.realtime import input_audio_buffer_speech_started_event
 from openai.types.realtime import realtime_audio_config as rt_audio_config
 from openai.types.realtime import realtime_audio_config_input as rt_audio_config_input
 from openai.types.realtime import realtime_audio_config_output as rt_audio_config_output
@@ -16,9 +34,225 @@ from openai.types.realtime import realtime_audio_formats as rt_audio_formats
 from openai.types.realtime import (
     realtime_audio_input_turn_detection as rt_audio_input_turn_detection,
 )
+from openai.types.realtime import (
+    realtime_conversation_item_function_call_output as rt_function_call_output,
+)
+from openai.types.realtime import realtime_conversation_item_user_message as rt_user_message
+from openai.types.realtime import realtime_error
+from openai.types.realtime import realtime_error_event
+from openai.types.realtime import realtime_response
+from openai.types.realtime import realtime_response_status
 from openai.types.realtime import realtime_session_create_request as rt_session_create_request
+from openai.types.realtime import response_audio_delta_event
+from openai.types.realtime import response_audio_done_event
+from openai.types.realtime import response_created_event
+from openai.types.realtime import response_done_event
 from openai.types.realtime import session_created_event
 from openai.types.realtime import session_updated_event
+from pydantic import BaseModel
+
+AUDIO_BYTES_PER_MS = 24000 * 2 / 1000
+
+# Bytes per millisecond of the 8 kHz G.711 input formats once decoded to 16-bit samples.
+G711_BYTES_PER_MS = 8000 * 2 / 1000
+
+# G.711 input is decoded like by langgolem.audio.g711, which this package does not depend on.
+_ULAW_BIAS = 0x84
+
+
+def _decode_ulaw(code: int) -> int:
+    code = ~code & 0xFF
+    magnitude = (((code & 0x0F) << 3) + _ULAW_BIAS) << ((code & 0x70) >> 4)
+    return _ULAW_BIAS - magnitude if code & 0x80 else magnitude - _ULAW_BIAS
+
+
+def _decode_alaw(code: int) -> int:
+    code ^= 0x55
+    segment = (code & 0x70) >> 4
+    magnitude = (((code & 0x0F) << 4) + (8 if segment == 0 else 0x108)) << max(segment - 1, 0)
+    return magnitude if code & 0x80 else -magnitude
+
+
+@functools.cache
+def _g711_table(ulaw: bool) -> tuple[bytes, ...]:
+    """Little-endian 16-bit sample of each G.711 code."""
+    decode = _decode_ulaw if ulaw else _decode_alaw
+    return tuple(decode(code).to_bytes(2, "little", signed=True) for code in range(1 << 8))
+
+
+def _decode_g711(audio: bytes, *, ulaw: bool) -> bytes:
+    table = _g711_table(ulaw)
+    return b"".join(table[code] for code in audio)
+
+
+@functools.cache
+def _created_session() -> rt_session_create_request.RealtimeSessionCreateRequest:
+    """Session as it is created by the server, before the golem configures it."""
+    return rt_session_create_request.RealtimeSessionCreateRequest(
+        type="realtime",
+        model="gpt-realtime",
+        output_modalities=["audio"],
+        instructions="fake-instructions",
+        tools=[],
+        tool_choice="auto",
+        tracing=None,
+        truncation="auto",
+        prompt=None,
+        audio=rt_audio_config.RealtimeAudioConfig(
+            input=rt_audio_config_input.RealtimeAudioConfigInput(
+                format=rt_audio_formats.AudioPCM(rate=24000, type="audio/pcm"),
+                transcription=None,
+                noise_reduction=None,
+                turn_detection=rt_audio_input_turn_detection.ServerVad(
+                    type="server_vad",
+                    threshold=0.5,
+                    prefix_padding_ms=300,
+                    silence_duration_ms=200,
+                    idle_timeout_ms=None,
+                    create_response=True,
+                    interrupt_response=True,
+                ),
+            ),
+            output=rt_audio_config_output.RealtimeAudioConfigOutput(
+                format=rt_audio_formats.AudioPCM(rate=24000, type="audio/pcm"),
+                voice="alloy",
+                speed=1.0,
+            ),
+        ),
+        include=None,
+    )
+
+
+@functools.cache
+def _initial_session() -> rt_session_create_request.RealtimeSessionCreateRequest:
+    """Session as it is after the golem has configured it on connect.
+
+    Shared by all models. It must never be modified; take a deep copy instead.
+    """
+    session = _created_session().model_copy(deep=True)
+    session.instructions = "fake-golem-instructions"
+    assert session.audio is not None
+    assert session.audio.input is not None
+    session.audio.input.turn_detection = rt_audio_input_turn_detection.SemanticVad(
+        type="semantic_vad",
+        eagerness="auto",
+        create_response=True,
+        interrupt_response=True,
+    )
+    return session
+
+
+def _session_event_payload(
+    event: session_created_event.SessionCreatedEvent | session_updated_event.SessionUpdatedEvent,
+    session_id: str,
+) -> dict[str, Any]:
+    model_dict = event.model_dump()
+    model_dict["session"].update({"id": session_id, "object": "realtime.session"})
+    return model_dict
+
+
+@functools.cache
+def _initial_session_payloads() -> tuple[str, str]:
+    """Pre-serialized session.created and session.updated events returned on connect.
+
+    Payloads are stored as JSON so that each connect gets its own copy from a single fast
+    parse. Event and session IDs are placeholders to be replaced in the parsed payload.
+    """
+    created = session_created_event.SessionCreatedEvent(
+        type="session.created", event_id="", session=_created_session()
+    )
+    updated = session_updated_event.SessionUpdatedEvent(
+        type="session.updated", event_id="", session=_initial_session()
+    )
+    return (
+        json.dumps(_session_event_payload(created, "")),
+        json.dumps(_session_event_payload(updated, "")),
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class ProcessingDelays:
+    """Simulated server processing time, in seconds, for each kind of send event.
+
+    Events are processed by the fake server in the order they are sent, so a slow event delays
+    all events sent after it. Events with no delay sent while nothing is waiting to be processed
+    are handled before `send_event` returns.
+
+    Attributes:
+        audio: Delay before appended audio is processed.
+        session_update: Delay before a session update is applied.
+        user_input: Delay before a user message is added to the conversation.
+        tool_output: Delay before a tool output is added to the conversation.
+        interrupt: Delay before an interrupt cancels the active response.
+        raw_message: Delay before a raw client message is processed.
+        response: Time between a response being created and being done, after any audio.
+        audio_delta: Time between generated response audio deltas.
+    """
+
+    audio: float = 0.0
+    session_update: float = 0.0
+    user_input: float = 0.0
+    tool_output: float = 0.0
+    interrupt: float = 0.0
+    raw_message: float = 0.0
+    response: float = 0.0
+    audio_delta: float = 0.0
+
+    def for_event(self, event: rt.RealtimeModelSendEvent) -> float:
+        """Get the processing delay for a send event."""
+        match event:
+            case model_inputs.RealtimeModelSendAudio():
+                return self.audio
+            case model_inputs.RealtimeModelSendSessionUpdate():
+                return self.session_update
+            case model_inputs.RealtimeModelSendUserInput():
+                return self.user_input
+            case model_inputs.RealtimeModelSendToolOutput():
+                return self.tool_output
+            case model_inputs.RealtimeModelSendInterrupt():
+                return self.interrupt
+            case model_inputs.RealtimeModelSendRawMessage():
+                return self.raw_message
+            case _:
+                return 0.0
+
+
+@dataclasses.dataclass(frozen=True)
+class Truncation:
+    """Accounting of response audio cut short by an interruption.
+
+    Attributes:
+        response_id: Response the audio was generated for.
+        item_id: Assistant item holding the audio.
+        reason: Whether the server detected user speech or the client interrupted.
+        generated_ms: Milliseconds of audio generated for the item before the interruption.
+        played_ms: Milliseconds of that audio the client had played.
+        stop_latency: Seconds from the server detecting user speech until the client
+            interrupted playback, or None if the client has not reacted.
+    """
+
+    response_id: str
+    item_id: str
+    reason: Literal["turn_detected", "client_cancelled"]
+    generated_ms: float
+    played_ms: float
+    stop_latency: float | None = None
+
+    @property
+    def truncated_ms(self) -> float:
+        return self.generated_ms - self.played_ms
+
+
+@dataclasses.dataclass
+class _AudioItem:
+    response_id: str
+    item_id: str
+    generated_bytes: int = 0
+    first_delta_time: float | None = None
+
+    @property
+    def generated_ms(self) -> float:
+        return self.generated_bytes / AUDIO_BYTES_PER_MS
 
 
 class FakeRealtimeModel(rt.RealtimeModel):
@@ -32,24 +266,100 @@ class FakeRealtimeModel(rt.RealtimeModel):
 
     @property
     def pending_audio(self) -> bytes:
+        """Audio received since the last commit, with G.711 audio decoded to 16-bit PCM."""
         return bytes(self.__pending_audio)
 
     @property
     def committed_audio(self) -> bytes:
+        """Audio committed so far, with G.711 audio decoded to 16-bit PCM."""
         return bytes(self.__committed_audio)
 
-    def __init__(self):
+    @property
+    def delays(self) -> ProcessingDelays:
+        return self.__delays
+
+    @property
+    def session(self) -> rt_session_create_request.RealtimeSessionCreateRequest | None:
+        if self.__session_id is None:
+            return None
+        if self.__session is None:
+            # Sessions are only copied from the template once they are needed.
+            self.__session = _initial_session().model_copy(deep=True)
+        return self.__session
+
+    @property
+    def response_active(self) -> bool:
+        return self.__response_id is not None
+
+    @property
+    def processing_backlog(self) -> int:
+        return self.__processing_backlog
+
+    @property
+    def truncations(self) -> tuple[Truncation, ...]:
+        return tuple(self.__truncations)
+
+    @property
+    def generated_audio_ms(self) -> float:
+        return self.__generated_audio_bytes / AUDIO_BYTES_PER_MS
+
+    @property
+    def truncated_audio_ms(self) -> float:
+        return sum(t.truncated_ms for t in self.__truncations)
+
+    @property
+    def played_audio_ms(self) -> float:
+        """Generated audio that was played, assuming uninterrupted audio is played in full."""
+        return self.generated_audio_ms - self.truncated_audio_ms
+
+    def __init__(
+        self,
+        *,
+        delays: ProcessingDelays | None = None,
+        response_audio: bytes = b"",
+        audio_delta_size: int = 4800,
+    ):
+        """Create a fake model.
+
+        Args:
+            delays: Simulated server processing delays.
+            response_audio: 24 kHz 16-bit mono audio the model speaks in every response.
+            audio_delta_size: Maximum number of bytes in each response audio delta.
+        """
+        if audio_delta_size <= 0:
+            raise ValueError("audio_delta_size must be positive")
+        self.__delays = delays or ProcessingDelays()
+        self.__response_audio = response_audio
+        self.__audio_delta_size = audio_delta_size
         self.__return_queue = asyncio.Queue[model_events.RealtimeModelEvent]()
         self.__return_task: asyncio.Task[None] | None = None
         self.__listeners: list[rt.RealtimeModelListener] = []
 
+        self.__process_queue = asyncio.Queue[tuple[float, rt.RealtimeModelSendEvent]]()
+        self.__process_task: asyncio.Task[None] | None = None
+        self.__processing_backlog = 0
+        self.__processing_error: Exception | None = None
+
         self.__event_ids = idgen.IdGenerator("event")
         self.__session_ids = idgen.IdGenerator("sess")
+        self.__item_ids = idgen.IdGenerator("item")
+        self.__response_ids = idgen.IdGenerator("resp")
 
-        self.__sessions: dict[str, rt_session_create_request.RealtimeSessionCreateRequest] = {}
+        self.__session_id: str | None = None
+        self.__session: rt_session_create_request.RealtimeSessionCreateRequest | None = None
 
         self.__pending_audio = bytearray()
         self.__committed_audio = bytearray()
+        self.__last_item_id: str | None = None
+
+        self.__response_id: str | None = None
+        self.__response_task: asyncio.Task[None] | None = None
+
+        self.__playback_tracker: rt.RealtimePlaybackTracker | None = None
+        self.__audio_item: _AudioItem | None = None
+        self.__generated_audio_bytes = 0
+        self.__truncations: list[Truncation] = []
+        self.__speech_started_time: float | None = None
 
     @override
     async def connect(self, options: rt.RealtimeModelConfig):
@@ -58,53 +368,24 @@ class FakeRealtimeModel(rt.RealtimeModel):
         if self.is_connected:
             raise AssertionError("Already connected")
         self.__return_task = asyncio.create_task(self.__send_return_messages())
+        self.__process_task = asyncio.create_task(self.__process_send_events())
+        self.__last_item_id = None
+        self.__playback_tracker = options.get("playback_tracker")
+        self.__audio_item = None
+        self.__generated_audio_bytes = 0
+        self.__truncations.clear()
+        self.__speech_started_time = None
 
-        session = rt_session_create_request.RealtimeSessionCreateRequest(
-            type="realtime",
-            model="gpt-realtime",
-            output_modalities=["audio"],
-            instructions="fake-instructions",
-            tools=[],
-            tool_choice="auto",
-            tracing=None,
-            truncation="auto",
-            prompt=None,
-            audio=rt_audio_config.RealtimeAudioConfig(
-                input=rt_audio_config_input.RealtimeAudioConfigInput(
-                    format=rt_audio_formats.AudioPCM(rate=24000, type="audio/pcm"),
-                    transcription=None,
-                    noise_reduction=None,
-                    turn_detection=rt_audio_input_turn_detection.ServerVad(
-                        type="server_vad",
-                        threshold=0.5,
-                        prefix_padding_ms=300,
-                        silence_duration_ms=200,
-                        idle_timeout_ms=None,
-                        create_response=True,
-                        interrupt_response=True,
-                    ),
-                ),
-                output=rt_audio_config_output.RealtimeAudioConfigOutput(
-                    format=rt_audio_formats.AudioPCM(rate=24000, type="audio/pcm"),
-                    voice="alloy",
-                    speed=1.0,
-                ),
-            ),
-            include=None,
-        )
+        session_id = self.__session_ids.next()
+        self.__session_id = session_id
+        self.__session = None
 
-        session_id = self.__create_session(session)
-
-        session.instructions = "fake-golem-instructions"
-        assert session.audio is not None
-        assert session.audio.input is not None
-        session.audio.input.turn_detection = rt_audio_input_turn_detection.SemanticVad(
-            type="semantic_vad",
-            eagerness="auto",
-            create_response=True,
-            interrupt_response=True,
-        )
-        self.__update_session(session_id)
+        created_payload, updated_payload = _initial_session_payloads()
+        for payload in (created_payload, updated_payload):
+            message = json.loads(payload)
+            message["event_id"] = self.__event_ids.next()
+            message["session"]["id"] = session_id
+            self.__return_server_message(message)
 
     def add_listener(self, listener: rt.RealtimeModelListener) -> None:
         """Add a listener to the model."""
@@ -120,15 +401,26 @@ class FakeRealtimeModel(rt.RealtimeModel):
     async def send_event(self, event: rt.RealtimeModelSendEvent):
         if not self.is_connected:
             raise AssertionError("Not connected")
-        match event:
-            case model_inputs.RealtimeModelSendAudio() as send_audio:
-                self.__pending_audio.extend(send_audio.audio)
-                if send_audio.commit:
-                    self.__committed_audio.extend(self.__pending_audio)
-                    self.__pending_audio.clear()
+        delay = self.__delays.for_event(event)
+        if delay <= 0 and self.__processing_backlog == 0:
+            self.__process_send_event(event)
+        else:
+            self.__processing_backlog += 1
+            self.__process_queue.put_nowait((delay, event))
 
-            case _:
-                raise NotImplementedError()
+    async def wait_processed(self):
+        """Wait until all sent events have been processed by the fake server.
+
+        Events sent after one whose processing failed are still processed.
+
+        Raises:
+            Exception: The first error processing a delayed event since the last wait.
+        """
+        while self.__processing_backlog:
+            await self.__process_queue.join()
+        if (error := self.__processing_error) is not None:
+            self.__processing_error = None
+            raise error
 
     @override
     async def close(self):
@@ -143,45 +435,531 @@ class FakeRealtimeModel(rt.RealtimeModel):
             while not self.__return_queue.empty():
                 self.__return_queue.get_nowait()
 
-            self.__sessions.clear()
+            assert self.__process_task is not None
+            self.__process_task.cancel()
+            try:
+                await self.__process_task
+            except asyncio.CancelledError:
+                pass
+            self.__process_task = None
+            while not self.__process_queue.empty():
+                self.__process_queue.get_nowait()
+                self.__process_queue.task_done()
+            self.__processing_backlog = 0
+            self.__processing_error = None
+
+            if self.__response_task is not None:
+                self.__response_task.cancel()
+                try:
+                    await self.__response_task
+                except asyncio.CancelledError:
+                    pass
+                self.__response_task = None
+            self.__response_id = None
+            self.__audio_item = None
 
-    def __return_session_event(
+            self.__session_id = None
+            self.__session = None
+
+    def start_user_speech(self):
+        """Simulate server turn detection hearing the user start to speak.
+
+        If the model has audio that may still be playing, the client is told that it was
+        interrupted and how much of it had been played is recorded as a truncation. When the
+        session's turn detection has `interrupt_response` set, the server also truncates the
+        item and cancels any active response. The time until the client then interrupts is
+        recorded as the truncation's stop latency.
+        """
+        if not self.is_connected:
+            raise AssertionError("Not connected")
+        item_id, _ = self.__next_item_id()
+        audio_bytes = len(self.__committed_audio) + len(self.__pending_audio)
+        self.__return_server_event(
+            input_audio_buffer_speech_started_event.InputAudioBufferSpeechStartedEvent(
+                type="input_audio_buffer.speech_started",
+                event_id=self.__event_ids.next(),
+                item_id=item_id,
+                audio_start_ms=int(audio_bytes / self.__input_bytes_per_ms()),
+            )
+        )
+
+        audio_item = self.__audio_item
+        if audio_item is None:
+            return
+        self.__speech_started_time = asyncio.get_running_loop().time()
+        self.return_message(
+            model_events.RealtimeModelAudioInterruptedEvent(
+                item_id=audio_item.item_id, content_index=0
+            )
+        )
+        truncation = self.__truncate(audio_item, "turn_detected")
+
+        session = self.session
+        assert session is not None and session.audio is not None
+        assert session.audio.input is not None
+        turn_detection = session.audio.input.turn_detection
+        if turn_detection is not None and turn_detection.interrupt_response:
+            self.__return_truncated(audio_item.item_id, truncation.played_ms)
+            self.__cancel_response("turn_detected")
+
+    async def replay(
         self,
-        session_id,
-        event: session_created_event.SessionCreatedEvent
-        | session_updated_event.SessionUpdatedEvent,
-    ):
-        model_dict = event.model_dump()
-        session_dict = model_dict["session"]
-
-        session_dict.update(
-            {
-                "id": session_id,
-                "object": "realtime.session",
-            }
+        records: Iterable[recording.Record],
+        *,
+        speed: float = 1.0,
+        on_send: Callable[[rt.RealtimeModelSendEvent], Awaitable[None]] | None = None,
+    ) -> int:
+        """Replay a recording against the connected listeners.
+
+        Received events are returned to listeners with the same relative timing they were
+        recorded with. Sent events are handed to `on_send`, if provided, so that callers may feed
+        recorded input back through the code under test.
+
+        Args:
+            records: Records to replay, usually from `recording.read_records`.
+            speed: Playback speed multiplier. `math.inf` replays without any delay.
+            on_send: Called with each recorded send event when it is due.
+
+        Returns:
+            Number of received events returned to listeners.
+
+        Raises:
+            ValueError: If speed is not positive.
+        """
+        if not speed > 0:
+            raise ValueError("speed must be positive")
+        if not self.is_connected:
+            raise AssertionError("Not connected")
+
+        loop = asyncio.get_running_loop()
+        start: float | None = None
+        first_time = 0.0
+        returned = 0
+        for record in records:
+            if start is None:
+                start = loop.time()
+                first_time = record.time
+            if not math.isinf(speed):
+                delay = start + (record.time - first_time) / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            match record.direction:
+                case recording.Direction.RECEIVE:
+                    self.return_message(record.event)
+                    returned += 1
+                case recording.Direction.SEND:
+                    if on_send is not None:
+                        await on_send(record.event)
+                case _ as direction:  # pragma: no cover
+                    raise AssertionError(f"Unknown direction: {direction!r}")
+        return returned
+
+    async def __process_send_events(self):
+        while True:
+            delay, event = await self.__process_queue.get()
+            try:
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self.__process_send_event(event)
+            except Exception as error:
+                # Keep processing, and leave the error for the next wait to raise.
+                if self.__processing_error is None:
+                    self.__processing_error = error
+            finally:
+                self.__processing_backlog -= 1
+                self.__process_queue.task_done()
+
+    def __process_send_event(self, event: rt.RealtimeModelSendEvent):
+        match event:
+            case model_inputs.RealtimeModelSendAudio() as send_audio:
+                self.__pending_audio.extend(self.__decode_input(send_audio.audio))
+                if send_audio.commit:
+                    self.__commit_audio()
+
+            case model_inputs.RealtimeModelSendSessionUpdate() as session_update:
+                self.__apply_session_settings(session_update.session_settings)
+
+            case model_inputs.RealtimeModelSendUserInput() as user_input:
+                self.__add_user_input(user_input.user_input)
+                self.__create_response()
+
+            case model_inputs.RealtimeModelSendToolOutput() as tool_output:
+                self.__add_tool_output(tool_output)
+                if tool_output.start_response:
+                    self.__create_response()
+
+            case model_inputs.RealtimeModelSendInterrupt():
+                self.__client_stopped_playback()
+                if (audio_item := self.__audio_item) is not None:
+                    truncation = self.__truncate(audio_item, "client_cancelled")
+                    if truncation.played_ms > 0:
+                        self.return_message(
+                            model_events.RealtimeModelAudioInterruptedEvent(
+                                item_id=audio_item.item_id, content_index=0
+                            )
+                        )
+                        self.__return_truncated(audio_item.item_id, truncation.played_ms)
+                self.__cancel_response("client_cancelled")
+
+            case model_inputs.RealtimeModelSendRawMessage() as raw_message:
+                self.__process_raw_message(raw_message.message)
+
+            case _:
+                raise NotImplementedError()
+
+    def __process_raw_message(self, message: model_inputs.RealtimeModelRawClientMessage):
+        match message["type"]:
+            case "input_audio_buffer.commit":
+                self.__commit_audio()
+            case "input_audio_buffer.clear":
+                self.__pending_audio.clear()
+                self.__return_server_event(
+                    input_audio_buffer_cleared_event.InputAudioBufferClearedEvent(
+                        type="input_audio_buffer.cleared", event_id=self.__event_ids.next()
+                    )
+                )
+            case "response.create":
+                self.__create_response()
+            case "response.cancel":
+                self.__cancel_response("client_cancelled")
+            case "conversation.item.truncate":
+                other_data = message.get("other_data", {})
+                self.__client_stopped_playback()
+                self.__return_truncated(other_data["item_id"], other_data["audio_end_ms"])
+            case _ as message_type:
+                self.__return_error(f"Unsupported client event type: {message_type}")
+
+    def __apply_session_settings(self, settings: rt.RealtimeSessionModelSettings):
+        session = self.session
+        assert session is not None
+        assert session.audio is not None
+        assert session.audio.input is not None
+        assert session.audio.output is not None
+
+        if "model_name" in settings:
+            session.model = settings["model_name"]
+        if "instructions" in settings:
+            session.instructions = settings["instructions"]
+        if "modalities" in settings:
+            session.output_modalities = settings["modalities"]
+        if "tool_choice" in settings:
+            session.tool_choice = cast(Any, settings["tool_choice"])
+        if "voice" in settings:
+            session.audio.output.voice = settings["voice"]
+        if "speed" in settings:
+            session.audio.output.speed = settings["speed"]
+        if (input_format := settings.get("input_audio_format")) is not None:
+            session.audio.input.format = rt_formats.to_realtime_audio_format(input_format)
+        if "turn_detection" in settings:
+            turn_detection = dict(settings["turn_detection"])
+            if turn_detection.get("type", "server_vad") == "semantic_vad":
+                session.audio.input.turn_detection = (
+                    rt_audio_input_turn_detection.SemanticVad.model_validate(turn_detection)
+                )
+            else:
+                turn_detection["type"] = "server_vad"
+                session.audio.input.turn_detection = (
+                    rt_audio_input_turn_detection.ServerVad.model_validate(turn_detection)
+                )
+        self.__update_session(session)
+
+    def __input_format(self) -> rt_audio_formats.RealtimeAudioFormats | None:
+        session = self.session
+        assert session is not None and session.audio is not None
+        assert session.audio.input is not None
+        return session.audio.input.format
+
+    def __input_bytes_per_ms(self) -> float:
+        match self.__input_format():
+            case rt_audio_formats.AudioPCMU() | rt_audio_formats.AudioPCMA():
+                return G711_BYTES_PER_MS
+            case _:
+                return AUDIO_BYTES_PER_MS
+
+    def __decode_input(self, audio: bytes) -> bytes:
+        """Decode received audio to 16-bit PCM, as the server does with G.711 audio."""
+        match self.__input_format():
+            case rt_audio_formats.AudioPCMU():
+                return _decode_g711(audio, ulaw=True)
+            case rt_audio_formats.AudioPCMA():
+                return _decode_g711(audio, ulaw=False)
+            case _:
+                return audio
+
+    def __next_item_id(self) -> tuple[str, str | None]:
+        previous_item_id = self.__last_item_id
+        self.__last_item_id = self.__item_ids.next()
+        return self.__last_item_id, previous_item_id
+
+    def __commit_audio(self):
+        self.__committed_audio.extend(self.__pending_audio)
+        self.__pending_audio.clear()
+        item_id, previous_item_id = self.__next_item_id()
+        self.__return_server_event(
+            input_audio_buffer_committed_event.InputAudioBufferCommittedEvent(
+                type="input_audio_buffer.committed",
+                event_id=self.__event_ids.next(),
+                item_id=item_id,
+                previous_item_id=previous_item_id,
+            )
         )
 
-        self.__return_server_message(model_dict)
+    def __add_user_input(self, user_input: model_inputs.RealtimeModelUserInput):
+        if isinstance(user_input, str):
+            texts: list[str | None] = [user_input]
+        else:
+            texts = [c.get("text") for c in user_input["content"] if c.get("type") == "input_text"]
+        item_id, previous_item_id = self.__next_item_id()
+        self.__return_server_event(
+            conversation_item_created_event.ConversationItemCreatedEvent(
+                type="conversation.item.created",
+                event_id=self.__event_ids.next(),
+                previous_item_id=previous_item_id,
+                item=rt_user_message.RealtimeConversationItemUserMessage(
+                    id=item_id,
+                    object="realtime.item",
+                    type="message",
+                    role="user",
+                    status="completed",
+                    content=[rt_user_message.Content(type="input_text", text=t) for t in texts],
+                ),
+            ),
+            model_events.RealtimeModelItemUpdatedEvent(
+                item=rt_items.UserMessageItem(
+                    item_id=item_id,
+                    previous_item_id=previous_item_id,
+                    content=[rt_items.InputText(text=t) for t in texts],
+                )
+            ),
+        )
 
-    def __create_session(
-        self, session: rt_session_create_request.RealtimeSessionCreateRequest
-    ) -> str:
-        session_id = self.__session_ids.next()
-        self.__sessions[session_id] = session
+    def __add_tool_output(self, tool_output: model_inputs.RealtimeModelSendToolOutput):
+        # The real model reports the completed tool call locally before the server responds.
+        self.return_message(
+            model_events.RealtimeModelItemUpdatedEvent(
+                item=rt_items.RealtimeToolCallItem(
+                    item_id=tool_output.tool_call.id or "",
+                    previous_item_id=tool_output.tool_call.previous_item_id,
+                    call_id=tool_output.tool_call.call_id,
+                    status="completed",
+                    arguments=tool_output.tool_call.arguments,
+                    name=tool_output.tool_call.name,
+                    output=tool_output.output,
+                )
+            )
+        )
+        item_id, previous_item_id = self.__next_item_id()
+        self.__return_server_event(
+            conversation_item_created_event.ConversationItemCreatedEvent(
+                type="conversation.item.created",
+                event_id=self.__event_ids.next(),
+                previous_item_id=previous_item_id,
+                item=rt_function_call_output.RealtimeConversationItemFunctionCallOutput(
+                    id=item_id,
+                    object="realtime.item",
+                    type="function_call_output",
+                    status="completed",
+                    call_id=tool_output.tool_call.call_id,
+                    output=tool_output.output,
+                ),
+            )
+        )
 
-        session_created = session_created_event.SessionCreatedEvent(
-            type="session.created", event_id=self.__event_ids.next(), session=session
+    def __create_response(self):
+        if self.__response_id is not None:
+            self.__return_error(
+                f"Conversation already has an active response in progress: {self.__response_id}",
+                code="conversation_already_has_active_response",
+            )
+            return
+        response_id = self.__response_ids.next()
+        self.__response_id = response_id
+        self.__return_server_event(
+            response_created_event.ResponseCreatedEvent(
+                type="response.created",
+                event_id=self.__event_ids.next(),
+                response=realtime_response.RealtimeResponse(
+                    id=response_id, object="realtime.response", status="in_progress", output=[]
+                ),
+            ),
+            model_events.RealtimeModelTurnStartedEvent(),
         )
-        self.__return_session_event(session_id, session_created)
-        return session_id
+        if self.__response_audio:
+            item_id, _ = self.__next_item_id()
+            self.__audio_item = _AudioItem(response_id=response_id, item_id=item_id)
+        if self.__delays.response > 0 or (self.__response_audio and self.__delays.audio_delta > 0):
+            self.__response_task = asyncio.create_task(self.__generate_response_later())
+        else:
+            for offset in range(0, len(self.__response_audio), self.__audio_delta_size):
+                self.__return_audio_delta(offset)
+            self.__finish_response("completed")
 
-    def __update_session(self, session_id):
-        session = self.__sessions[session_id]
+    async def __generate_response_later(self):
+        for offset in range(0, len(self.__response_audio), self.__audio_delta_size):
+            if self.__delays.audio_delta > 0:
+                await asyncio.sleep(self.__delays.audio_delta)
+            self.__return_audio_delta(offset)
+        if self.__delays.response > 0:
+            await asyncio.sleep(self.__delays.response)
+        self.__response_task = None
+        self.__finish_response("completed")
+
+    def __return_audio_delta(self, offset: int):
+        audio_item = self.__audio_item
+        assert audio_item is not None
+        delta = self.__response_audio[offset : offset + self.__audio_delta_size]
+        if audio_item.first_delta_time is None:
+            audio_item.first_delta_time = asyncio.get_running_loop().time()
+        audio_item.generated_bytes += len(delta)
+        self.__generated_audio_bytes += len(delta)
+        self.__return_server_event(
+            response_audio_delta_event.ResponseAudioDeltaEvent(
+                type="response.output_audio.delta",
+                event_id=self.__event_ids.next(),
+                response_id=audio_item.response_id,
+                item_id=audio_item.item_id,
+                output_index=0,
+                content_index=0,
+                delta=base64.b64encode(delta).decode("ascii"),
+            ),
+            model_events.RealtimeModelAudioEvent(
+                data=delta,
+                response_id=audio_item.response_id,
+                item_id=audio_item.item_id,
+                content_index=0,
+            ),
+        )
+        if offset + self.__audio_delta_size >= len(self.__response_audio):
+            self.__return_server_event(
+                response_audio_done_event.ResponseAudioDoneEvent(
+                    type="response.output_audio.done",
+                    event_id=self.__event_ids.next(),
+                    response_id=audio_item.response_id,
+                    item_id=audio_item.item_id,
+                    output_index=0,
+                    content_index=0,
+                ),
+                model_events.RealtimeModelAudioDoneEvent(
+                    item_id=audio_item.item_id, content_index=0
+                ),
+            )
+
+    def __cancel_response(self, reason: Literal["turn_detected", "client_cancelled"]):
+        if self.__response_id is None:
+            return
+        if self.__response_task is not None:
+            self.__response_task.cancel()
+            self.__response_task = None
+        self.__finish_response("cancelled", reason)
+
+    def __played_ms(self, audio_item: _AudioItem) -> float:
+        if self.__playback_tracker is not None:
+            state = self.__playback_tracker.get_state()
+            if state["current_item_id"] != audio_item.item_id:
+                return 0.0
+            played_ms = state["elapsed_ms"] or 0.0
+        elif audio_item.first_delta_time is None:
+            return 0.0
+        else:
+            # Like the real model, assume playback starts on the first delta at real-time speed.
+            loop_time = asyncio.get_running_loop().time()
+            played_ms = (loop_time - audio_item.first_delta_time) * 1000
+        return min(played_ms, audio_item.generated_ms)
+
+    def __truncate(
+        self, audio_item: _AudioItem, reason: Literal["turn_detected", "client_cancelled"]
+    ) -> Truncation:
+        truncation = Truncation(
+            response_id=audio_item.response_id,
+            item_id=audio_item.item_id,
+            reason=reason,
+            generated_ms=audio_item.generated_ms,
+            played_ms=self.__played_ms(audio_item),
+        )
+        self.__truncations.append(truncation)
+        self.__audio_item = None
+        if self.__playback_tracker is not None:
+            self.__playback_tracker.on_interrupted()
+        return truncation
+
+    def __return_truncated(self, item_id: str, audio_end_ms: float):
+        self.__return_server_event(
+            conversation_item_truncated_event.ConversationItemTruncatedEvent(
+                type="conversation.item.truncated",
+                event_id=self.__event_ids.next(),
+                item_id=item_id,
+                content_index=0,
+                audio_end_ms=int(audio_end_ms),
+            )
+        )
+
+    def __client_stopped_playback(self):
+        if self.__speech_started_time is None:
+            return
+        stop_latency = asyncio.get_running_loop().time() - self.__speech_started_time
+        self.__speech_started_time = None
+        for index in reversed(range(len(self.__truncations))):
+            truncation = self.__truncations[index]
+            if truncation.reason == "turn_detected":
+                if truncation.stop_latency is None:
+                    self.__truncations[index] = dataclasses.replace(
+                        truncation, stop_latency=stop_latency
+                    )
+                break
+
+    def __finish_response(
+        self,
+        status: Literal["completed", "cancelled"],
+        reason: Literal["turn_detected", "client_cancelled"] | None = None,
+    ):
+        assert self.__response_id is not None
+        response_id = self.__response_id
+        self.__response_id = None
+        status_details = None
+        if status == "cancelled":
+            status_details = realtime_response_status.RealtimeResponseStatus(
+                type="cancelled", reason=reason
+            )
+        self.__return_server_event(
+            response_done_event.ResponseDoneEvent(
+                type="response.done",
+                event_id=self.__event_ids.next(),
+                response=realtime_response.RealtimeResponse(
+                    id=response_id,
+                    object="realtime.response",
+                    status=status,
+                    status_details=status_details,
+                    output=[],
+                ),
+            ),
+            model_events.RealtimeModelTurnEndedEvent(),
+        )
+
+    def __return_error(self, message: str, *, code: str | None = None):
+        error = realtime_error.RealtimeError(
+            type="invalid_request_error", code=code, message=message
+        )
+        self.__return_server_event(
+            realtime_error_event.RealtimeErrorEvent(
+                type="error", event_id=self.__event_ids.next(), error=error
+            ),
+            model_events.RealtimeModelErrorEvent(error=error),
+        )
+
+    def __return_server_event(
+        self, event: BaseModel, *translated: model_events.RealtimeModelEvent
+    ):
+        self.__return_server_message(event.model_dump(exclude_none=True))
+        for translated_event in translated:
+            self.return_message(translated_event)
 
+    def __update_session(self, session: rt_session_create_request.RealtimeSessionCreateRequest):
+        assert self.__session_id is not None
         session_updated = session_updated_event.SessionUpdatedEvent(
             type="session.updated", event_id=self.__event_ids.next(), session=session
         )
-        self.__return_session_event(session_id, session_updated)
+        self.__return_server_message(_session_event_payload(session_updated, self.__session_id))
 
     def __return_server_message(self, message: dict[str, Any]):
         server_message = model_events.RealtimeModelRawServerEvent(data=message)
@@ -0,0 +1,187 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Append-only recording of realtime model event streams.
+
+A recording is a magic header followed by a sequence of length prefixed records. Each
+record holds the time it was written, whether the event was sent to or received from the
+model and the pickled event itself. Recordings may be replayed with
+`FakeRealtimeModel.replay`.
+"""
+
+import dataclasses
+import enum
+import pickle
+import struct
+import time
+from collections.abc import Callable
+from collections.abc import Iterator
+from typing import Any
+from typing import BinaryIO
+from typing import override
+
+from agents import realtime as rt
+from agents.realtime import model_events
+
+MAGIC = b"FRTREC\x00\x01"
+
+_RECORD_HEADER = struct.Struct("<dBI")
+
+
+class Direction(enum.IntEnum):
+    """Direction of a recorded event relative to the client."""
+
+    SEND = 0
+    RECEIVE = 1
+
+
+@dataclasses.dataclass(frozen=True)
+class Record:
+    """A single recorded event.
+
+    Attributes:
+        time: Seconds since the recording was started.
+        direction: Whether the event was sent or received by the client.
+        event: The recorded send event or model event.
+    """
+
+    time: float
+    direction: Direction
+    event: Any
+
+
+class RecordingError(Exception):
+    """Raised when a recording is malformed."""
+
+
+class RecordWriter:
+    """Writes records to an append-only binary stream.
+
+    The magic header is only written when the stream is empty so that several sessions may be
+    appended to the same file.
+
+    Args:
+        stream: Binary stream to write to. Should be opened in append mode.
+        clock: Monotonic clock used to timestamp records.
+    """
+
+    @property
+    def record_count(self) -> int:
+        """Number of records written by this writer."""
+        return self.__record_count
+
+    def __init__(self, stream: BinaryIO, *, clock: Callable[[], float] = time.monotonic):
+        self.__stream = stream
+        self.__clock = clock
+        self.__start = clock()
+        self.__record_count = 0
+        if stream.tell() == 0:
+            stream.write(MAGIC)
+
+    def write(self, direction: Direction, event: Any) -> Record:
+        """Append an event to the recording.
+
+        Args:
+            direction: Whether the event was sent or received by the client.
+            event: The event to record.
+
+        Returns:
+            The record that was written.
+        """
+        if isinstance(event, model_events.RealtimeModelExceptionEvent):
+            # Arbitrary exceptions are not necessarily picklable.
+            event = model_events.RealtimeModelExceptionEvent(
+                exception=RuntimeError(repr(event.exception)), context=event.context
+            )
+        record = Record(time=self.__clock() - self.__start, direction=direction, event=event)
+        payload = pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__stream.write(_RECORD_HEADER.pack(record.time, record.direction, len(payload)))
+        self.__stream.write(payload)
+        self.__record_count += 1
+        return record
+
+    def flush(self):
+        """Flush the underlying stream."""
+        self.__stream.flush()
+
+
+def read_records(stream: BinaryIO) -> Iterator[Record]:
+    """Read all records from a recording.
+
+    Recordings must only be read from trusted sources as records are unpickled.
+
+    Args:
+        stream: Binary stream positioned at the start of a recording.
+
+    Yields:
+        Each record in the order it was written.
+
+    Raises:
+        RecordingError: If the stream is not a recording or a record is truncated.
+    """
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise RecordingError("Not an event recording")
+    while header := stream.read(_RECORD_HEADER.size):
+        if len(header) != _RECORD_HEADER.size:
+            raise RecordingError("Truncated record header")
+        record_time, direction, length = _RECORD_HEADER.unpack(header)
+        payload = stream.read(length)
+        if len(payload) != length:
+            raise RecordingError("Truncated record payload")
+        yield Record(time=record_time, direction=Direction(direction), event=pickle.loads(payload))
+
+
+class RecordingModel(rt.RealtimeModel, rt.RealtimeModelListener):
+    """Realtime model that records all events passing through another model.
+
+    Args:
+        model: The model to delegate to.
+        writer: Writer that receives every sent and received event.
+    """
+
+    @property
+    def model(self) -> rt.RealtimeModel:
+        return self.__model
+
+    @property
+    def listeners(self) -> tuple[rt.RealtimeModelListener, ...]:
+        return tuple(self.__listeners)
+
+    def __init__(self, model: rt.RealtimeModel, writer: RecordWriter):
+        self.__model = model
+        self.__writer = writer
+        self.__listeners: list[rt.RealtimeModelListener] = []
+
+    @override
+    async def connect(self, options: rt.RealtimeModelConfig):
+        self.__model.add_listener(self)
+        await self.__model.connect(options)
+
+    @override
+    def add_listener(self, listener: rt.RealtimeModelListener) -> None:
+        if listener not in self.__listeners:
+            self.__listeners.append(listener)
+
+    @override
+    def remove_listener(self, listener: rt.RealtimeModelListener) -> None:
+        if listener in self.__listeners:
+            self.__listeners.remove(listener)
+
+    @override
+    async def send_event(self, event: rt.RealtimeModelSendEvent):
+        self.__writer.write(Direction.SEND, event)
+        await self.__model.send_event(event)
+
+    @override
+    async def on_event(self, event: rt.RealtimeModelEvent):
+        self.__writer.write(Direction.RECEIVE, event)
+        for listener in tuple(self.__listeners):
+            await listener.on_event(event)
+
+    @override
+    async def close(self):
+        try:
+            await self.__model.close()
+        finally:
+            self.__model.remove_listener(self)
+            self.__writer.flush()
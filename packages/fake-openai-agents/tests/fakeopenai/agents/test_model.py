@@ -2,14 +2,18 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import math
 from collections.abc import AsyncIterator
 from typing import override
 
 import pytest
 from agents import realtime as rt
+from agents.realtime import items as rt_items
 from agents.realtime import model_events
 from agents.realtime import model_inputs
 from fakeopenai.agents import model
+from fakeopenai.agents import recording
+from openai.types.realtime import realtime_error
 
 
 class FakeRealtimeModelListener(rt.RealtimeModelListener):
@@ -32,8 +36,22 @@ def connect_model() -> bool:
 
 
 @pytest.fixture
-async def fake_model(connect_model, model_config) -> AsyncIterator[model.FakeRealtimeModel]:
-    fake_model = model.FakeRealtimeModel()
+def delays() -> model.ProcessingDelays | None:
+    return None
+
+
+@pytest.fixture
+def response_audio_size() -> int:
+    return 0
+
+
+@pytest.fixture
+async def fake_model(
+    connect_model, model_config, delays, response_audio_size
+) -> AsyncIterator[model.FakeRealtimeModel]:
+    fake_model = model.FakeRealtimeModel(
+        delays=delays, response_audio=bytes(response_audio_size), audio_delta_size=4800
+    )
     if connect_model:
         await fake_model.connect(model_config)
     try:
@@ -42,6 +60,19 @@ async def fake_model(connect_model, model_config) -> AsyncIterator[model.FakeRea
         await fake_model.close()
 
 
+async def settle(fake_model: model.FakeRealtimeModel):
+    await fake_model.wait_processed()
+    for _ in range(50):
+        await asyncio.sleep(0)
+
+
+def event_types(events: list[rt.RealtimeModelEvent]) -> list[str]:
+    return [
+        e.data["type"] if isinstance(e, model_events.RealtimeModelRawServerEvent) else e.type
+        for e in events
+    ]
+
+
 def assert_initial_session_events(
     created_event: model_events.RealtimeModelEvent, updated_event: model_events.RealtimeModelEvent
 ):
@@ -137,6 +168,46 @@ async def test_constructor(fake_model: model.FakeRealtimeModel):
     assert fake_model.listeners == ()
     assert fake_model.pending_audio == b""
     assert fake_model.committed_audio == b""
+    assert fake_model.delays == model.ProcessingDelays()
+    assert fake_model.session is None
+    assert fake_model.response_active is False
+    assert fake_model.processing_backlog == 0
+
+
+class TestProcessingDelays:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "event, expected",
+        [
+            (rt.RealtimeModelSendAudio(audio=b""), 1.0),
+            (rt.RealtimeModelSendSessionUpdate(session_settings={}), 2.0),
+            (rt.RealtimeModelSendUserInput(user_input=""), 3.0),
+            (
+                rt.RealtimeModelSendToolOutput(
+                    tool_call=model_events.RealtimeModelToolCallEvent(
+                        name="", call_id="", arguments=""
+                    ),
+                    output="",
+                    start_response=False,
+                ),
+                4.0,
+            ),
+            (rt.RealtimeModelSendInterrupt(), 5.0),
+            (rt.RealtimeModelSendRawMessage(message={"type": ""}), 6.0),
+            (object(), 0.0),
+        ],
+    )
+    def test_for_event(event, expected):
+        delays = model.ProcessingDelays(
+            audio=1.0,
+            session_update=2.0,
+            user_input=3.0,
+            tool_output=4.0,
+            interrupt=5.0,
+            raw_message=6.0,
+            response=7.0,
+        )
+        assert delays.for_event(event) == expected
 
 
 @pytest.mark.parametrize("connect_model", [False])
@@ -170,6 +241,50 @@ class TestConnect:
 
         assert fake_model.is_connected
 
+    @staticmethod
+    async def test_payloads_not_shared(fake_model):
+        config = rt.RealtimeModelConfig()
+        listener = FakeRealtimeModelListener()
+        fake_model.add_listener(listener)
+
+        await fake_model.connect(config)
+        await settle(fake_model)
+        created_event, _ = listener.events
+        assert isinstance(created_event, model_events.RealtimeModelRawServerEvent)
+        created_event.data["session"]["audio"]["input"]["format"]["rate"] = 8000
+        await fake_model.close()
+
+        listener.events.clear()
+        await fake_model.connect(config)
+        await settle(fake_model)
+
+        created_event, updated_event = listener.events
+        assert isinstance(created_event, model_events.RealtimeModelRawServerEvent)
+        assert isinstance(updated_event, model_events.RealtimeModelRawServerEvent)
+        assert created_event.data["event_id"] == "event_000003"
+        assert created_event.data["session"]["id"] == "sess_000002"
+        assert created_event.data["session"]["audio"]["input"]["format"]["rate"] == 24000
+        assert updated_event.data["event_id"] == "event_000004"
+        assert updated_event.data["session"]["id"] == "sess_000002"
+
+    @staticmethod
+    async def test_session(fake_model):
+        other_model = model.FakeRealtimeModel()
+        config = rt.RealtimeModelConfig()
+        await fake_model.connect(config)
+        await other_model.connect(config)
+        try:
+            assert fake_model.session.instructions == "fake-golem-instructions"
+            assert fake_model.session.audio.input.turn_detection.type == "semantic_vad"
+            assert fake_model.session is fake_model.session
+
+            fake_model.session.instructions = "changed"
+            other_session = other_model.session
+            assert other_session is not None
+            assert other_session.instructions == "fake-golem-instructions"
+        finally:
+            await other_model.close()
+
     @staticmethod
     async def test_clear_audio(fake_model):
         config = rt.RealtimeModelConfig()
@@ -262,12 +377,567 @@ class TestSendEvent:
             assert fake_model.pending_audio == b""
             assert fake_model.committed_audio == b"block1block2"
 
+        @staticmethod
+        @pytest.mark.parametrize(
+            "input_audio_format, decoded",
+            [
+                ("g711_ulaw", [-32124, 32124, 0, 716]),
+                ("g711_alaw", [-5504, 5504, 848, 8]),
+            ],
+        )
+        async def test_g711(fake_model, input_audio_format, decoded):
+            await fake_model.send_event(
+                rt.RealtimeModelSendSessionUpdate(
+                    session_settings={"input_audio_format": input_audio_format}
+                )
+            )
+            event = rt.RealtimeModelSendAudio(audio=b"\x00\x80\xff\xd5", commit=False)
+            await fake_model.send_event(event)
+
+            pending = fake_model.pending_audio
+            assert [
+                int.from_bytes(pending[i : i + 2], "little", signed=True)
+                for i in range(0, len(pending), 2)
+            ] == decoded
+
     @staticmethod
     async def test_not_implemented(fake_model):
-        event = rt.RealtimeModelSendInterrupt()
-
         with pytest.raises(NotImplementedError):
-            await fake_model.send_event(event)
+            await fake_model.send_event(object())
+
+    @staticmethod
+    @pytest.fixture
+    async def listener(fake_model) -> FakeRealtimeModelListener:
+        listener = FakeRealtimeModelListener()
+        fake_model.add_listener(listener)
+        await settle(fake_model)
+        listener.events.clear()
+        return listener
+
+    class TestCommit:
+        @staticmethod
+        async def test_committed_event(fake_model, listener):
+            await fake_model.send_event(rt.RealtimeModelSendAudio(audio=b"block1", commit=True))
+            await fake_model.send_event(rt.RealtimeModelSendAudio(audio=b"block2", commit=True))
+            await settle(fake_model)
+
+            committed1, committed2 = listener.events
+            assert committed1.data == {
+                "event_id": "event_000003",
+                "item_id": "item_000001",
+                "type": "input_audio_buffer.committed",
+            }
+            assert committed2.data == {
+                "event_id": "event_000004",
+                "item_id": "item_000002",
+                "previous_item_id": "item_000001",
+                "type": "input_audio_buffer.committed",
+            }
+
+    class TestSessionUpdate:
+        @staticmethod
+        async def test_update(fake_model, listener):
+            await fake_model.send_event(
+                rt.RealtimeModelSendSessionUpdate(
+                    session_settings={
+                        "model_name": "gpt-realtime-mini",
+                        "instructions": "new-instructions",
+                        "modalities": ["text"],
+                        "tool_choice": "none",
+                        "voice": "ash",
+                        "speed": 1.5,
+                        "turn_detection": {"type": "server_vad", "threshold": 0.7},
+                    }
+                )
+            )
+            await settle(fake_model)
+
+            (session_updated,) = listener.events
+            session = session_updated.data["session"]
+            assert session_updated.data["type"] == "session.updated"
+            assert session["id"] == "sess_000001"
+            assert session["model"] == "gpt-realtime-mini"
+            assert session["instructions"] == "new-instructions"
+            assert session["output_modalities"] == ["text"]
+            assert session["tool_choice"] == "none"
+            assert session["audio"]["output"]["voice"] == "ash"
+            assert session["audio"]["output"]["speed"] == 1.5
+            assert session["audio"]["input"]["turn_detection"]["type"] == "server_vad"
+            assert session["audio"]["input"]["turn_detection"]["threshold"] == 0.7
+            assert fake_model.session.instructions == "new-instructions"
+
+        @staticmethod
+        async def test_semantic_vad(fake_model, listener):
+            await fake_model.send_event(
+                rt.RealtimeModelSendSessionUpdate(
+                    session_settings={
+                        "turn_detection": {"type": "semantic_vad", "eagerness": "high"},
+                    }
+                )
+            )
+            await settle(fake_model)
+
+            (session_updated,) = listener.events
+            turn_detection = session_updated.data["session"]["audio"]["input"]["turn_detection"]
+            assert turn_detection["type"] == "semantic_vad"
+            assert turn_detection["eagerness"] == "high"
+            assert session_updated.data["session"]["instructions"] == "fake-golem-instructions"
+
+        @staticmethod
+        @pytest.mark.parametrize(
+            "input_audio_format, expected",
+            [
+                ("g711_ulaw", {"type": "audio/pcmu"}),
+                ("audio/pcma", {"type": "audio/pcma"}),
+                ("pcm16", {"type": "audio/pcm", "rate": 24000}),
+            ],
+        )
+        async def test_input_audio_format(fake_model, listener, input_audio_format, expected):
+            await fake_model.send_event(
+                rt.RealtimeModelSendSessionUpdate(
+                    session_settings={"input_audio_format": input_audio_format}
+                )
+            )
+            await settle(fake_model)
+
+            (session_updated,) = listener.events
+            assert session_updated.data["session"]["audio"]["input"]["format"] == expected
+
+    class TestUserInput:
+        @staticmethod
+        @pytest.mark.parametrize(
+            "user_input",
+            [
+                "hello",
+                {
+                    "type": "message",
+                    "role": "user",
+                    "content": [
+                        {"type": "input_text", "text": "hello"},
+                        {"type": "input_image", "image_url": "https://example.com"},
+                    ],
+                },
+            ],
+        )
+        async def test_user_input(fake_model, listener, user_input):
+            await fake_model.send_event(rt.RealtimeModelSendUserInput(user_input=user_input))
+            await settle(fake_model)
+
+            assert event_types(listener.events) == [
+                "conversation.item.created",
+                "item_updated",
+                "response.created",
+                "turn_started",
+                "response.done",
+                "turn_ended",
+            ]
+            item_created, item_updated, response_created, _, response_done, _ = listener.events
+            assert item_created.data["item"] == {
+                "content": [{"text": "hello", "type": "input_text"}],
+                "id": "item_000001",
+                "object": "realtime.item",
+                "role": "user",
+                "status": "completed",
+                "type": "message",
+            }
+            assert item_updated.item == rt_items.UserMessageItem(
+                item_id="item_000001", content=[rt_items.InputText(text="hello")]
+            )
+            assert response_created.data["response"]["id"] == "resp_000001"
+            assert response_created.data["response"]["status"] == "in_progress"
+            assert response_done.data["response"]["id"] == "resp_000001"
+            assert response_done.data["response"]["status"] == "completed"
+            assert not fake_model.response_active
+
+    class TestToolOutput:
+        @staticmethod
+        @pytest.fixture
+        def tool_call() -> model_events.RealtimeModelToolCallEvent:
+            return model_events.RealtimeModelToolCallEvent(
+                name="lookup", call_id="call_1", arguments="{}", id="item_tool"
+            )
+
+        @staticmethod
+        async def test_no_response(fake_model, listener, tool_call):
+            await fake_model.send_event(
+                rt.RealtimeModelSendToolOutput(
+                    tool_call=tool_call, output="result", start_response=False
+                )
+            )
+            await settle(fake_model)
+
+            item_updated, item_created = listener.events
+            assert item_updated.item == rt_items.RealtimeToolCallItem(
+                item_id="item_tool",
+                call_id="call_1",
+                status="completed",
+                arguments="{}",
+                name="lookup",
+                output="result",
+            )
+            assert item_created.data["item"] == {
+                "call_id": "call_1",
+                "id": "item_000001",
+                "object": "realtime.item",
+                "output": "result",
+                "status": "completed",
+                "type": "function_call_output",
+            }
+
+        @staticmethod
+        async def test_start_response(fake_model, listener, tool_call):
+            await fake_model.send_event(
+                rt.RealtimeModelSendToolOutput(
+                    tool_call=tool_call, output="result", start_response=True
+                )
+            )
+            await settle(fake_model)
+
+            assert event_types(listener.events) == [
+                "item_updated",
+                "conversation.item.created",
+                "response.created",
+                "turn_started",
+                "response.done",
+                "turn_ended",
+            ]
+
+    class TestInterrupt:
+        @staticmethod
+        async def test_no_response(fake_model, listener):
+            await fake_model.send_event(rt.RealtimeModelSendInterrupt())
+            await settle(fake_model)
+
+            assert listener.events == []
+
+        @staticmethod
+        @pytest.mark.parametrize("delays", [model.ProcessingDelays(response=10.0)])
+        async def test_active_response(fake_model, listener):
+            await fake_model.send_event(rt.RealtimeModelSendUserInput(user_input="hello"))
+            await settle(fake_model)
+            assert fake_model.response_active
+
+            await fake_model.send_event(rt.RealtimeModelSendInterrupt())
+            await settle(fake_model)
+
+            assert not fake_model.response_active
+            assert event_types(listener.events)[-2:] == ["response.done", "turn_ended"]
+            response_done = listener.events[-2]
+            assert response_done.data["response"]["status"] == "cancelled"
+            assert response_done.data["response"]["status_details"] == {
+                "reason": "client_cancelled",
+                "type": "cancelled",
+            }
+
+    class TestRawMessage:
+        @staticmethod
+        async def test_commit(fake_model, listener):
+            await fake_model.send_event(rt.RealtimeModelSendAudio(audio=b"block1"))
+            await fake_model.send_event(
+                rt.RealtimeModelSendRawMessage(message={"type": "input_audio_buffer.commit"})
+            )
+            await settle(fake_model)
+
+            assert fake_model.committed_audio == b"block1"
+            assert event_types(listener.events) == ["input_audio_buffer.committed"]
+
+        @staticmethod
+        async def test_clear(fake_model, listener):
+            await fake_model.send_event(rt.RealtimeModelSendAudio(audio=b"block1"))
+            await fake_model.send_event(
+                rt.RealtimeModelSendRawMessage(message={"type": "input_audio_buffer.clear"})
+            )
+            await settle(fake_model)
+
+            assert fake_model.pending_audio == b""
+            assert event_types(listener.events) == ["input_audio_buffer.cleared"]
+
+        @staticmethod
+        @pytest.mark.parametrize("delays", [model.ProcessingDelays(response=10.0)])
+        async def test_response_create_and_cancel(fake_model, listener):
+            await fake_model.send_event(
+                rt.RealtimeModelSendRawMessage(message={"type": "response.create"})
+            )
+            await fake_model.send_event(
+                rt.RealtimeModelSendRawMessage(message={"type": "response.create"})
+            )
+            await fake_model.send_event(
+                rt.RealtimeModelSendRawMessage(message={"type": "response.cancel"})
+            )
+            await settle(fake_model)
+
+            assert event_types(listener.events) == [
+                "response.created",
+                "turn_started",
+                "error",
+                "error",
+                "response.done",
+                "turn_ended",
+            ]
+            assert listener.events[2].data["error"]["code"] == (
+                "conversation_already_has_active_response"
+            )
+
+        @staticmethod
+        async def test_unsupported(fake_model, listener):
+            await fake_model.send_event(
+                rt.RealtimeModelSendRawMessage(message={"type": "conversation.item.delete"})
+            )
+            await settle(fake_model)
+
+            raw_error, error = listener.events
+            assert raw_error.data == {
+                "error": {
+                    "message": "Unsupported client event type: conversation.item.delete",
+                    "type": "invalid_request_error",
+                },
+                "event_id": "event_000003",
+                "type": "error",
+            }
+            assert error == model_events.RealtimeModelErrorEvent(
+                error=realtime_error.RealtimeError(
+                    message="Unsupported client event type: conversation.item.delete",
+                    type="invalid_request_error",
+                )
+            )
+
+    class TestProcessingDelays:
+        @staticmethod
+        @pytest.mark.parametrize("delays", [model.ProcessingDelays(session_update=0.05)])
+        async def test_delayed(fake_model, listener):
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await fake_model.send_event(
+                rt.RealtimeModelSendSessionUpdate(session_settings={"instructions": "new"})
+            )
+            await fake_model.send_event(rt.RealtimeModelSendAudio(audio=b"block1"))
+
+            # Audio is processed in order, behind the slow session update.
+            assert fake_model.processing_backlog == 2
+            assert fake_model.pending_audio == b""
+
+            await settle(fake_model)
+
+            assert loop.time() - start >= 0.05
+            assert fake_model.processing_backlog == 0
+            assert fake_model.pending_audio == b"block1"
+            assert event_types(listener.events) == ["session.updated"]
+
+        @staticmethod
+        @pytest.mark.parametrize("delays", [model.ProcessingDelays(raw_message=0.01)])
+        async def test_error(fake_model):
+            # A truncation without an item fails to process.
+            await fake_model.send_event(
+                rt.RealtimeModelSendRawMessage(message={"type": "conversation.item.truncate"})
+            )
+            await fake_model.send_event(rt.RealtimeModelSendAudio(audio=b"block1"))
+
+            with pytest.raises(KeyError):
+                await fake_model.wait_processed()
+
+            # Events sent after the failed one are still processed.
+            assert fake_model.processing_backlog == 0
+            assert fake_model.pending_audio == b"block1"
+            await fake_model.wait_processed()
+
+        @staticmethod
+        @pytest.mark.parametrize("delays", [model.ProcessingDelays(response=0.05)])
+        async def test_response(fake_model, listener):
+            await fake_model.send_event(rt.RealtimeModelSendUserInput(user_input="hello"))
+            await settle(fake_model)
+            assert fake_model.response_active
+
+            await asyncio.sleep(0.1)
+            await settle(fake_model)
+
+            assert not fake_model.response_active
+            assert event_types(listener.events)[-2:] == ["response.done", "turn_ended"]
+            assert listener.events[-2].data["response"]["status"] == "completed"
+
+    class TestResponseAudio:
+        @staticmethod
+        @pytest.mark.parametrize("response_audio_size", [6000])
+        async def test_deltas(fake_model, listener):
+            await fake_model.send_event(rt.RealtimeModelSendUserInput(user_input="hello"))
+            await settle(fake_model)
+
+            types = event_types(listener.events)
+            assert types[types.index("turn_started") + 1 :] == [
+                "response.output_audio.delta",
+                "audio",
+                "response.output_audio.delta",
+                "audio",
+                "response.output_audio.done",
+                "audio_done",
+                "response.done",
+                "turn_ended",
+            ]
+            audio_events = [
+                e for e in listener.events if isinstance(e, model_events.RealtimeModelAudioEvent)
+            ]
+            assert [len(e.data) for e in audio_events] == [4800, 1200]
+            assert fake_model.generated_audio_ms == 125.0
+            assert fake_model.played_audio_ms == 125.0
+            assert fake_model.truncations == ()
+
+        @staticmethod
+        def test_invalid_delta_size():
+            with pytest.raises(ValueError, match="^audio_delta_size must be positive$"):
+                model.FakeRealtimeModel(audio_delta_size=0)
+
+    class TestBargeIn:
+        @staticmethod
+        @pytest.mark.parametrize("connect_model", [False])
+        async def test_not_connected(fake_model):
+            with pytest.raises(AssertionError, match="Not connected"):
+                fake_model.start_user_speech()
+
+        @staticmethod
+        async def test_nothing_playing(fake_model, listener):
+            fake_model.start_user_speech()
+            await settle(fake_model)
+
+            assert event_types(listener.events) == ["input_audio_buffer.speech_started"]
+            assert fake_model.truncations == ()
+
+        @staticmethod
+        @pytest.mark.parametrize(
+            "input_audio_format, audio_start_ms", [("pcm16", 10), ("g711_ulaw", 60)]
+        )
+        async def test_audio_start(fake_model, listener, input_audio_format, audio_start_ms):
+            await fake_model.send_event(
+                rt.RealtimeModelSendSessionUpdate(
+                    session_settings={"input_audio_format": input_audio_format}
+                )
+            )
+            await fake_model.send_event(rt.RealtimeModelSendAudio(audio=bytes(480), commit=False))
+            await settle(fake_model)
+            listener.events.clear()
+
+            fake_model.start_user_speech()
+            await settle(fake_model)
+
+            (speech_started,) = listener.events
+            assert speech_started.data["audio_start_ms"] == audio_start_ms
+
+        @staticmethod
+        @pytest.mark.parametrize("response_audio_size", [48000])
+        @pytest.mark.parametrize(
+            "delays", [model.ProcessingDelays(audio_delta=0.01, response=10.0)]
+        )
+        async def test_turn_detected(fake_model, listener):
+            await fake_model.send_event(rt.RealtimeModelSendUserInput(user_input="hello"))
+            await asyncio.sleep(0.05)
+            listener.events.clear()
+
+            fake_model.start_user_speech()
+            await settle(fake_model)
+
+            assert not fake_model.response_active
+            assert event_types(listener.events) == [
+                "input_audio_buffer.speech_started",
+                "audio_interrupted",
+                "conversation.item.truncated",
+                "response.done",
+                "turn_ended",
+            ]
+            assert listener.events[-2].data["response"]["status_details"] == {
+                "reason": "turn_detected",
+                "type": "cancelled",
+            }
+            (truncation,) = fake_model.truncations
+            assert truncation.reason == "turn_detected"
+            assert truncation.stop_latency is None
+            assert 0 < truncation.played_ms <= truncation.generated_ms < 1000
+            assert fake_model.truncated_audio_ms == truncation.truncated_ms
+            assert fake_model.played_audio_ms == pytest.approx(truncation.played_ms)
+
+            await asyncio.sleep(0.01)
+            await fake_model.send_event(rt.RealtimeModelSendInterrupt())
+            await settle(fake_model)
+
+            (truncation,) = fake_model.truncations
+            assert truncation.stop_latency is not None
+            assert truncation.stop_latency >= 0.01
+
+        @staticmethod
+        @pytest.mark.parametrize("response_audio_size", [9600])
+        async def test_no_interrupt_response(fake_model, listener):
+            await fake_model.send_event(
+                rt.RealtimeModelSendSessionUpdate(
+                    session_settings={
+                        "turn_detection": {"type": "server_vad", "interrupt_response": False}
+                    }
+                )
+            )
+            await fake_model.send_event(rt.RealtimeModelSendUserInput(user_input="hello"))
+            await settle(fake_model)
+            listener.events.clear()
+
+            fake_model.start_user_speech()
+            await settle(fake_model)
+
+            assert event_types(listener.events) == [
+                "input_audio_buffer.speech_started",
+                "audio_interrupted",
+            ]
+            (truncation,) = fake_model.truncations
+            assert truncation.generated_ms == 200.0
+
+        @staticmethod
+        @pytest.mark.parametrize("response_audio_size", [9600])
+        async def test_playback_tracker(fake_model, listener):
+            tracker = rt.RealtimePlaybackTracker()
+            await fake_model.close()
+            await fake_model.connect(rt.RealtimeModelConfig(playback_tracker=tracker))
+            await fake_model.send_event(rt.RealtimeModelSendUserInput(user_input="hello"))
+            await settle(fake_model)
+            audio_done = listener.events[-3]
+            assert isinstance(audio_done, model_events.RealtimeModelAudioDoneEvent)
+            item_id = audio_done.item_id
+            tracker.on_play_ms(item_id, 0, 50.0)
+
+            await fake_model.send_event(rt.RealtimeModelSendInterrupt())
+            await settle(fake_model)
+
+            (truncation,) = fake_model.truncations
+            assert truncation == model.Truncation(
+                response_id=truncation.response_id,
+                item_id=item_id,
+                reason="client_cancelled",
+                generated_ms=200.0,
+                played_ms=50.0,
+            )
+            assert truncation.truncated_ms == 150.0
+            assert tracker.get_state()["current_item_id"] is None
+            truncated = next(
+                e
+                for e in listener.events
+                if isinstance(e, model_events.RealtimeModelRawServerEvent)
+                and e.data["type"] == "conversation.item.truncated"
+            )
+            assert truncated.data["audio_end_ms"] == 50
+
+        @staticmethod
+        async def test_raw_truncate(fake_model, listener):
+            await fake_model.send_event(
+                rt.RealtimeModelSendRawMessage(
+                    message={
+                        "type": "conversation.item.truncate",
+                        "other_data": {"item_id": "item_000009", "audio_end_ms": 120},
+                    }
+                )
+            )
+            await settle(fake_model)
+
+            (truncated,) = listener.events
+            assert truncated.data == {
+                "audio_end_ms": 120,
+                "content_index": 0,
+                "event_id": "event_000003",
+                "item_id": "item_000009",
+                "type": "conversation.item.truncated",
+            }
 
 
 class TestClose:
@@ -284,6 +954,19 @@ class TestClose:
         await fake_model.connect(model_config)
         assert fake_model.is_connected
 
+    @staticmethod
+    @pytest.mark.parametrize("delays", [model.ProcessingDelays(response=0.05)])
+    async def test_response_task(fake_model):
+        await fake_model.send_event(rt.RealtimeModelSendUserInput(user_input="hello"))
+        await settle(fake_model)
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        assert tasks
+
+        await fake_model.close()
+
+        # The response being generated is cancelled and awaited.
+        assert all(task.done() for task in tasks)
+
     @staticmethod
     async def test_queue_cleanup(fake_model, model_config):
         test_event = model_events.RealtimeModelTurnStartedEvent()
@@ -362,6 +1045,88 @@ class TestReturnMessage:
         assert_initial_session_events(created_event, updated_event)
 
 
+class TestReplay:
+    @staticmethod
+    @pytest.fixture
+    def records() -> list[recording.Record]:
+        return [
+            recording.Record(
+                time=10.0,
+                direction=recording.Direction.RECEIVE,
+                event=model_events.RealtimeModelTurnStartedEvent(),
+            ),
+            recording.Record(
+                time=10.02,
+                direction=recording.Direction.SEND,
+                event=rt.RealtimeModelSendAudio(audio=b"block1"),
+            ),
+            recording.Record(
+                time=10.04,
+                direction=recording.Direction.RECEIVE,
+                event=model_events.RealtimeModelTurnEndedEvent(),
+            ),
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize("connect_model", [False])
+    async def test_not_connected(fake_model, records):
+        with pytest.raises(AssertionError, match="Not connected"):
+            await fake_model.replay(records)
+
+    @staticmethod
+    @pytest.mark.parametrize("speed", [0.0, -1.0])
+    async def test_invalid_speed(fake_model, records, speed):
+        with pytest.raises(ValueError, match="^speed must be positive$"):
+            await fake_model.replay(records, speed=speed)
+
+    @staticmethod
+    @pytest.mark.parametrize("speed", [1.0, 4.0, math.inf])
+    async def test_replay(fake_model, records, speed):
+        loop = asyncio.get_running_loop()
+        listener = FakeRealtimeModelListener()
+        fake_model.add_listener(listener)
+        sent: list[tuple[float, rt.RealtimeModelSendEvent]] = []
+
+        async def on_send(event: rt.RealtimeModelSendEvent):
+            sent.append((loop.time(), event))
+
+        start = loop.time()
+        assert await fake_model.replay(records, speed=speed, on_send=on_send) == 2
+        elapsed = loop.time() - start
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert [e for e in listener.events if e.type != "raw_server_event"] == [
+            model_events.RealtimeModelTurnStartedEvent(),
+            model_events.RealtimeModelTurnEndedEvent(),
+        ]
+        ((send_time, send_event),) = sent
+        assert send_event == rt.RealtimeModelSendAudio(audio=b"block1")
+        if math.isinf(speed):
+            assert elapsed < 0.04
+        else:
+            assert send_time - start >= 0.02 / speed
+            assert elapsed >= 0.04 / speed
+
+    @staticmethod
+    async def test_replay_file(fake_model, tmp_path):
+        listener = FakeRealtimeModelListener()
+        fake_model.add_listener(listener)
+        path = tmp_path / "session.rec"
+        with path.open("ab") as stream:
+            writer = recording.RecordWriter(stream)
+            writer.write(recording.Direction.RECEIVE, model_events.RealtimeModelTurnStartedEvent())
+
+        with path.open("rb") as stream:
+            await fake_model.replay(recording.read_records(stream), speed=math.inf)
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert [e for e in listener.events if e.type != "raw_server_event"] == [
+            model_events.RealtimeModelTurnStartedEvent()
+        ]
+
+
 class TestRunning:
     @staticmethod
     @pytest.fixture
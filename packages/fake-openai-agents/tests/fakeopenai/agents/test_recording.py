@@ -0,0 +1,197 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import io
+from collections.abc import AsyncIterator
+from typing import override
+
+import pytest
+from agents import realtime as rt
+from agents.realtime import model_events
+from fakeopenai.agents import model
+from fakeopenai.agents import recording
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRealtimeModelListener(rt.RealtimeModelListener):
+    def __init__(self):
+        self.events: list[rt.RealtimeModelEvent] = []
+
+    @override
+    async def on_event(self, event: rt.RealtimeModelEvent):
+        self.events.append(event)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def stream() -> io.BytesIO:
+    return io.BytesIO()
+
+
+@pytest.fixture
+def writer(stream, clock) -> recording.RecordWriter:
+    return recording.RecordWriter(stream, clock=clock)
+
+
+class TestRecordWriter:
+    @staticmethod
+    def test_magic(writer, stream):
+        assert writer.record_count == 0
+        assert stream.getvalue() == recording.MAGIC
+
+    @staticmethod
+    def test_append(writer, stream, clock):
+        writer.write(recording.Direction.SEND, rt.RealtimeModelSendAudio(audio=b"block1"))
+
+        appending_writer = recording.RecordWriter(stream, clock=clock)
+        appending_writer.write(
+            recording.Direction.SEND, rt.RealtimeModelSendAudio(audio=b"block2")
+        )
+
+        stream.seek(0)
+        record1, record2 = recording.read_records(stream)
+        assert record1.event == rt.RealtimeModelSendAudio(audio=b"block1")
+        assert record2.event == rt.RealtimeModelSendAudio(audio=b"block2")
+
+    @staticmethod
+    def test_write(writer, stream, clock):
+        clock.now = 100.5
+        record1 = writer.write(
+            recording.Direction.SEND, rt.RealtimeModelSendAudio(audio=b"block1", commit=True)
+        )
+        clock.now = 101.25
+        record2 = writer.write(
+            recording.Direction.RECEIVE, model_events.RealtimeModelTurnStartedEvent()
+        )
+
+        assert writer.record_count == 2
+        assert record1 == recording.Record(
+            time=0.5,
+            direction=recording.Direction.SEND,
+            event=rt.RealtimeModelSendAudio(audio=b"block1", commit=True),
+        )
+        assert record2 == recording.Record(
+            time=1.25,
+            direction=recording.Direction.RECEIVE,
+            event=model_events.RealtimeModelTurnStartedEvent(),
+        )
+
+        stream.seek(0)
+        assert list(recording.read_records(stream)) == [record1, record2]
+
+    @staticmethod
+    def test_exception_event(writer, stream):
+        class Unpicklable(Exception):
+            def __reduce__(self):
+                raise TypeError("Cannot pickle")
+
+        writer.write(
+            recording.Direction.RECEIVE,
+            model_events.RealtimeModelExceptionEvent(exception=Unpicklable("bad"), context="ctx"),
+        )
+
+        stream.seek(0)
+        (record,) = recording.read_records(stream)
+        assert isinstance(record.event.exception, RuntimeError)
+        assert record.event.exception.args == ("Unpicklable('bad')",)
+        assert record.event.context == "ctx"
+
+
+class TestReadRecords:
+    @staticmethod
+    def test_empty(writer, stream):
+        stream.seek(0)
+        assert list(recording.read_records(stream)) == []
+
+    @staticmethod
+    def test_not_recording():
+        with pytest.raises(recording.RecordingError, match="^Not an event recording$"):
+            list(recording.read_records(io.BytesIO(b"garbage-data")))
+
+    @staticmethod
+    def test_truncated_header(writer, stream):
+        writer.write(recording.Direction.SEND, rt.RealtimeModelSendInterrupt())
+        truncated = io.BytesIO(stream.getvalue()[: len(recording.MAGIC) + 3])
+
+        with pytest.raises(recording.RecordingError, match="^Truncated record header$"):
+            list(recording.read_records(truncated))
+
+    @staticmethod
+    def test_truncated_payload(writer, stream):
+        writer.write(recording.Direction.SEND, rt.RealtimeModelSendInterrupt())
+        truncated = io.BytesIO(stream.getvalue()[:-1])
+
+        with pytest.raises(recording.RecordingError, match="^Truncated record payload$"):
+            list(recording.read_records(truncated))
+
+
+class TestRecordingModel:
+    @staticmethod
+    @pytest.fixture
+    def inner_model() -> model.FakeRealtimeModel:
+        return model.FakeRealtimeModel()
+
+    @staticmethod
+    @pytest.fixture
+    def listener() -> FakeRealtimeModelListener:
+        return FakeRealtimeModelListener()
+
+    @staticmethod
+    @pytest.fixture
+    async def recording_model(
+        inner_model, writer, listener
+    ) -> AsyncIterator[recording.RecordingModel]:
+        recording_model = recording.RecordingModel(inner_model, writer)
+        recording_model.add_listener(listener)
+        await recording_model.connect(rt.RealtimeModelConfig())
+        try:
+            yield recording_model
+        finally:
+            await recording_model.close()
+
+    @staticmethod
+    async def test_listeners(recording_model, inner_model, listener):
+        recording_model.add_listener(listener)
+        assert recording_model.listeners == (listener,)
+        assert inner_model.listeners == (recording_model,)
+
+        recording_model.remove_listener(listener)
+        recording_model.remove_listener(listener)
+        assert recording_model.listeners == ()
+
+    @staticmethod
+    async def test_record(recording_model, inner_model, listener, stream):
+        await recording_model.send_event(rt.RealtimeModelSendAudio(audio=b"block1", commit=True))
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert inner_model.committed_audio == b"block1"
+        assert [e.data["type"] for e in listener.events] == [
+            "session.created",
+            "session.updated",
+            "input_audio_buffer.committed",
+        ]
+
+        await recording_model.close()
+        assert inner_model.listeners == ()
+
+        stream.seek(0)
+        records = list(recording.read_records(stream))
+        assert [r.event for r in records if r.direction == recording.Direction.RECEIVE] == (
+            listener.events
+        )
+        assert [r.event for r in records if r.direction == recording.Direction.SEND] == [
+            rt.RealtimeModelSendAudio(audio=b"block1", commit=True)
+        ]
@@ -11,6 +11,7 @@ AudioCallback = streaming.AudioCallback
 Device = devices.Device
 DeviceManager = devices.DeviceManager
 FakeRawInputStream = streaming.FakeRawInputStream
+FakeRawOutputStream = streaming.FakeRawOutputStream
 FakeStream = streaming.FakeStream
 HostApi = devices.HostApi
 
@@ -21,6 +22,7 @@ __all__ = [
     "Device",
     "DeviceManager",
     "FakeRawInputStream",
+    "FakeRawOutputStream",
     "FakeStream",
     "HostApi",
     "setup",
@@ -31,10 +31,12 @@ def setup(
         >>> with patching.setup() as dm:
         ...     devices = sd.query_devices()
         ...     stream = sd.RawInputStream()
+        ...     output_stream = sd.RawOutputStream()
     """
     if device_manager is None:
         device_manager = devices.DeviceManager.new_basic()
     with monkeypatch.Patcher() as patcher:
         patcher.patch(sd, "query_devices", device_manager.query_devices)
         patcher.patch(sd, "RawInputStream", streaming.FakeRawInputStream)
+        patcher.patch(sd, "RawOutputStream", streaming.FakeRawOutputStream)
         yield device_manager
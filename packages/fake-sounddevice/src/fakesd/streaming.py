@@ -5,6 +5,8 @@
 
 import dataclasses
 import math
+import threading
+import time
 import typing
 from collections.abc import Callable
 
@@ -74,6 +76,8 @@ class CffiBuffer(typing.Protocol):
 
     def __bytes__(self) -> bytes: ...
 
+    def __buffer__(self, flags: int, /) -> memoryview: ...
+
 
 class FakeCffiBuffer:
     """Fake CFFI buffer implementation for testing.
@@ -116,6 +120,9 @@ class FakeCffiBuffer:
     def __bytes__(self) -> bytes:
         return bytes(self.__buffer)
 
+    def __buffer__(self, flags: int, /) -> memoryview:
+        return memoryview(self.__buffer)
+
 
 type AudioCallback = Callable[[CffiBuffer, int, Time, sd.CallbackFlags], None]
 
@@ -276,3 +283,89 @@ class FakeRawInputStream(FakeStream, sd.RawInputStream):
             current_time = (block_count / float(bytes_per_frame)) / self._samplerate
             time_struct = TimeStruct(0, current_time, 0)
             self._callback(FakeCffiBuffer(b""), 0, time_struct, sounddevice.CallbackFlags())
+
+
+class FakeRawOutputStream(FakeStream, sd.RawOutputStream):
+    """Fake raw output stream that plays to a buffer.
+
+    Once started, a thread calls the callback for a block of output at the pace of the stream's
+    sample rate until the stream is stopped. Times passed to the callback are
+    `time.monotonic` values, with the DAC time one stream latency after the current time.
+    """
+
+    @property
+    def write_available(self):
+        """Get number of frames that can be written without waiting.
+
+        Raises:
+            NotImplementedError: This property is not implemented.
+        """
+        raise NotImplementedError()
+
+    @property
+    def played(self) -> bytes:
+        """All audio the callback has written so far."""
+        with self.__lock:
+            return bytes(self.__played)
+
+    @property
+    def block_count(self) -> int:
+        """Number of times the callback has been called."""
+        return self.__block_count
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__lock = threading.Lock()
+        self.__played = bytearray()
+        self.__block_count = 0
+        self.__thread: threading.Thread | None = None
+
+    def start(self):
+        """Start the stream and the thread calling the callback."""
+        was_active = self.active
+        super().start()
+        if self._callback is not None and not was_active:
+            self.__thread = threading.Thread(target=self.__play, daemon=True)
+            self.__thread.start()
+
+    def stop(self, ignore_errors: bool = True):
+        """Stop the stream and wait for the thread calling the callback to finish.
+
+        Args:
+            ignore_errors: Whether to ignore errors during stop.
+                Not ignoring errors is unsupported.
+        """
+        super().stop(ignore_errors)
+        self.__join()
+
+    def close(self, ignore_errors: bool = True):
+        """Close the stream and wait for the thread calling the callback to finish.
+
+        Args:
+            ignore_errors: Whether to ignore errors during close.
+                Not ignoring errors is unsupported.
+        """
+        super().close(ignore_errors)
+        self.__join()
+
+    def __join(self):
+        thread = self.__thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+            self.__thread = None
+
+    def __play(self):
+        assert self._callback is not None
+        bytes_per_block = DTYPE_TO_BYTE_SIZE[self._dtype] * self._channels * self._blocksize
+        block_period = self._blocksize / self._samplerate
+        next_time = time.monotonic()
+        while self.active:
+            block = FakeCffiBuffer(bytes_per_block)
+            current_time = time.monotonic()
+            time_struct = TimeStruct(current_time, 0, current_time + self._latency)
+            self._callback(block, self._blocksize, time_struct, sounddevice.CallbackFlags())
+            with self.__lock:
+                self.__played.extend(bytes(block))
+            self.__block_count += 1
+            next_time += block_period
+            time.sleep(max(next_time - time.monotonic(), 0.0))
@@ -12,11 +12,13 @@ class TestSetup:
     def do_patch_setup_test(init_device_manager: devices.DeviceManager | None, expected_devices):
         original_query_devices = sd.query_devices
         original_input_stream = sd.InputStream
+        original_raw_output_stream = sd.RawOutputStream
 
         with patching.setup(init_device_manager) as device_manager:
             # Check symbols
             assert sd.query_devices == device_manager.query_devices
             assert sd.RawInputStream is streaming.FakeRawInputStream
+            assert sd.RawOutputStream is streaming.FakeRawOutputStream
 
             # Check device manager
             assert device_manager.device_count == expected_devices
@@ -26,6 +28,7 @@ class TestSetup:
         # Should be restored after context exit
         assert sd.query_devices is original_query_devices
         assert sd.InputStream is original_input_stream
+        assert sd.RawOutputStream is original_raw_output_stream
 
     @staticmethod
     def test_default_manager():
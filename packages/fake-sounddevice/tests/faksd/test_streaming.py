@@ -60,6 +60,13 @@ class TestFakeCffiBuffer:
             buf[2:4] = b"CD"
             assert bytes(buf) == b"abCDef"
 
+    @staticmethod
+    def test_buffer(buf):
+        view = memoryview(buf)
+        assert view.tobytes() == b"abcdef"
+        view[0] = ord("A")
+        assert bytes(buf) == b"Abcdef"
+
 
 class TestFakeStream:
     @staticmethod
@@ -282,3 +289,62 @@ class TestFakeRawInputStream:
 
                 all_sound = b"".join([b for b, _ in blocks])
                 assert all_sound == waves.create_sawtooth_wave(0.1, 2.0, 44100.0, 2)
+
+
+class TestFakeRawOutputStream:
+    @staticmethod
+    def test_write_available():
+        with pytest.raises(NotImplementedError):
+            _ = streaming.FakeRawOutputStream().write_available
+
+    @staticmethod
+    def test_without_callback():
+        with streaming.FakeRawOutputStream() as raw_output_stream:
+            assert raw_output_stream.active
+        assert raw_output_stream.played == b""
+        assert raw_output_stream.block_count == 0
+
+    @staticmethod
+    def test_with_callback():
+        times: list[streaming.Time] = []
+
+        def callback(
+            block: streaming.CffiBuffer,
+            frames: int,
+            time: streaming.Time,
+            status: sd.CallbackFlags,
+        ):
+            assert frames == 4
+            assert len(block) == 8
+            assert isinstance(status, sd.CallbackFlags)
+            block[:] = bytes([len(times)]) * 8
+            times.append(time)
+
+        raw_output_stream = streaming.FakeRawOutputStream(
+            samplerate=8000.0, blocksize=4, dtype="int16", latency=0.05, callback=callback
+        )
+        with raw_output_stream:
+            while raw_output_stream.block_count < 3:
+                pass
+        block_count = raw_output_stream.block_count
+
+        assert not raw_output_stream.active
+        assert raw_output_stream.played == b"".join(bytes([i]) * 8 for i in range(block_count))
+        for time in times:
+            assert time.outputBufferDacTime == time.currentTime + 0.05
+        assert times[-1].currentTime - times[0].currentTime >= (block_count - 1.5) * 0.0005
+
+    @staticmethod
+    def test_restart():
+        def callback(block, frames, time, status):
+            pass
+
+        raw_output_stream = streaming.FakeRawOutputStream(callback=callback)
+        raw_output_stream.start()
+        raw_output_stream.start()
+        raw_output_stream.stop()
+        block_count = raw_output_stream.block_count
+        raw_output_stream.close()
+
+        assert raw_output_stream.block_count == block_count
+        assert raw_output_stream.closed
@@ -2,39 +2,238 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import collections
 import dataclasses
+import os
+import threading
+from collections.abc import AsyncIterable
 from collections.abc import AsyncIterator
+from collections.abc import Buffer
 from typing import Any
 
 import sounddevice
 from agents import realtime as rt
+from agents.realtime import model_events as rt_model_events
+from langgolem.audio import capture
+from langgolem.audio import convert
 from langgolem.audio import devices
+from langgolem.audio import g711
+from langgolem.audio import playback
+from langgolem.audio import resample
+from langgolem.audio import vad
 from langgolem.util import misc
+from langgolem.util import pools
+from langgolem.util import queues
+from langgolem.util import tracing
 from langgolem.util import types as langgolem_types
 
 
-@dataclasses.dataclass
 class RawAudio:
-    buffer: bytes
-    frames: int
-    time: float
+    """Block of captured 16-bit mono audio.
+
+    The buffer of a block created with a pool is storage borrowed from the pool.
+    Whoever consumes the block calls `release` once done with the buffer, which returns the
+    storage for reuse and leaves the block empty. Releasing other blocks only empties them.
+
+    Args:
+        buffer: Little-endian 16-bit samples.
+        frames: Number of frames in the buffer.
+        time: Capture time of the block on the `misc.time` clock.
+        pool: Pool the buffer was acquired from, to return it to on release.
+    """
+
+    __slots__ = ("buffer", "frames", "time", "__pool")
+
+    def __init__(
+        self,
+        buffer: bytes | bytearray,
+        frames: int,
+        time: float,
+        *,
+        pool: pools.BufferPool | None = None,
+    ):
+        self.buffer = buffer
+        self.frames = frames
+        self.time = time
+        self.__pool = pool
+
+    @classmethod
+    def from_pool(
+        cls, pool: pools.BufferPool, data: Buffer, frames: int, time: float
+    ) -> "RawAudio":
+        """Copy audio into storage borrowed from a pool.
+
+        Args:
+            pool: Pool to borrow the storage from.
+            data: Object supporting the buffer protocol holding the audio.
+            frames: Number of frames in the audio.
+            time: Capture time of the audio.
+
+        Returns:
+            Block whose buffer is the borrowed storage.
+        """
+        source = memoryview(data).cast("B")
+        storage = pool.acquire(len(source))
+        storage[:] = source
+        return cls(storage, frames, time, pool=pool)
+
+    def release(self):
+        """Return the block's storage to its pool. The buffer must not be used afterwards."""
+        if self.__pool is not None and isinstance(self.buffer, bytearray):
+            self.__pool.release(self.buffer)
+        self.__pool = None
+        self.buffer = b""
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RawAudio):
+            return NotImplemented
+        return (self.buffer, self.frames, self.time) == (other.buffer, other.frames, other.time)
+
+    def __repr__(self) -> str:
+        return f"RawAudio(buffer={bytes(self.buffer)!r}, frames={self.frames}, time={self.time})"
+
+
+def coalesce_audio(earlier: RawAudio, later: RawAudio) -> RawAudio:
+    """Combine two consecutive blocks of audio into one, keeping the earlier time.
+
+    Both blocks are released.
+    """
+    audio = RawAudio(
+        buffer=b"".join((earlier.buffer, later.buffer)),
+        frames=earlier.frames + later.frames,
+        time=earlier.time,
+    )
+    earlier.release()
+    later.release()
+    return audio
+
+
+def capture_queue(
+    maxsize: int = 64, policy: queues.OverloadPolicy = queues.OverloadPolicy.DROP_OLDEST
+) -> queues.BoundedQueue[RawAudio]:
+    """Create a bounded queue for captured audio.
+
+    Dropped audio is counted in bytes and released.
+
+    Args:
+        maxsize: Maximum number of queued blocks.
+        policy: What to do with blocks captured while the queue is full.
+
+    Returns:
+        The new queue.
+    """
+    return queues.BoundedQueue[RawAudio](
+        maxsize,
+        policy=policy,
+        size=lambda a: len(a.buffer),
+        merge=coalesce_audio,
+        on_drop=RawAudio.release,
+    )
 
 
-async def default_input_queuer(queue: asyncio.Queue[RawAudio]):
-    loop = asyncio.get_event_loop()
+async def default_input_queuer(
+    queue: asyncio.Queue[RawAudio],
+    *,
+    capacity: int = 1 << 18,
+    max_blocks: int = 1024,
+    native_rate: bool = False,
+    channels: int | None = 1,
+    dtype: str = "int16",
+    channel: int | None = None,
+    pool: pools.BufferPool | None = None,
+):
+    """Queue audio captured from the default input device until cancelled.
+
+    The device callback only copies each block into a preallocated ring. Blocks are moved to
+    the queue in batches each time the event loop is woken up. Each block is stamped with its
+    ADC time converted to `misc.time`. Blocks that need no conversion are copied into storage
+    borrowed from a pool, which consumers return with `RawAudio.release`. While a queue with
+    `queues.OverloadPolicy.BLOCK` is full, captured blocks wait in the ring, which drops those
+    that do not fit.
+
+    Args:
+        queue: Queue to put captured audio on.
+        capacity: Number of bytes of captured audio that may wait for the event loop.
+        max_blocks: Number of captured blocks that may wait for the event loop.
+        native_rate: Capture at the device's default sample rate and resample to
+            `devices.AUDIO_SAMPLE_RATE` rather than have PortAudio open the device at that rate.
+        channels: Number of channels to capture, or None for all of the device's channels.
+        dtype: Sample format to capture in. Queued audio is always 16-bit.
+        channel: Captured channel to queue, or None to queue the average of all channels.
+        pool: Pool to borrow block storage from, or None to use a new pool.
+    """
+    input_device = devices.default_input_device()
+    if channels is None:
+        channels = input_device.max_input_channels
+    samplerate = devices.AUDIO_SAMPLE_RATE
+    resampler = None
+    if native_rate:
+        samplerate = input_device.default_samplerate
+        if samplerate != devices.AUDIO_SAMPLE_RATE:
+            resampler = resample.Resampler(samplerate, devices.AUDIO_SAMPLE_RATE)
+    downmixer = None
+    if channels != 1 or dtype != "int16" or channel is not None:
+        downmixer = convert.Downmixer(channels, dtype, channel=channel)
+    ring = capture.CaptureRing(
+        asyncio.get_running_loop(), capacity=capacity, max_blocks=max_blocks
+    )
+    if pool is None:
+        pool = pools.BufferPool()
+
+    # Offset from the stream's clock to misc.time, taken once so that block times keep the
+    # spacing of the stream's clock.
+    time_offset: float | None = None
 
     def callback(
         buffer: Any, frame_count: int, time: devices.Time, status: sounddevice.CallbackFlags
     ):
-        audio = RawAudio(bytes(buffer), frame_count, time.inputBufferAdcTime)
+        nonlocal time_offset
+        if time_offset is None:
+            time_offset = misc.time() - time.currentTime
+        ring.write(buffer, frame_count, time.inputBufferAdcTime + time_offset)
 
-        def queue_audio():
-            queue.put_nowait(audio)
+    def block(data: memoryview, frame_count: int, time: float) -> RawAudio:
+        if downmixer is None and resampler is None:
+            return RawAudio.from_pool(pool, data, frame_count, time)
+        buffer = data if downmixer is None else downmixer.process(data)
+        if resampler is not None:
+            buffer = resampler.process(buffer)
+            frame_count = len(buffer) // devices.AUDIO_BYTES_PER_FRAME
+        return RawAudio(bytes(buffer), frame_count, time)
+
+    # Drained blocks not yet put on the queue.
+    blocks = collections.deque[RawAudio]()
+    try:
+        with devices.default_input_stream(
+            callback, samplerate=samplerate, channels=channels, dtype=dtype
+        ):
+            while True:
+                await ring.wait()
+                blocks.extend(ring.drain(block))
+                while blocks:
+                    await queue.put(blocks[0])
+                    blocks.popleft()
+    finally:
+        for audio in blocks:
+            audio.release()
 
-        loop.call_soon_threadsafe(queue_audio)
 
-    with devices.default_input_stream(callback):
-        await asyncio.Future()
+def _read_into(stream: langgolem_types.BytesReader, buffer: bytearray) -> int:
+    """Fill a buffer from a stream, stopping short only at the end of the stream."""
+    readinto = stream.readinto if isinstance(stream, langgolem_types.ReadIntoReader) else None
+    size = 0
+    with memoryview(buffer) as view:
+        while size < len(view):
+            if readinto is not None:
+                count = readinto(view[size:])
+            else:
+                data = stream.read(len(view) - size)
+                count = len(data)
+                view[size : size + count] = data
+            if not count:
+                break
+            size += count
+    return size
 
 
 async def stream_queuer(
@@ -42,14 +241,222 @@ async def stream_queuer(
     queue: asyncio.Queue[RawAudio],
     *,
     block_size: int = 1 << 16,
+    bytes_per_frame: int = devices.AUDIO_BYTES_PER_FRAME,
+    sample_rate: float = devices.AUDIO_SAMPLE_RATE,
+    speed: float | None = None,
+    max_blocks: int = 4,
+    pool: pools.BufferPool | None = None,
+):
+    """Queue audio read from a stream until the stream ends.
+
+    The stream is read on a dedicated thread, with `readinto` if the stream supports it, into
+    storage borrowed from a pool. Blocks are handed to the event loop through a
+    `queues.ThreadChannel`, so blocks read in a burst cost a single wakeup. At most
+    `max_blocks` blocks are read ahead of the queue, so a full queue holds the reader back.
+    With a speed, each block is stamped with the time it would have been captured live, which
+    is the start time plus its position in the stream played at `speed` times real time, and
+    the thread waits for that time before reading it, so that a speed of 1 reads the stream in
+    real time and a speed of 2 twice as fast. Without a speed, the stream is read as fast as the
+    queue takes it and each block is stamped as it is queued, since its live capture time could
+    lie in the future. Even when cancelled, returns only once the thread has finished reading,
+    so that the stream may be closed then, and releases the blocks that were read but not
+    queued.
+
+    Args:
+        stream: Stream of audio to read.
+        queue: Queue to put the audio on.
+        block_size: Bytes to read per block, rounded down to whole frames.
+        bytes_per_frame: Size of a frame of the stream's audio.
+        sample_rate: Sample rate of the stream's audio.
+        speed: Multiple of real time to pace reading at, or None to not pace.
+        max_blocks: Number of blocks the thread may read ahead of the queue.
+        pool: Pool to borrow block storage from, or None to use a new pool.
+    """
+    if block_size < bytes_per_frame:
+        raise ValueError("block_size must hold at least one frame")
+    if speed is not None and not speed > 0:
+        raise ValueError("speed must be positive")
+    if max_blocks < 1:
+        raise ValueError("max_blocks must be at least 1")
+    loop = asyncio.get_running_loop()
+    if pool is None:
+        pool = pools.BufferPool()
+    block_size -= block_size % bytes_per_frame
+    bytes_per_second = sample_rate * bytes_per_frame * (1.0 if speed is None else speed)
+    start = misc.time()
+    read_ahead = threading.Semaphore(max_blocks)
+    stopped = threading.Event()
+    # Closed by the thread at the end of the stream or with the error that ended it.
+    blocks = queues.ThreadChannel[RawAudio](loop)
+
+    def read_block(time: float) -> RawAudio | None:
+        storage = pool.acquire(block_size)
+        size = _read_into(stream, storage)
+        if size == block_size:
+            return RawAudio(storage, size // bytes_per_frame, time, pool=pool)
+        audio = None
+        if size:
+            # The last block of the stream gets storage of its own size.
+            with memoryview(storage) as view:
+                audio = RawAudio.from_pool(pool, view[:size], size // bytes_per_frame, time)
+        pool.release(storage)
+        return audio
+
+    def read():
+        position = 0
+        while read_ahead.acquire() and not stopped.is_set():
+            time = start + position / bytes_per_second
+            if speed is not None and stopped.wait(max(time - misc.time(), 0.0)):
+                return
+            try:
+                audio = read_block(time)
+            except Exception as error:
+                blocks.close(error)
+                return
+            # The block belongs to the event loop once put, so check it beforehand.
+            ended = audio is None or len(audio.buffer) < block_size
+            if audio is not None:
+                blocks.put(audio)
+            if ended:
+                blocks.close()
+                return
+            position += block_size
+
+    thread = threading.Thread(target=read, name="stream_queuer", daemon=True)
+    thread.start()
+    # Blocks taken from the channel but not yet queued.
+    pending = collections.deque[RawAudio]()
+    try:
+        while batch := await blocks.get_many():
+            pending.extend(batch)
+            while pending:
+                if speed is None:
+                    pending[0].time = misc.time()
+                await queue.put(pending[0])
+                pending.popleft()
+                read_ahead.release()
+    finally:
+        stopped.set()
+        read_ahead.release()
+        await asyncio.to_thread(thread.join)
+        pending.extend(blocks.take_nowait())
+        for audio in pending:
+            audio.release()
+
+
+async def pipe_queuer(
+    pipe: int | langgolem_types.HasFileno,
+    queue: asyncio.Queue[RawAudio],
+    *,
+    block_size: int = 1 << 16,
+    bytes_per_frame: int = devices.AUDIO_BYTES_PER_FRAME,
+    pool: pools.BufferPool | None = None,
 ):
-    while block := await asyncio.to_thread(stream.read, block_size):
-        await queue.put(RawAudio(buffer=block, frames=int(len(block) / 2), time=misc.time()))
+    """Queue audio as it arrives through a pipe, FIFO or socket until it ends.
+
+    The pipe is switched to non-blocking mode and read from a reader callback of the event
+    loop, straight into storage borrowed from a pool, so that audio streamed in by another
+    process is queued without a hop through a thread. Each read queues the whole frames that
+    have arrived, up to `block_size` bytes, stamped with the time they arrived. While a queue
+    with the `queues.OverloadPolicy.BLOCK` policy is full the pipe is not read, which holds
+    the writer back once the pipe's own buffer fills.
+
+    Args:
+        pipe: Pipe, or its file descriptor, to read. Regular files cannot be watched by the
+            event loop and are read with `stream_queuer` instead.
+        queue: Queue to put the audio on.
+        block_size: Maximum number of bytes per block, rounded down to whole frames.
+        bytes_per_frame: Size of a frame of the pipe's audio.
+        pool: Pool to borrow block storage from, or None to use a new pool.
+    """
+    if block_size < bytes_per_frame:
+        raise ValueError("block_size must hold at least one frame")
+    loop = asyncio.get_running_loop()
+    if pool is None:
+        pool = pools.BufferPool()
+    block_size -= block_size % bytes_per_frame
+    fd = pipe if isinstance(pipe, int) else pipe.fileno()
+    blocking = os.get_blocking(fd)
+    os.set_blocking(fd, False)
+    # Completed with None at the end of the pipe or with the error that ended it.
+    done = loop.create_future()
+    storage = pool.acquire(block_size)
+    filled = 0
+    # Put of the block that found the queue full, during which the pipe is not read.
+    pending_put: asyncio.Task[None] | None = None
+
+    def resume(task: asyncio.Task[None]):
+        nonlocal pending_put
+        pending_put = None
+        if not task.cancelled() and not done.done():
+            loop.add_reader(fd, on_readable)
+
+    def put(audio: RawAudio):
+        nonlocal pending_put
+        try:
+            queue.put_nowait(audio)
+        except asyncio.QueueFull:
+            loop.remove_reader(fd)
+            pending_put = loop.create_task(queue.put(audio))
+            pending_put.add_done_callback(resume)
+
+    def on_readable():
+        nonlocal storage, filled
+        try:
+            with memoryview(storage) as view:
+                count = os.readv(fd, [view[filled:]])
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as error:
+            loop.remove_reader(fd)
+            done.set_exception(error)
+            return
+        filled += count
+        size = filled - filled % bytes_per_frame
+        if size == block_size:
+            audio = RawAudio(storage, size // bytes_per_frame, misc.time(), pool=pool)
+            storage = pool.acquire(block_size)
+            filled = 0
+            put(audio)
+        elif size:
+            with memoryview(storage) as view:
+                audio = RawAudio.from_pool(pool, view[:size], size // bytes_per_frame, misc.time())
+                # Keep the part of a frame that has arrived for the next read.
+                view[: filled - size] = view[size:filled]
+            filled -= size
+            put(audio)
+        if not count:
+            loop.remove_reader(fd)
+            done.set_result(None)
+
+    loop.add_reader(fd, on_readable)
+    try:
+        await done
+        if pending_put is not None:
+            await pending_put
+    finally:
+        loop.remove_reader(fd)
+        if pending_put is not None:
+            pending_put.cancel()
+        pool.release(storage)
+        os.set_blocking(fd, blocking)
 
 
-async def default_input_iterator() -> AsyncIterator[RawAudio]:
-    queue = asyncio.Queue[RawAudio]()
-    task = asyncio.create_task(default_input_queuer(queue))
+async def default_input_iterator(
+    *,
+    maxsize: int = 64,
+    policy: queues.OverloadPolicy = queues.OverloadPolicy.DROP_OLDEST,
+    native_rate: bool = False,
+    channels: int | None = 1,
+    dtype: str = "int16",
+    channel: int | None = None,
+) -> AsyncIterator[RawAudio]:
+    queue = capture_queue(maxsize, policy)
+    task = asyncio.create_task(
+        default_input_queuer(
+            queue, native_rate=native_rate, channels=channels, dtype=dtype, channel=channel
+        )
+    )
     try:
         while True:
             yield await queue.get()
@@ -58,14 +465,214 @@ async def default_input_iterator() -> AsyncIterator[RawAudio]:
         await task
 
 
+async def default_output_player(player: playback.Player):
+    """Play audio written to a player on the default output device until cancelled.
+
+    Args:
+        player: Player that the device pulls audio from.
+    """
+    with devices.default_output_stream(player.callback, samplerate=player.sample_rate):
+        await asyncio.get_running_loop().create_future()
+
+
+async def audio_receiver(
+    events: AsyncIterable[rt.RealtimeSessionEvent],
+    player: playback.Player,
+    *,
+    tracer: tracing.LatencyTracer | None = None,
+):
+    """Write the audio of session events to a player until the events end.
+
+    Each response's audio is a separate stream of the player, and audio that the model was
+    interrupted in is flushed so that playback stops at once.
+
+    Args:
+        events: Session, or other source of session events, to receive audio from.
+        player: Player to write the audio to.
+        tracer: Tracer to report commit acknowledgements and response audio to.
+    """
+    responding = False
+    async for event in events:
+        match event:
+            case rt.RealtimeAudio():
+                received = misc.time()
+                if not responding:
+                    responding = True
+                    if tracer is not None:
+                        tracer.response_started(received)
+                player.write(event.audio.data, received)
+            case rt.RealtimeAudioEnd():
+                responding = False
+                player.end()
+            case rt.RealtimeAudioInterrupted():
+                responding = False
+                player.flush()
+            case rt.RealtimeRawModelEvent(
+                data=rt_model_events.RealtimeModelRawServerEvent(
+                    data={"type": "input_audio_buffer.committed"}
+                )
+            ):
+                if tracer is not None:
+                    tracer.commit_acknowledged(misc.time())
+            case _:
+                pass
+
+
+@dataclasses.dataclass
+class UploadStats:
+    """Counters of audio uploaded by `audio_sender`.
+
+    Attributes:
+        sends: Number of audio messages sent.
+        bytes_sent: Number of audio bytes sent.
+        commits: Number of messages that committed the input audio buffer.
+        elapsed: Seconds from receiving the first block to the latest send.
+    """
+
+    sends: int = 0
+    bytes_sent: int = 0
+    commits: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def sends_per_second(self) -> float:
+        return self.sends / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_sent / self.elapsed if self.elapsed > 0 else 0.0
+
+
+# Number of messages of audio that the sender's ring of pending audio holds.
+_PENDING_MESSAGES = 16
+
+
 async def audio_sender(
-    session: rt.RealtimeSession, input_queue: asyncio.Queue[RawAudio], commit_size: int = 1 << 16
+    session: rt.RealtimeSession,
+    input_queue: asyncio.Queue[RawAudio],
+    commit_size: int | None = 1 << 16,
+    *,
+    commit_interval: float | None = None,
+    frame_duration: float | None = 0.02,
+    sample_rate: float = devices.AUDIO_SAMPLE_RATE,
+    stats: UploadStats | None = None,
+    gate: vad.VoiceGate | None = None,
+    encoder: g711.Encoder | None = None,
+    tracer: tracing.LatencyTracer | None = None,
 ):
+    """Send queued audio to a session until cancelled.
+
+    Captured blocks are coalesced into messages holding exactly `frame_duration` of audio.
+    Audio that does not fill a message is sent once no more audio has arrived for
+    `frame_duration`. The input audio buffer is committed whenever the audio sent since the
+    last commit reaches `commit_size` bytes or `commit_interval` seconds have passed since it.
+    When a voice gate is given, only audio that passes the gate is sent. When an encoder is
+    given, audio is encoded before it is coalesced, so messages and commit sizes are measured in
+    encoded audio and the session's input audio format must match the encoder's law. Each block
+    is released once its audio has been copied.
+
+    Args:
+        session: Session to send audio to.
+        input_queue: Queue of captured audio.
+        commit_size: Bytes of audio after which to commit, or None to not commit by size.
+        commit_interval: Seconds after which to commit, or None to not commit by time.
+        frame_duration: Seconds of audio per message, or None to send blocks as queued.
+        sample_rate: Sample rate of the queued audio.
+        stats: Counters to update as audio is sent.
+        gate: Voice gate to suppress audio without speech.
+        encoder: Encoder of the audio to send, or None to send 16-bit audio.
+        tracer: Tracer to record queue and upload latencies and report commits to.
+    """
+    if frame_duration is not None and not frame_duration > 0:
+        raise ValueError("frame_duration must be positive")
+    if stats is None:
+        stats = UploadStats()
+    send_rate, bytes_per_frame = sample_rate, devices.AUDIO_BYTES_PER_FRAME
+    if encoder is not None:
+        send_rate, bytes_per_frame = encoder.sample_rate, encoder.bytes_per_frame
+    # Audio waiting to fill a message, in a ring that holds a few messages.
+    pending: queues.ByteRing | None = None
+    message_size = 0
+    if frame_duration is not None:
+        message_size = max(round(frame_duration * send_rate), 1) * bytes_per_frame
+        pending = queues.ByteRing(message_size * _PENDING_MESSAGES)
+    start: float | None = None
+    last_commit = 0.0
+    uncommitted = 0
+    # End positions in the sent audio and capture times of blocks not yet fully sent.
+    traced_blocks = collections.deque[tuple[int, float]]()
+    traced_bytes = 0
     sent_bytes = 0
+    last_captured = 0.0
+
+    async def send(buffer: bytes):
+        nonlocal last_commit, uncommitted, sent_bytes, last_captured
+        uncommitted += len(buffer)
+        now = misc.time()
+        commit = (commit_size is not None and uncommitted >= commit_size) or (
+            commit_interval is not None and now - last_commit >= commit_interval
+        )
+        await session.send_audio(buffer, commit=commit)
+        assert start is not None
+        stats.sends += 1
+        stats.bytes_sent += len(buffer)
+        stats.elapsed = misc.time() - start
+        if tracer is not None:
+            sent_bytes += len(buffer)
+            sent = misc.time()
+            while traced_blocks and traced_blocks[0][0] <= sent_bytes:
+                _, last_captured = traced_blocks.popleft()
+                tracer.record(tracing.Stage.UPLOAD, sent - last_captured)
+            if commit:
+                tracer.commit_sent(last_captured, sent)
+        if commit:
+            stats.commits += 1
+            last_commit = now
+            uncommitted = 0
+
+    async def process(audio: RawAudio):
+        nonlocal start, last_commit, traced_bytes
+        if start is None:
+            start = last_commit = misc.time()
+        if tracer is not None:
+            tracer.record(tracing.Stage.QUEUE, misc.time() - audio.time)
+
+        buffer = audio.buffer
+        if gate is not None:
+            buffer = gate.process(buffer)
+        if encoder is not None and buffer:
+            buffer = encoder.process(buffer)
+        size = len(buffer)
+        if size and tracer is not None:
+            traced_bytes += size
+            traced_blocks.append((traced_bytes, audio.time))
+        if pending is None:
+            # The block's audio is copied before its storage is returned for reuse.
+            message = bytes(buffer)
+            audio.release()
+            if size:
+                await send(message)
+            return
+
+        # Blocks larger than the ring pass through it a part at a time.
+        with memoryview(buffer) as view:
+            offset = 0
+            while offset < size:
+                offset += pending.write_nowait(view[offset:])
+                while pending.size >= message_size:
+                    await send(pending.read_nowait(message_size))
+        audio.release()
+
     try:
-        while audio := await input_queue.get():
-            sent_bytes += len(audio.buffer)
-            commit = bool(sent_bytes >= commit_size)
-            await session.send_audio(audio.buffer, commit=commit)
+        while True:
+            # Blocks that arrived in a burst are taken in one wakeup.
+            timeout = frame_duration if pending is not None and pending.size else None
+            batch = await queues.get_many(input_queue, timeout=timeout)
+            if not batch:
+                assert pending is not None
+                await send(pending.read_nowait())
+                continue
+            for audio in batch:
+                await process(audio)
     except asyncio.CancelledError:
         pass
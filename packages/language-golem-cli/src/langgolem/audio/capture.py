@@ -0,0 +1,151 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hand-off of captured audio from an audio thread to the event loop."""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+from langgolem.util import queues
+
+
+class CaptureRing:
+    """Preallocated single-producer, single-consumer ring of captured audio blocks.
+
+    The audio thread writes blocks with `write`, which copies them into preallocated storage
+    without allocating buffers or taking locks. The event loop waits for blocks with `wait` and
+    takes all available blocks at once with `drain`. Only the first block written after a
+    drain schedules a wakeup of the event loop, so bursts of small blocks cost a single
+    wakeup.
+
+    Blocks that do not fit are dropped and counted rather than blocking the audio thread.
+
+    Args:
+        loop: Event loop that consumes the blocks.
+        capacity: Number of bytes of audio the ring can hold.
+        max_blocks: Number of blocks the ring can hold.
+    """
+
+    @property
+    def capacity(self) -> int:
+        return len(self.__buffer)
+
+    @property
+    def max_blocks(self) -> int:
+        return len(self.__sizes)
+
+    @property
+    def pending_blocks(self) -> int:
+        return self.__write_block - self.__read_block
+
+    @property
+    def dropped_blocks(self) -> int:
+        return self.__dropped_blocks
+
+    @property
+    def dropped_bytes(self) -> int:
+        return self.__dropped_bytes
+
+    @property
+    def wakeup_count(self) -> int:
+        return self.__wakeup.wakeup_count
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        *,
+        capacity: int = 1 << 18,
+        max_blocks: int = 1024,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if max_blocks < 1:
+            raise ValueError("max_blocks must be at least 1")
+        self.__buffer = bytearray(capacity)
+        self.__view = memoryview(self.__buffer)
+        self.__sizes = [0] * max_blocks
+        self.__frames = [0] * max_blocks
+        self.__times = [0.0] * max_blocks
+        self.__wakeup = queues.ThreadWakeup(loop)
+
+        # Block and byte positions only ever increase. The producer owns the write positions
+        # and drop counters and the consumer owns the read positions.
+        self.__write_block = 0
+        self.__write_offset = 0
+        self.__read_block = 0
+        self.__read_offset = 0
+        self.__dropped_blocks = 0
+        self.__dropped_bytes = 0
+
+    def write(self, buffer: Any, frames: int, time: float) -> bool:
+        """Copy a block into the ring. Called from the audio thread.
+
+        Args:
+            buffer: Object supporting the buffer protocol holding the block's audio.
+            frames: Number of frames in the block.
+            time: Capture time of the block.
+
+        Returns:
+            True if the block was written, False if it was dropped because the ring is full.
+        """
+        data = memoryview(buffer).cast("B")
+        size = len(data)
+        capacity = len(self.__buffer)
+        block = self.__write_block
+        if (
+            block - self.__read_block >= len(self.__sizes)
+            or self.__write_offset + size - self.__read_offset > capacity
+        ):
+            self.__dropped_blocks += 1
+            self.__dropped_bytes += size
+            return False
+
+        start = self.__write_offset % capacity
+        first = min(size, capacity - start)
+        self.__view[start : start + first] = data[:first]
+        if first < size:
+            self.__view[: size - first] = data[first:]
+        slot = block % len(self.__sizes)
+        self.__sizes[slot] = size
+        self.__frames[slot] = frames
+        self.__times[slot] = time
+
+        # Publish the block before checking for a pending wakeup so that the consumer either
+        # sees the block in its current drain or is woken up again.
+        self.__write_offset += size
+        self.__write_block = block + 1
+        self.__wakeup.notify()
+        return True
+
+    async def wait(self):
+        """Wait until blocks have been written since the last wakeup."""
+        await self.__wakeup.wait()
+
+    def drain[T](self, factory: Callable[[memoryview, int, float], T]) -> list[T]:
+        """Take all blocks currently in the ring.
+
+        Args:
+            factory: Creates the result for each block from its audio, frames and time. The
+                audio is a view of the ring's storage that is only valid during the call, so
+                the factory must copy or convert it.
+
+        Returns:
+            One result per block in the order the blocks were written.
+        """
+        capacity = len(self.__buffer)
+        end = self.__write_block
+        result: list[T] = []
+        while self.__read_block < end:
+            slot = self.__read_block % len(self.__sizes)
+            size = self.__sizes[slot]
+            start = self.__read_offset % capacity
+            first = min(size, capacity - start)
+            if first == size:
+                data = self.__view[start : start + size]
+            else:
+                data = memoryview(self.__view[start:].tobytes() + self.__view[: size - first])
+            result.append(factory(data, self.__frames[slot], self.__times[slot]))
+            self.__read_offset += size
+            self.__read_block += 1
+        return result
@@ -0,0 +1,108 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Conversion of captured audio to 16-bit mono."""
+
+from collections.abc import Buffer
+
+import numpy as np
+
+# Factor that scales a sample of each supported format to the 16-bit range.
+_SAMPLE_SCALES = {
+    "int8": 256.0,
+    "uint8": 256.0,
+    "int16": 1.0,
+    "int32": 1.0 / 65536.0,
+    "float32": 32768.0,
+}
+
+# Value of silence in unsigned formats, which is subtracted before scaling.
+_SAMPLE_OFFSETS = {
+    "uint8": 128.0,
+}
+
+
+class Downmixer:
+    """Converts interleaved multi-channel audio to 16-bit mono.
+
+    Either averages all channels or selects one of them. Work buffers are allocated up front
+    and only grow when a block larger than any before arrives, so converting a block allocates
+    nothing but the returned bytes.
+
+    Args:
+        channels: Number of interleaved channels in the input.
+        dtype: Sample format of the input, one of int8, uint8, int16, int32 or float32.
+        channel: Channel to select, or None to average all channels.
+        max_frames: Number of frames to allocate work buffers for.
+    """
+
+    @property
+    def channels(self) -> int:
+        return self.__channels
+
+    @property
+    def dtype(self) -> str:
+        return self.__dtype
+
+    @property
+    def channel(self) -> int | None:
+        return self.__channel
+
+    @property
+    def bytes_per_frame(self) -> int:
+        return self.__channels * self.__input_dtype.itemsize
+
+    def __init__(
+        self,
+        channels: int,
+        dtype: str,
+        *,
+        channel: int | None = None,
+        max_frames: int = 4096,
+    ):
+        if channels < 1:
+            raise ValueError("channels must be at least 1")
+        if dtype not in _SAMPLE_SCALES:
+            raise ValueError(f"Unsupported dtype: {dtype!r}")
+        if channel is not None and not 0 <= channel < channels:
+            raise ValueError(f"channel must be between 0 and {channels - 1}")
+        self.__channels = channels
+        self.__dtype = dtype
+        self.__channel = channel
+        self.__input_dtype = np.dtype(dtype).newbyteorder("<")
+        self.__scale = np.float32(_SAMPLE_SCALES[dtype])
+        self.__offset = np.float32(_SAMPLE_OFFSETS.get(dtype, 0.0))
+        self.__allocate(max_frames)
+
+    def __allocate(self, frames: int):
+        self.__work = np.empty(frames, dtype=np.float32)
+        self.__output = np.empty(frames, dtype="<i2")
+
+    def process(self, buffer: Buffer) -> bytes:
+        """Convert a block of audio.
+
+        Args:
+            buffer: Interleaved samples in the input format.
+
+        Returns:
+            Little-endian 16-bit mono samples, one per input frame.
+        """
+        samples = np.frombuffer(buffer, dtype=self.__input_dtype)
+        frames = samples.size // self.__channels
+        if frames > self.__work.size:
+            self.__allocate(frames)
+        interleaved = samples[: frames * self.__channels].reshape(frames, self.__channels)
+        work = self.__work[:frames]
+        output = self.__output[:frames]
+
+        if self.__channel is not None:
+            np.copyto(work, interleaved[:, self.__channel], casting="unsafe")
+        else:
+            np.mean(interleaved, axis=1, dtype=np.float32, out=work)
+        if self.__offset:
+            np.subtract(work, self.__offset, out=work)
+        np.multiply(work, self.__scale, out=work)
+        np.rint(work, out=work)
+        np.clip(work, -32768, 32767, out=work)
+        np.copyto(output, work, casting="unsafe")
+        return output.tobytes()
@@ -9,6 +9,7 @@ from typing import Any
 import sounddevice
 
 AUDIO_SAMPLE_RATE = 24000.0
+AUDIO_BYTES_PER_FRAME = 2
 
 
 class Time(typing.Protocol):
@@ -18,6 +19,7 @@ class Time(typing.Protocol):
 
 
 type AudioInputCallback = Callable[[Any, int, Time, sounddevice.CallbackFlags], None]
+type AudioOutputCallback = Callable[[Any, int, Time, sounddevice.CallbackFlags], None]
 
 
 @dataclasses.dataclass(frozen=True)
@@ -38,12 +40,40 @@ def default_input_device() -> AudioDevice:
     return AudioDevice(**sounddevice.query_devices(kind="input"))  # pyright: ignore[reportArgumentType, reportCallIssue]
 
 
-def default_input_stream(callback: AudioInputCallback) -> sounddevice.RawInputStream:
+def default_input_stream(
+    callback: AudioInputCallback,
+    *,
+    samplerate: float = AUDIO_SAMPLE_RATE,
+    channels: int = 1,
+    dtype: str = "int16",
+) -> sounddevice.RawInputStream:
     input_device = default_input_device()
     return sounddevice.RawInputStream(
-        samplerate=AUDIO_SAMPLE_RATE,
-        channels=1,
+        samplerate=samplerate,
+        channels=channels,
         device=input_device.index,
         callback=callback,
-        dtype="int16",
+        dtype=dtype,
+    )
+
+
+def default_output_device() -> AudioDevice:
+    return AudioDevice(**sounddevice.query_devices(kind="output"))  # pyright: ignore[reportArgumentType, reportCallIssue]
+
+
+def default_output_stream(
+    callback: AudioOutputCallback,
+    *,
+    samplerate: float = AUDIO_SAMPLE_RATE,
+    channels: int = 1,
+    dtype: str = "int16",
+) -> sounddevice.RawOutputStream:
+    output_device = default_output_device()
+    return sounddevice.RawOutputStream(
+        samplerate=samplerate,
+        channels=channels,
+        device=output_device.index,
+        callback=callback,
+        dtype=dtype,
+        latency=output_device.default_low_output_latency,
     )
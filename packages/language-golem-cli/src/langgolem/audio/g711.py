@@ -0,0 +1,154 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""G.711 mu-law and A-law coding of 16-bit audio.
+
+Both directions are table lookups. Every 16-bit sample is encoded through a table with one
+entry per sample value and every code is decoded through a table with one entry per code, so
+a whole block is converted with a single numpy indexing operation.
+"""
+
+import enum
+import functools
+from collections.abc import Buffer
+
+import numpy as np
+from langgolem.audio import devices
+from langgolem.audio import resample
+
+# Sample rate of G.711 audio.
+SAMPLE_RATE = 8000.0
+
+# Segment end points of the 14-bit mu-law and 13-bit A-law magnitudes.
+_ULAW_SEGMENT_ENDS = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+_ALAW_SEGMENT_ENDS = np.array([0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF])
+
+_ULAW_BIAS = 0x84
+
+
+class Law(enum.StrEnum):
+    """Companding law, named by its Realtime API audio format."""
+
+    ULAW = "audio/pcmu"
+    ALAW = "audio/pcma"
+
+
+def _encode_ulaw(samples: np.ndarray) -> np.ndarray:
+    values = samples >> 2
+    mask = np.where(values < 0, 0x7F, 0xFF)
+    magnitudes = np.minimum(np.abs(values) + (_ULAW_BIAS >> 2), _ULAW_SEGMENT_ENDS[-1])
+    segments = np.searchsorted(_ULAW_SEGMENT_ENDS, magnitudes)
+    codes = (segments << 4) | ((magnitudes >> (segments + 1)) & 0x0F)
+    return (codes ^ mask).astype(np.uint8)
+
+
+def _decode_ulaw(codes: np.ndarray) -> np.ndarray:
+    codes = ~codes & 0xFF
+    magnitudes = (((codes & 0x0F) << 3) + _ULAW_BIAS) << ((codes & 0x70) >> 4)
+    return np.where(codes & 0x80, _ULAW_BIAS - magnitudes, magnitudes - _ULAW_BIAS)
+
+
+def _encode_alaw(samples: np.ndarray) -> np.ndarray:
+    values = samples >> 3
+    mask = np.where(values < 0, 0x55, 0xD5)
+    magnitudes = np.where(values < 0, -values - 1, values)
+    segments = np.searchsorted(_ALAW_SEGMENT_ENDS, magnitudes)
+    shifts = np.maximum(segments, 1)
+    codes = (segments << 4) | ((magnitudes >> shifts) & 0x0F)
+    return (codes ^ mask).astype(np.uint8)
+
+
+def _decode_alaw(codes: np.ndarray) -> np.ndarray:
+    codes = codes ^ 0x55
+    segments = (codes & 0x70) >> 4
+    magnitudes = ((codes & 0x0F) << 4) + np.where(segments == 0, 8, 0x108)
+    magnitudes <<= np.maximum(segments - 1, 0)
+    return np.where(codes & 0x80, magnitudes, -magnitudes)
+
+
+@functools.cache
+def _encode_table(law: Law) -> np.ndarray:
+    # Indexed by the sample's bits read as an unsigned 16-bit integer.
+    samples = np.arange(1 << 16, dtype=np.uint16).view(np.int16).astype(np.int64)
+    return _encode_ulaw(samples) if law == Law.ULAW else _encode_alaw(samples)
+
+
+@functools.cache
+def _decode_table(law: Law) -> np.ndarray:
+    codes = np.arange(1 << 8, dtype=np.int64)
+    samples = _decode_ulaw(codes) if law == Law.ULAW else _decode_alaw(codes)
+    return samples.astype("<i2")
+
+
+def encode(buffer: Buffer, law: Law) -> bytes:
+    """Encode audio.
+
+    Args:
+        buffer: Little-endian 16-bit samples.
+        law: Companding law to encode with.
+
+    Returns:
+        One code per sample.
+    """
+    return _encode_table(law)[np.frombuffer(buffer, dtype="<u2")].tobytes()
+
+
+def decode(buffer: Buffer, law: Law) -> bytes:
+    """Decode audio.
+
+    Args:
+        buffer: Codes of the given law.
+        law: Companding law the codes are encoded with.
+
+    Returns:
+        Little-endian 16-bit samples, one per code.
+    """
+    return _decode_table(law)[np.frombuffer(buffer, dtype=np.uint8)].tobytes()
+
+
+class Encoder:
+    """Streaming encoder of 16-bit mono audio to G.711.
+
+    Audio is resampled to the 8 kHz rate of G.711 before it is encoded into one byte per
+    sample, so 24 kHz 16-bit audio is encoded into a sixth of its size.
+
+    Args:
+        law: Companding law to encode with.
+        input_rate: Sample rate of the audio passed to `process`.
+    """
+
+    @property
+    def law(self) -> Law:
+        return self.__law
+
+    @property
+    def input_rate(self) -> float:
+        return self.__input_rate
+
+    @property
+    def sample_rate(self) -> float:
+        return SAMPLE_RATE
+
+    @property
+    def bytes_per_frame(self) -> int:
+        return 1
+
+    def __init__(self, law: Law, *, input_rate: float = devices.AUDIO_SAMPLE_RATE):
+        self.__law = law
+        self.__input_rate = input_rate
+        self.__resampler = None
+        if input_rate != SAMPLE_RATE:
+            self.__resampler = resample.Resampler(input_rate, SAMPLE_RATE)
+
+    def process(self, buffer: Buffer) -> bytes:
+        """Encode the next block of the stream.
+
+        Args:
+            buffer: Little-endian 16-bit samples at the input rate.
+
+        Returns:
+            Codes at 8 kHz.
+        """
+        if self.__resampler is not None:
+            buffer = self.__resampler.process(buffer)
+        return encode(buffer, self.__law)
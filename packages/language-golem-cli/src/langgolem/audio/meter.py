@@ -0,0 +1,131 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Metering of the level of captured audio."""
+
+import dataclasses
+import math
+from collections.abc import Buffer
+from collections.abc import Callable
+
+import numpy as np
+from langgolem.util import misc
+
+# Magnitude of a full-scale 16-bit sample.
+_FULL_SCALE = 32768.0
+
+
+def _decibels(fraction: float) -> float:
+    return 20 * math.log10(fraction) if fraction > 0 else -math.inf
+
+
+@dataclasses.dataclass(frozen=True)
+class Level:
+    """Level of the audio metered since the previous update.
+
+    Attributes:
+        frames: Number of frames metered.
+        rms: Root mean square of the samples as a fraction of full scale.
+        peak: Largest sample magnitude as a fraction of full scale.
+        clipped: Number of samples at the minimum or maximum value, which are likely clipped.
+    """
+
+    frames: int
+    rms: float
+    peak: float
+    clipped: int
+
+    @property
+    def rms_dbfs(self) -> float:
+        """RMS in decibels relative to full scale, or minus infinity for silence."""
+        return _decibels(self.rms)
+
+    @property
+    def peak_dbfs(self) -> float:
+        """Peak in decibels relative to full scale, or minus infinity for silence."""
+        return _decibels(self.peak)
+
+
+class LevelMeter:
+    """Meter of the RMS level, peak and clipping of 16-bit mono audio.
+
+    Blocks are metered with a few vectorized reductions into running sums, so the meter keeps
+    constant state however long it runs. Rather than report every block, it publishes the level
+    of the audio metered since its previous update at most once per `interval`, which keeps the
+    cost of displaying the level independent of the block rate.
+
+    Args:
+        on_update: Called with each update.
+        interval: Minimum seconds between updates.
+        clock: Clock that the interval is measured with.
+        max_frames: Number of frames to allocate work buffers for.
+    """
+
+    @property
+    def interval(self) -> float:
+        return self.__interval
+
+    @property
+    def update_count(self) -> int:
+        return self.__update_count
+
+    def __init__(
+        self,
+        on_update: Callable[[Level], None],
+        *,
+        interval: float = 0.05,
+        clock: Callable[[], float] = misc.time,
+        max_frames: int = 4096,
+    ):
+        if interval < 0:
+            raise ValueError("interval must not be negative")
+        self.__on_update = on_update
+        self.__interval = interval
+        self.__clock = clock
+        self.__work = np.empty(max_frames, dtype=np.float64)
+        self.__last_update: float | None = None
+        self.__update_count = 0
+        self.__reset()
+
+    def __reset(self):
+        self.__frames = 0
+        self.__sum_of_squares = 0.0
+        self.__peak = 0
+        self.__clipped = 0
+
+    def process(self, buffer: Buffer):
+        """Meter a block of audio, publishing an update if the interval has passed.
+
+        Args:
+            buffer: Little-endian 16-bit samples.
+        """
+        samples = np.frombuffer(buffer, dtype="<i2")
+        if samples.size:
+            if samples.size > self.__work.size:
+                self.__work = np.empty(samples.size, dtype=np.float64)
+            work = self.__work[: samples.size]
+            np.copyto(work, samples)
+            self.__frames += samples.size
+            self.__sum_of_squares += float(np.dot(work, work))
+            self.__peak = max(self.__peak, -int(samples.min()), int(samples.max()))
+            self.__clipped += int(np.count_nonzero(samples == -32768))
+            self.__clipped += int(np.count_nonzero(samples == 32767))
+        now = self.__clock()
+        if self.__last_update is None or now - self.__last_update >= self.__interval:
+            self.__last_update = now
+            self.flush()
+
+    def flush(self):
+        """Publish the level of the audio metered since the previous update, if any."""
+        if not self.__frames:
+            return
+        self.__on_update(
+            Level(
+                frames=self.__frames,
+                rms=math.sqrt(self.__sum_of_squares / self.__frames) / _FULL_SCALE,
+                peak=self.__peak / _FULL_SCALE,
+                clipped=self.__clipped,
+            )
+        )
+        self.__update_count += 1
+        self.__reset()
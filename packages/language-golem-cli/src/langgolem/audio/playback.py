@@ -0,0 +1,180 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Hand-off of audio to play from the event loop to an audio thread."""
+
+from collections.abc import Callable
+from typing import Any
+
+from langgolem.audio import devices
+from langgolem.util import misc
+
+# Size of the silence copied into device buffers that run out of audio.
+_SILENCE_SIZE = 1 << 12
+
+
+class Player:
+    """Preallocated single-producer, single-consumer ring of 16-bit mono audio to play.
+
+    The event loop writes audio with `write` as it is received. The output device's audio
+    thread pulls it with `callback`, which copies from preallocated storage into the device
+    buffer without allocating or taking locks and plays silence when nothing is buffered.
+
+    Audio is played as streams, such as the audio of one response. A stream starts with the
+    first write after the previous stream ended and ends with `end` or `flush`. Running out of
+    audio before a stream ends is counted as an underrun, once however many consecutive device
+    buffers it lasts. The latency from receiving the first audio of each stream until the
+    device plays it is recorded in `latencies`.
+
+    Args:
+        capacity: Number of bytes of audio the ring can hold.
+        sample_rate: Sample rate of the audio.
+        clock: Clock that receive times are measured with. The device's stream times are
+            converted to this clock.
+    """
+
+    @property
+    def capacity(self) -> int:
+        return len(self.__buffer)
+
+    @property
+    def sample_rate(self) -> float:
+        return self.__sample_rate
+
+    @property
+    def pending_bytes(self) -> int:
+        return self.__write_offset - max(self.__read_offset, self.__flush_offset)
+
+    @property
+    def played_bytes(self) -> int:
+        return self.__played_bytes
+
+    @property
+    def dropped_bytes(self) -> int:
+        return self.__dropped_bytes
+
+    @property
+    def underrun_count(self) -> int:
+        """Number of times the player ran out of audio before a stream ended."""
+        return self.__underrun_count
+
+    @property
+    def latencies(self) -> tuple[float, ...]:
+        """Seconds from receiving the first audio of each stream until the device played it."""
+        return tuple(self.__latencies)
+
+    def __init__(
+        self,
+        *,
+        capacity: int = 1 << 21,
+        sample_rate: float = devices.AUDIO_SAMPLE_RATE,
+        clock: Callable[[], float] = misc.time,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.__buffer = bytearray(capacity)
+        self.__view = memoryview(self.__buffer)
+        self.__silence = memoryview(bytes(_SILENCE_SIZE))
+        self.__sample_rate = sample_rate
+        self.__clock = clock
+        self.__bytes_per_second = sample_rate * devices.AUDIO_BYTES_PER_FRAME
+
+        # Byte positions only ever increase. The producer owns the write, flush and end
+        # positions and the consumer owns the read position and the playback counters.
+        self.__write_offset = 0
+        self.__flush_offset = 0
+        self.__end_offset = 0
+        self.__read_offset = 0
+        self.__dropped_bytes = 0
+        self.__played_bytes = 0
+        self.__underrun_count = 0
+        # Whether the previous device buffer ran out of audio before the stream ended.
+        self.__underrunning = False
+
+        # Position and receive time of the first audio of the current stream, until played.
+        self.__mark: tuple[int, float] | None = None
+        self.__latencies: list[float] = []
+
+    def write(self, buffer: bytes, received: float | None = None) -> bool:
+        """Copy audio into the ring. Called from the event loop.
+
+        Args:
+            buffer: Little-endian 16-bit samples.
+            received: Time on the player's clock the audio was received, or None for now.
+
+        Returns:
+            True if the audio was written, False if it was dropped because the ring is full.
+        """
+        size = len(buffer)
+        capacity = len(self.__buffer)
+        if self.pending_bytes + size > capacity:
+            self.__dropped_bytes += size
+            return False
+        if not size:
+            return True
+
+        if self.__write_offset == self.__end_offset:
+            if received is None:
+                received = self.__clock()
+            self.__mark = (self.__write_offset, received)
+        start = self.__write_offset % capacity
+        first = min(size, capacity - start)
+        self.__view[start : start + first] = buffer[:first]
+        if first < size:
+            self.__view[: size - first] = buffer[first:]
+        self.__write_offset += size
+        return True
+
+    def end(self):
+        """End the current stream once its buffered audio has played."""
+        self.__end_offset = self.__write_offset
+
+    def flush(self):
+        """Discard buffered audio and end the current stream, such as on an interruption."""
+        self.__mark = None
+        self.__end_offset = self.__flush_offset = self.__write_offset
+
+    def callback(self, outdata: Any, frames: int, time: devices.Time, status: Any):
+        """Fill a device buffer with the next audio to play. Called from the audio thread.
+
+        Args:
+            outdata: Object supporting the buffer protocol to write the audio to.
+            frames: Number of frames to write.
+            time: Stream times of the callback.
+            status: Stream status flags.
+        """
+        output = memoryview(outdata).cast("B")
+        size = len(output)
+        capacity = len(self.__buffer)
+        read_offset = max(self.__read_offset, self.__flush_offset)
+        count = min(size, self.__write_offset - read_offset)
+
+        start = read_offset % capacity
+        first = min(count, capacity - start)
+        output[:first] = self.__view[start : start + first]
+        if first < count:
+            output[first:count] = self.__view[: count - first]
+        silent = count
+        while silent < size:
+            chunk = min(size - silent, _SILENCE_SIZE)
+            output[silent : silent + chunk] = self.__silence[:chunk]
+            silent += chunk
+        underrunning = count < size and self.__end_offset < self.__write_offset
+        if underrunning and not self.__underrunning:
+            self.__underrun_count += 1
+        self.__underrunning = underrunning
+
+        mark = self.__mark
+        if mark is not None and mark[0] < read_offset + count:
+            self.__mark = None
+            if mark[0] >= read_offset:
+                played = (
+                    self.__clock()
+                    + time.outputBufferDacTime
+                    - time.currentTime
+                    + (mark[0] - read_offset) / self.__bytes_per_second
+                )
+                self.__latencies.append(played - mark[1])
+
+        self.__read_offset = read_offset + count
+        self.__played_bytes += count
@@ -0,0 +1,103 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Streaming sample rate conversion of 16-bit mono audio."""
+
+import math
+from collections.abc import Buffer
+
+import numpy as np
+
+
+def _rate_ratio(input_rate: float, output_rate: float) -> tuple[int, int]:
+    if not input_rate > 0 or not output_rate > 0:
+        raise ValueError("Sample rates must be positive")
+    if not input_rate.is_integer() or not output_rate.is_integer():
+        raise ValueError("Sample rates must be whole numbers")
+    divisor = math.gcd(int(input_rate), int(output_rate))
+    return int(output_rate) // divisor, int(input_rate) // divisor
+
+
+class Resampler:
+    """Stateful polyphase resampler.
+
+    Converts by the rational factor `up / down` between the two rates using a Kaiser windowed
+    sinc low-pass filter split into `up` phases. Each output sample only evaluates the phase of
+    the filter it needs, and all output samples of a block are computed at once. Filter history
+    is carried between blocks so that a stream may be converted in blocks of any size with the
+    same result as converting it at once.
+
+    Args:
+        input_rate: Sample rate of the audio passed to `process`.
+        output_rate: Sample rate of the audio returned by `process`.
+        taps_per_phase: Length of each filter phase. Longer filters attenuate aliasing more at
+            the cost of latency and processing time.
+    """
+
+    @property
+    def input_rate(self) -> float:
+        return self.__input_rate
+
+    @property
+    def output_rate(self) -> float:
+        return self.__output_rate
+
+    @property
+    def up(self) -> int:
+        return self.__up
+
+    @property
+    def down(self) -> int:
+        return self.__down
+
+    @property
+    def delay(self) -> float:
+        """Seconds by which the output lags the input."""
+        return (self.__phases.size - 1) / 2 / (self.__input_rate * self.__up)
+
+    def __init__(self, input_rate: float, output_rate: float, *, taps_per_phase: int = 32):
+        if taps_per_phase < 1:
+            raise ValueError("taps_per_phase must be at least 1")
+        self.__input_rate = input_rate
+        self.__output_rate = output_rate
+        self.__up, self.__down = _rate_ratio(input_rate, output_rate)
+
+        # Prototype filter at the upsampled rate, cutting off below the lower Nyquist frequency.
+        length = taps_per_phase * self.__up
+        cutoff = 0.5 / max(self.__up, self.__down) * 0.95
+        positions = np.arange(length) - (length - 1) / 2
+        prototype = 2 * cutoff * np.sinc(2 * cutoff * positions) * np.kaiser(length, 8.0)
+        prototype *= self.__up / prototype.sum()
+
+        # Phase p holds taps p, p + up, p + 2 up, ... reversed to line up with the history.
+        self.__phases = prototype.reshape(taps_per_phase, self.__up).T[:, ::-1].astype(np.float32)
+        self.__history = np.zeros(taps_per_phase - 1, dtype=np.float32)
+        self.__tap_offsets = np.arange(taps_per_phase)
+        self.__input_count = 0
+        self.__output_count = 0
+
+    def process(self, buffer: Buffer) -> bytes:
+        """Convert the next block of the stream.
+
+        Args:
+            buffer: Little-endian 16-bit samples at the input rate.
+
+        Returns:
+            Little-endian 16-bit samples at the output rate. Their number varies between blocks
+            so that the total output stays in step with the total input.
+        """
+        samples = np.frombuffer(buffer, dtype="<i2").astype(np.float32)
+        extended = np.concatenate((self.__history, samples))
+        input_end = self.__input_count + samples.size
+        output_end = (input_end * self.__up + self.__down - 1) // self.__down
+
+        outputs = np.arange(self.__output_count, output_end, dtype=np.int64)
+        positions = outputs * self.__down
+        newest = positions // self.__up - self.__input_count + self.__history.size
+        windows = extended[newest[:, np.newaxis] - self.__history.size + self.__tap_offsets]
+        converted = np.einsum("ij,ij->i", windows, self.__phases[positions % self.__up])
+
+        self.__history = extended[extended.size - self.__history.size :]
+        self.__input_count = input_end
+        self.__output_count = output_end
+        return np.clip(np.rint(converted), -32768, 32767).astype("<i2").tobytes()
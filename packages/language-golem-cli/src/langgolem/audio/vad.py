@@ -0,0 +1,140 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Client-side voice activity detection."""
+
+import collections
+from collections.abc import Buffer
+
+import numpy as np
+from langgolem.audio import devices
+
+# Level reported for digital silence.
+_SILENCE_DB = -120.0
+
+# Fractions by which the noise floor moves towards the level of each frame. The floor falls
+# quickly and rises slowly so that it follows the quietest parts of the signal.
+_NOISE_FALL = 0.1
+_NOISE_RISE = 0.01
+
+
+class VoiceGate:
+    """Streaming energy based voice activity gate for 16-bit mono audio.
+
+    Audio is analysed in frames of `frame_duration`. A frame is speech when its level is above
+    both `threshold_db` and the tracked noise floor plus `margin_db`, so that steady background
+    noise is learned and ignored. Speech and the following
+    `hangover` of audio pass the gate. Other audio is held in a pre-roll ring of `pre_roll`
+    seconds that is released ahead of the next speech so that onsets are not clipped. Audio
+    that falls out of the pre-roll is suppressed.
+
+    Args:
+        sample_rate: Sample rate of the audio.
+        frame_duration: Seconds of audio per analysis frame.
+        threshold_db: Minimum level of speech in dB relative to full scale.
+        margin_db: Minimum level of speech above the noise floor in dB.
+        pre_roll: Seconds of audio released ahead of detected speech.
+        hangover: Seconds of audio passed after speech ends.
+    """
+
+    @property
+    def active(self) -> bool:
+        """Whether audio currently passes the gate."""
+        return self.__hold > 0
+
+    @property
+    def noise_db(self) -> float:
+        return self.__noise_db
+
+    @property
+    def onsets(self) -> int:
+        """Number of times speech opened the gate."""
+        return self.__onsets
+
+    @property
+    def passed_bytes(self) -> int:
+        return self.__passed_bytes
+
+    @property
+    def suppressed_bytes(self) -> int:
+        return self.__suppressed_bytes
+
+    def __init__(
+        self,
+        *,
+        sample_rate: float = devices.AUDIO_SAMPLE_RATE,
+        frame_duration: float = 0.01,
+        threshold_db: float = -50.0,
+        margin_db: float = 12.0,
+        pre_roll: float = 0.3,
+        hangover: float = 0.8,
+    ):
+        if not frame_duration > 0:
+            raise ValueError("frame_duration must be positive")
+        if pre_roll < 0:
+            raise ValueError("pre_roll must not be negative")
+        if hangover < 0:
+            raise ValueError("hangover must not be negative")
+        self.__frame_size = max(round(frame_duration * sample_rate), 1) * (
+            devices.AUDIO_BYTES_PER_FRAME
+        )
+        self.__threshold_db = threshold_db
+        self.__margin_db = margin_db
+        self.__pre_roll = collections.deque[bytes](maxlen=round(pre_roll / frame_duration))
+        self.__hangover_frames = round(hangover / frame_duration)
+        self.__pending = bytearray()
+        self.__noise_db = threshold_db - margin_db
+        self.__hold = 0
+        self.__onsets = 0
+        self.__passed_bytes = 0
+        self.__suppressed_bytes = 0
+
+    def process(self, buffer: Buffer) -> bytes:
+        """Gate the next block of the stream.
+
+        Args:
+            buffer: Little-endian 16-bit samples.
+
+        Returns:
+            Audio that passes the gate, which may be empty. Audio that does not fill an analysis
+            frame is held until the next block.
+        """
+        self.__pending += buffer
+        frame_count = len(self.__pending) // self.__frame_size
+        if not frame_count:
+            return b""
+        data = bytes(self.__pending[: frame_count * self.__frame_size])
+        del self.__pending[: frame_count * self.__frame_size]
+
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768
+        power = np.mean(np.square(samples.reshape(frame_count, -1)), axis=1)
+        levels = 10 * np.log10(np.maximum(power, 10 ** (_SILENCE_DB / 10)))
+
+        output = bytearray()
+        for index, level in enumerate(levels.tolist()):
+            frame = data[index * self.__frame_size : (index + 1) * self.__frame_size]
+            is_speech = level >= max(self.__threshold_db, self.__noise_db + self.__margin_db)
+            rate = _NOISE_FALL if level < self.__noise_db else _NOISE_RISE
+            self.__noise_db += (level - self.__noise_db) * rate
+
+            if is_speech:
+                if not self.__hold:
+                    self.__onsets += 1
+                    for held in self.__pre_roll:
+                        output.extend(held)
+                    self.__pre_roll.clear()
+                self.__hold = self.__hangover_frames + 1
+
+            if self.__hold:
+                self.__hold -= 1
+                output.extend(frame)
+            else:
+                if not self.__pre_roll.maxlen:
+                    self.__suppressed_bytes += len(frame)
+                    continue
+                if len(self.__pre_roll) == self.__pre_roll.maxlen:
+                    self.__suppressed_bytes += len(self.__pre_roll[0])
+                self.__pre_roll.append(frame)
+
+        self.__passed_bytes += len(output)
+        return bytes(output)
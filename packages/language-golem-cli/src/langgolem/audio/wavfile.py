@@ -0,0 +1,257 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Reading of WAV files as 16-bit mono audio without loading them into memory."""
+
+import dataclasses
+import mmap
+import struct
+from collections.abc import Buffer
+from typing import BinaryIO
+
+import numpy as np
+from langgolem.audio import convert
+from langgolem.audio import devices
+from langgolem.audio import resample
+
+_FORMAT_PCM = 0x0001
+_FORMAT_IEEE_FLOAT = 0x0003
+_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Sample formats by format tag and bits per sample. 24-bit samples are widened to int32.
+_DTYPES = {
+    (_FORMAT_PCM, 8): "uint8",
+    (_FORMAT_PCM, 16): "int16",
+    (_FORMAT_PCM, 24): "int24",
+    (_FORMAT_PCM, 32): "int32",
+    (_FORMAT_IEEE_FLOAT, 32): "float32",
+}
+
+# Size of the chunks converted at a time by `WavReader.read` when reading to the end.
+_READ_ALL_FRAMES = 1 << 16
+
+
+@dataclasses.dataclass(frozen=True)
+class WavFormat:
+    """Format and location of the audio in a WAV file.
+
+    Attributes:
+        channels: Number of interleaved channels.
+        sample_rate: Frames per second.
+        dtype: Sample format, int24 or one of the formats of `convert.Downmixer`.
+        data_offset: Position of the first frame in the file.
+        data_size: Bytes of whole frames in the file.
+    """
+
+    channels: int
+    sample_rate: int
+    dtype: str
+    data_offset: int
+    data_size: int
+
+    @property
+    def bytes_per_frame(self) -> int:
+        return self.channels * (3 if self.dtype == "int24" else np.dtype(self.dtype).itemsize)
+
+    @property
+    def frames(self) -> int:
+        return self.data_size // self.bytes_per_frame
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.sample_rate
+
+
+def is_wav(header: Buffer) -> bool:
+    """Whether the first bytes of a file mark it as a WAV file."""
+    data = bytes(memoryview(header)[:12])
+    return len(data) == 12 and data[:4] == b"RIFF" and data[8:] == b"WAVE"
+
+
+def parse_header(data: Buffer) -> WavFormat:
+    """Find the format and audio of a WAV file.
+
+    Args:
+        data: Contents of the file, or at least of its chunks up to the start of the audio.
+
+    Returns:
+        Format of the file. Audio that the file claims to hold but that is not in `data` is
+        left out, so files whose writer never filled in the sizes can still be read.
+
+    Raises:
+        ValueError: If the data is not a WAV file or its sample format is not supported.
+    """
+    # Released explicitly, since a file mapping cannot be closed while it is exported.
+    with memoryview(data).cast("B") as view:
+        if not is_wav(view):
+            raise ValueError("Not a WAV file")
+        fmt: tuple[int, int, int, int] | None = None
+        position = 12
+        while position + 8 <= len(view):
+            chunk_id = bytes(view[position : position + 4])
+            (chunk_size,) = struct.unpack_from("<I", view, position + 4)
+            body = position + 8
+            if chunk_id == b"fmt ":
+                if chunk_size < 16 or body + 16 > len(view):
+                    raise ValueError("WAV format chunk is too short")
+                tag, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", view, body)
+                if tag == _FORMAT_EXTENSIBLE and chunk_size >= 40 and body + 26 <= len(view):
+                    # The format tag is repeated at the start of the sub-format GUID.
+                    (tag,) = struct.unpack_from("<H", view, body + 24)
+                fmt = (tag, channels, sample_rate, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError("WAV data chunk precedes the format chunk")
+                tag, channels, sample_rate, bits = fmt
+                dtype = _DTYPES.get((tag, bits))
+                if dtype is None:
+                    raise ValueError(f"Unsupported WAV sample format {tag:#06x} with {bits} bits")
+                if channels < 1 or sample_rate < 1:
+                    raise ValueError("WAV file has no channels or no sample rate")
+                wav_format = WavFormat(channels, sample_rate, dtype, body, 0)
+                size = min(chunk_size, len(view) - body)
+                size -= size % wav_format.bytes_per_frame
+                return dataclasses.replace(wav_format, data_size=size)
+            position = body + chunk_size + chunk_size % 2
+    raise ValueError("WAV file has no audio")
+
+
+def _widen_int24(buffer: Buffer) -> np.ndarray:
+    """Convert little-endian 24-bit samples to 32-bit samples of the same scale."""
+    packed = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, 3)
+    widened = np.zeros((packed.shape[0], 4), dtype=np.uint8)
+    widened[:, 1:] = packed
+    return widened.view("<i4")
+
+
+class WavReader:
+    """Reader of a WAV file as 16-bit mono audio at a given sample rate.
+
+    The file is memory-mapped rather than read, and each read only converts the frames it
+    returns, so files of any length are read in constant memory. Audio in another format or
+    with more channels passes through a `convert.Downmixer` and audio at another rate through
+    a `resample.Resampler`. Audio already in the output format is copied straight from the
+    mapping.
+
+    Supports `read` and `readinto`, so that it can be queued with `asyncaudio.stream_queuer`.
+
+    Args:
+        file: WAV file opened for reading in binary mode. Must be a regular file, since pipes
+            cannot be memory-mapped.
+        sample_rate: Sample rate to read the audio at.
+        channel: Channel to read, or None to read the average of all channels.
+
+    Raises:
+        ValueError: If the file cannot be mapped or is not a supported WAV file.
+    """
+
+    @property
+    def format(self) -> WavFormat:
+        return self.__format
+
+    @property
+    def sample_rate(self) -> float:
+        return self.__sample_rate
+
+    @property
+    def position(self) -> int:
+        """Number of frames of the file that have been read."""
+        return self.__offset // self.__format.bytes_per_frame
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        *,
+        sample_rate: float = devices.AUDIO_SAMPLE_RATE,
+        channel: int | None = None,
+    ):
+        try:
+            self.__mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as error:
+            raise ValueError("WAV input must be a regular file") from error
+        try:
+            self.__format = parse_header(self.__mmap)
+        except ValueError:
+            self.__mmap.close()
+            raise
+        wav_format = self.__format
+        self.__sample_rate = sample_rate
+        self.__downmixer = None
+        if wav_format.channels != 1 or wav_format.dtype != "int16" or channel is not None:
+            dtype = "int32" if wav_format.dtype == "int24" else wav_format.dtype
+            self.__downmixer = convert.Downmixer(wav_format.channels, dtype, channel=channel)
+        self.__resampler = None
+        if wav_format.sample_rate != sample_rate:
+            self.__resampler = resample.Resampler(wav_format.sample_rate, sample_rate)
+        self.__data = memoryview(self.__mmap)[
+            wav_format.data_offset : wav_format.data_offset + wav_format.data_size
+        ]
+        self.__offset = 0
+        # Converted audio that did not fit in the previous read.
+        self.__pending = bytearray()
+
+    def close(self):
+        """Unmap the file. The file itself is left open."""
+        self.__data.release()
+        self.__mmap.close()
+
+    def __enter__(self) -> "WavReader":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __convert(self, frames: int) -> Buffer:
+        """Convert the next frames of the file, up to its end."""
+        size = frames * self.__format.bytes_per_frame
+        chunk: Buffer = self.__data[self.__offset : self.__offset + size]
+        self.__offset = min(self.__offset + size, len(self.__data))
+        if self.__format.dtype == "int24":
+            chunk = _widen_int24(chunk)
+        if self.__downmixer is not None:
+            chunk = self.__downmixer.process(chunk)
+        if self.__resampler is not None:
+            chunk = self.__resampler.process(chunk)
+        return chunk
+
+    def readinto(self, buffer: Buffer, /) -> int:
+        """Read converted audio into a buffer.
+
+        Returns:
+            Number of bytes read, which is less than the size of the buffer only at the end of
+            the file.
+        """
+        with memoryview(buffer).cast("B") as output:
+            size = len(output) - len(output) % devices.AUDIO_BYTES_PER_FRAME
+            count = min(size, len(self.__pending))
+            output[:count] = self.__pending[:count]
+            del self.__pending[:count]
+            while count < size and self.__offset < len(self.__data):
+                # Convert about as many input frames as the output needs, at least one.
+                frames = (size - count) // devices.AUDIO_BYTES_PER_FRAME
+                if self.__resampler is not None:
+                    frames = -(-frames * self.__resampler.down // self.__resampler.up)
+                chunk = memoryview(self.__convert(max(frames, 1))).cast("B")
+                taken = min(len(chunk), size - count)
+                output[count : count + taken] = chunk[:taken]
+                self.__pending += chunk[taken:]
+                count += taken
+        return count
+
+    def read(self, count: int | None = -1, /) -> bytes:
+        """Read converted audio.
+
+        Args:
+            count: Number of bytes to read, or None or a negative number to read to the end.
+
+        Returns:
+            The audio, which is shorter than requested only at the end of the file.
+        """
+        if count is None or count < 0:
+            chunks = [bytes(self.__pending)]
+            self.__pending.clear()
+            while self.__offset < len(self.__data):
+                chunks.append(bytes(self.__convert(_READ_ALL_FRAMES)))
+            return b"".join(chunks)
+        buffer = bytearray(count)
+        return bytes(memoryview(buffer)[: self.readinto(buffer)])
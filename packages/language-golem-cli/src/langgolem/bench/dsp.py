@@ -0,0 +1,69 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Timing of audio processing stages.
+
+A stage is timed by passing it the same block of audio repeatedly on one thread. The real-time
+factor is the fraction of one core the stage needs to keep up with live audio.
+"""
+
+import dataclasses
+import time
+from collections.abc import Callable
+
+from langgolem.util import stats
+
+
+@dataclasses.dataclass(frozen=True)
+class StageTiming:
+    """Processing times of a stage.
+
+    Attributes:
+        block_duration: Seconds of audio in each block.
+        block_times: Seconds taken to process each block.
+    """
+
+    block_duration: float
+    block_times: tuple[float, ...]
+
+    @property
+    def mean_block_time(self) -> float:
+        return sum(self.block_times) / len(self.block_times) if self.block_times else 0.0
+
+    @property
+    def p99_block_time(self) -> float:
+        return stats.percentile(self.block_times, 0.99)
+
+    @property
+    def real_time_factor(self) -> float:
+        return self.mean_block_time / self.block_duration
+
+
+def time_stage(
+    stage: Callable[[bytes], object],
+    block: bytes,
+    *,
+    block_duration: float,
+    block_count: int = 1000,
+    clock: Callable[[], float] = time.perf_counter,
+) -> StageTiming:
+    """Time a processing stage.
+
+    Args:
+        stage: Processes one block of audio.
+        block: Block of audio to process.
+        block_duration: Seconds of audio in the block.
+        block_count: Number of times to process the block.
+        clock: Clock to time the stage with.
+
+    Returns:
+        Processing time of each block.
+    """
+    if not block_duration > 0:
+        raise ValueError("block_duration must be positive")
+    block_times: list[float] = []
+    for _ in range(block_count):
+        start = clock()
+        stage(block)
+        block_times.append(clock() - start)
+    return StageTiming(block_duration=block_duration, block_times=tuple(block_times))
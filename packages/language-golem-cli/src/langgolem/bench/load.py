@@ -0,0 +1,367 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Concurrent session load harness.
+
+Runs many realtime sessions in one process, each fed by a paced fake audio source through
+`asyncaudio.audio_sender`, and reports throughput, event loop lag, memory use and per-session
+upload latency. Latency is measured from the moment a block is queued to the moment its last
+byte is handed to the model.
+"""
+
+import array
+import asyncio
+import collections
+import dataclasses
+import resource
+import sys
+import tracemalloc
+from collections.abc import Callable
+from typing import override
+
+from agents import realtime as rt
+from langgolem.audio import asyncaudio
+from langgolem.audio import devices
+from langgolem.util import loops
+from langgolem.util import misc
+from langgolem.util import pools
+from langgolem.util import stats
+
+# Unit of the maximum resident set size reported by getrusage.
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+@dataclasses.dataclass(frozen=True)
+class SessionStats:
+    """Upload statistics for a single session.
+
+    Attributes:
+        index: Index of the session within the run.
+        blocks_queued: Number of audio blocks queued by the source.
+        bytes_sent: Number of audio bytes received by the model.
+        latencies: Seconds from queueing to delivery, for each delivered block.
+        sends: Number of audio messages received by the model.
+        buffers_allocated: Number of block buffers allocated rather than reused.
+        buffers_reused: Number of block buffers reused after the sender released them.
+    """
+
+    index: int
+    blocks_queued: int
+    bytes_sent: int
+    latencies: tuple[float, ...]
+    sends: int = 0
+    buffers_allocated: int = 0
+    buffers_reused: int = 0
+
+    @property
+    def p50(self) -> float:
+        return stats.percentile(self.latencies, 0.5)
+
+    @property
+    def p99(self) -> float:
+        return stats.percentile(self.latencies, 0.99)
+
+
+@dataclasses.dataclass(frozen=True)
+class LoadReport:
+    """Aggregate results of a load run.
+
+    Attributes:
+        elapsed: Wall time of the run in seconds.
+        sessions: Statistics of each session.
+        loop_lag: Histogram of event loop lag samples in seconds.
+        peak_rss: Peak resident set size of the process by the end of the run in bytes.
+        peak_traced: Peak bytes allocated by Python during the run, or 0 if not traced.
+    """
+
+    elapsed: float
+    sessions: tuple[SessionStats, ...]
+    loop_lag: stats.Histogram
+    peak_rss: int = 0
+    peak_traced: int = 0
+
+    @property
+    def bytes_sent(self) -> int:
+        return sum(s.bytes_sent for s in self.sessions)
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_sent / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def sends_per_second(self) -> float:
+        sends = sum(s.sends for s in self.sessions)
+        return sends / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def blocks_per_second(self) -> float:
+        blocks = sum(s.blocks_queued for s in self.sessions)
+        return blocks / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def buffers_allocated(self) -> int:
+        return sum(s.buffers_allocated for s in self.sessions)
+
+    @property
+    def buffers_reused(self) -> int:
+        return sum(s.buffers_reused for s in self.sessions)
+
+    @property
+    def loop_lag_p99(self) -> float:
+        return self.loop_lag.percentile(0.99)
+
+    @property
+    def loop_lag_max(self) -> float:
+        return self.loop_lag.max if self.loop_lag.count else 0.0
+
+    @property
+    def peak_traced_per_session(self) -> float:
+        return self.peak_traced / len(self.sessions) if self.sessions else 0.0
+
+
+class _DeliveryTracker:
+    """Matches bytes arriving at the model with the blocks they were queued in."""
+
+    def __init__(self):
+        self.__pending: collections.deque[tuple[int, float]] = collections.deque()
+        self.__queued_bytes = 0
+        self.blocks_queued = 0
+        self.bytes_sent = 0
+        self.sends = 0
+        self.latencies: list[float] = []
+
+    @property
+    def delivered(self) -> bool:
+        return self.bytes_sent >= self.__queued_bytes
+
+    def queued(self, size: int, now: float):
+        self.__queued_bytes += size
+        self.blocks_queued += 1
+        self.__pending.append((self.__queued_bytes, now))
+
+    def sent(self, size: int, now: float):
+        self.sends += 1
+        self.bytes_sent += size
+        while self.__pending and self.__pending[0][0] <= self.bytes_sent:
+            _, queued_at = self.__pending.popleft()
+            self.latencies.append(now - queued_at)
+
+
+class _TrackingModel(rt.RealtimeModel):
+    """Delegating model that reports audio deliveries to a tracker."""
+
+    def __init__(self, model: rt.RealtimeModel, tracker: _DeliveryTracker):
+        self.__model = model
+        self.__tracker = tracker
+
+    @override
+    async def connect(self, options: rt.RealtimeModelConfig):
+        await self.__model.connect(options)
+
+    @override
+    def add_listener(self, listener: rt.RealtimeModelListener) -> None:
+        self.__model.add_listener(listener)
+
+    @override
+    def remove_listener(self, listener: rt.RealtimeModelListener) -> None:
+        self.__model.remove_listener(listener)
+
+    @override
+    async def send_event(self, event: rt.RealtimeModelSendEvent):
+        await self.__model.send_event(event)
+        if isinstance(event, rt.RealtimeModelSendAudio):
+            self.__tracker.sent(len(event.audio), misc.time())
+
+    @override
+    async def close(self):
+        await self.__model.close()
+
+
+def tone_block(frames: int) -> bytes:
+    """Create a block of 16-bit sawtooth audio.
+
+    Args:
+        frames: Number of frames in the block.
+
+    Returns:
+        Little-endian 16-bit mono samples.
+    """
+    samples = array.array("h", ((i * 512) % 65536 - 32768 for i in range(frames)))
+    return samples.tobytes()
+
+
+async def fake_audio_source(
+    queue: asyncio.Queue[asyncaudio.RawAudio],
+    *,
+    duration: float,
+    block_frames: int,
+    sample_rate: float = devices.AUDIO_SAMPLE_RATE,
+    speed: float = 1.0,
+    on_queued: Callable[[int], None] | None = None,
+    pool: pools.BufferPool | None = None,
+):
+    """Queue paced audio blocks as if captured from a device.
+
+    Blocks are scheduled against the start time so that pacing does not drift when the event
+    loop is late. Like captured blocks, each block is a copy of the audio, in storage borrowed
+    from the pool if one is given.
+
+    Args:
+        queue: Queue to put captured audio on.
+        duration: Seconds of audio to produce.
+        block_frames: Frames per block.
+        sample_rate: Sample rate of the produced audio.
+        speed: Pacing multiplier. Values above 1 produce audio faster than real time.
+        on_queued: Called with the size of each block after it is queued.
+        pool: Pool to borrow block storage from, or None to allocate each block.
+    """
+    if not speed > 0:
+        raise ValueError("speed must be positive")
+    loop = asyncio.get_running_loop()
+    block = tone_block(block_frames)
+    block_period = block_frames / sample_rate / speed
+    block_count = int(duration * sample_rate / block_frames)
+    start = loop.time()
+    for index in range(block_count):
+        delay = start + index * block_period - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if pool is None:
+            audio = asyncaudio.RawAudio(bytes(memoryview(block)), block_frames, misc.time())
+        else:
+            audio = asyncaudio.RawAudio.from_pool(pool, block, block_frames, misc.time())
+        await queue.put(audio)
+        if on_queued is not None:
+            on_queued(len(block))
+
+
+async def _run_session(
+    index: int,
+    model: rt.RealtimeModel,
+    agent: rt.RealtimeAgent,
+    *,
+    duration: float,
+    block_frames: int,
+    speed: float,
+    frame_duration: float | None,
+    drain_timeout: float,
+    pool_buffers: bool,
+) -> SessionStats:
+    loop = asyncio.get_running_loop()
+    tracker = _DeliveryTracker()
+    runner = rt.RealtimeRunner(agent, model=_TrackingModel(model, tracker))
+    queue = asyncio.Queue[asyncaudio.RawAudio]()
+    pool = pools.BufferPool() if pool_buffers else None
+
+    async with await runner.run() as session:
+        sender = asyncio.create_task(
+            asyncaudio.audio_sender(session, queue, frame_duration=frame_duration)
+        )
+        try:
+            await fake_audio_source(
+                queue,
+                duration=duration,
+                block_frames=block_frames,
+                speed=speed,
+                on_queued=lambda size: tracker.queued(size, misc.time()),
+                pool=pool,
+            )
+            deadline = loop.time() + drain_timeout
+            while not tracker.delivered and loop.time() < deadline:
+                await asyncio.sleep(block_frames / devices.AUDIO_SAMPLE_RATE / speed)
+        finally:
+            sender.cancel()
+            await sender
+
+    return SessionStats(
+        index=index,
+        blocks_queued=tracker.blocks_queued,
+        bytes_sent=tracker.bytes_sent,
+        latencies=tuple(tracker.latencies),
+        sends=tracker.sends,
+        buffers_allocated=tracker.blocks_queued if pool is None else pool.allocated_count,
+        buffers_reused=0 if pool is None else pool.reused_count,
+    )
+
+
+async def run_load(
+    model_factory: Callable[[], rt.RealtimeModel],
+    agent: rt.RealtimeAgent,
+    *,
+    session_count: int,
+    duration: float,
+    block_frames: int = 480,
+    speed: float = 1.0,
+    frame_duration: float | None = 0.02,
+    lag_interval: float = 0.01,
+    drain_timeout: float = 5.0,
+    pool_buffers: bool = True,
+    trace_memory: bool = False,
+) -> LoadReport:
+    """Run concurrent sessions and report how well the process kept up.
+
+    Args:
+        model_factory: Creates the model for each session.
+        agent: Starting agent of every session.
+        session_count: Number of concurrent sessions.
+        duration: Seconds of audio each session uploads.
+        block_frames: Frames per captured block.
+        speed: Pacing multiplier for the audio sources.
+        frame_duration: Seconds of audio per message sent, or None to send blocks as queued.
+        lag_interval: Seconds between event loop lag samples.
+        drain_timeout: Seconds to wait for queued audio to be sent after the source ends.
+        pool_buffers: Recycle the storage of audio blocks rather than allocate each block.
+        trace_memory: Trace the peak of Python allocations during the run, which slows it.
+
+    Returns:
+        Aggregate report of the run.
+    """
+    if session_count < 1:
+        raise ValueError("session_count must be at least 1")
+    loop = asyncio.get_running_loop()
+    monitor = loops.LagMonitor(lag_interval)
+    monitor_task = asyncio.create_task(monitor.run())
+    was_tracing = tracemalloc.is_tracing()
+    if trace_memory:
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    start = loop.time()
+    try:
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [
+                task_group.create_task(
+                    _run_session(
+                        index,
+                        model_factory(),
+                        agent,
+                        duration=duration,
+                        block_frames=block_frames,
+                        speed=speed,
+                        frame_duration=frame_duration,
+                        drain_timeout=drain_timeout,
+                        pool_buffers=pool_buffers,
+                    )
+                )
+                for index in range(session_count)
+            ]
+        elapsed = loop.time() - start
+    finally:
+        peak_traced = 0
+        if trace_memory:
+            _, peak_traced = tracemalloc.get_traced_memory()
+            if not was_tracing:
+                tracemalloc.stop()
+        monitor_task.cancel()
+        try:
+            await monitor_task
+        except asyncio.CancelledError:
+            pass
+
+    return LoadReport(
+        elapsed=elapsed,
+        sessions=tuple(t.result() for t in tasks),
+        loop_lag=monitor.histogram,
+        peak_rss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT,
+        peak_traced=peak_traced,
+    )
@@ -0,0 +1,122 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Timing of reading queued chunks of audio as a stream.
+
+`queues.QueueStream` is compared against `CopyingQueueStream`, the implementation it replaced,
+by filling a queue with chunks and timing how long it takes to read them back out.
+"""
+
+import asyncio
+import dataclasses
+import time
+from collections.abc import Callable
+
+from langgolem.util import queues
+from langgolem.util import stats
+from langgolem.util import types as langgolem_types
+
+
+class CopyingQueueStream:
+    """Former `queues.QueueStream`, which copies each byte three times, as a baseline."""
+
+    def __init__(self, queue: asyncio.Queue[bytes]):
+        self.__queue = queue
+        self.__current_bytes = b""
+        self.__offset = 0
+
+    def read(self, count: int | None = -1, /) -> bytes:
+        if count is not None and count < 0:
+            count = None
+        result = bytearray()
+        while count is None or count > 0:
+            if self.__offset >= len(self.__current_bytes):
+                self.__offset = 0
+                try:
+                    self.__current_bytes = self.__queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    self.__current_bytes = b""
+                    break
+            if count is None:
+                next_bytes = self.__current_bytes[self.__offset :]
+            else:
+                next_bytes = self.__current_bytes[self.__offset : self.__offset + count]
+            self.__offset += len(next_bytes)
+            result.extend(next_bytes)
+            if count is not None:
+                count -= len(next_bytes)
+        return bytes(result)
+
+
+@dataclasses.dataclass(frozen=True)
+class ReadTiming:
+    """Times taken to read all queued chunks.
+
+    Attributes:
+        bytes_per_pass: Bytes read in each pass.
+        pass_times: Seconds taken by each pass.
+    """
+
+    bytes_per_pass: int
+    pass_times: tuple[float, ...]
+
+    @property
+    def mean_pass_time(self) -> float:
+        return sum(self.pass_times) / len(self.pass_times) if self.pass_times else 0.0
+
+    @property
+    def p99_pass_time(self) -> float:
+        return stats.percentile(self.pass_times, 0.99)
+
+    @property
+    def throughput(self) -> float:
+        """Bytes read per second."""
+        return self.bytes_per_pass / self.mean_pass_time if self.mean_pass_time else 0.0
+
+
+def time_reads(
+    stream_factory: Callable[[asyncio.Queue[bytes]], langgolem_types.BytesReader],
+    *,
+    chunk_size: int = 4800,
+    chunk_count: int = 100,
+    read_size: int = 1 << 12,
+    readinto: bool = False,
+    pass_count: int = 100,
+    clock: Callable[[], float] = time.perf_counter,
+) -> ReadTiming:
+    """Time reading queued chunks through a stream.
+
+    Each pass queues the chunks, which is not timed, and then reads them all in reads of
+    `read_size` bytes.
+
+    Args:
+        stream_factory: Creates a stream reading a queue, such as `queues.QueueStream`.
+        chunk_size: Bytes per queued chunk.
+        chunk_count: Number of chunks queued per pass.
+        read_size: Bytes per read.
+        readinto: Read into a reused buffer with `readinto` rather than with `read`.
+        pass_count: Number of passes.
+        clock: Clock to time the passes with.
+
+    Returns:
+        Time taken by each pass.
+    """
+    if read_size < 1:
+        raise ValueError("read_size must be at least 1")
+    chunks = [bytes(chunk_size)] * chunk_count
+    buffer = bytearray(read_size)
+    pass_times: list[float] = []
+    for _ in range(pass_count):
+        stream = stream_factory(queues.populated_queue(chunks))
+        if readinto:
+            if not isinstance(stream, langgolem_types.ReadIntoReader):
+                raise ValueError("stream does not support readinto")
+            start = clock()
+            while stream.readinto(buffer):
+                pass
+        else:
+            start = clock()
+            while stream.read(read_size):
+                pass
+        pass_times.append(clock() - start)
+    return ReadTiming(bytes_per_pass=chunk_size * chunk_count, pass_times=tuple(pass_times))
@@ -4,42 +4,211 @@
 # Copyright 2025 The Milton Hirsch Institute, B.V.
 # SPDX-License-Identifier: Apache-2.0
 import asyncio
+import io
+import os
+import stat
+from concurrent import futures
+from typing import BinaryIO
 
 import click
 from langgolem.audio import asyncaudio
+from langgolem.audio import meter
+from langgolem.audio import wavfile
+from langgolem.util import loops
+from langgolem.util import misc
+from langgolem.util import queues
+from langgolem.util import tracing
 
 
 class EndProgram(Exception):
     """Raised when the program exited."""
 
 
+def _is_pipe(file: BinaryIO) -> bool:
+    """Whether a file is a pipe, FIFO or socket that the event loop can watch."""
+    try:
+        mode = os.fstat(file.fileno()).st_mode
+    except (io.UnsupportedOperation, OSError):
+        return False
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)
+
+
+def _is_wav_file(file: BinaryIO) -> bool:
+    """Whether a file is a seekable regular file that starts like a WAV file."""
+    try:
+        if not stat.S_ISREG(os.fstat(file.fileno()).st_mode) or not file.seekable():
+            return False
+    except (io.UnsupportedOperation, OSError):
+        return False
+    position = file.tell()
+    header = file.read(12)
+    file.seek(position)
+    return wavfile.is_wav(header)
+
+
+def _format_level(level: meter.Level) -> str:
+    return (
+        f"frames={level.frames} rms={level.rms_dbfs:.1f} dBFS"
+        f" peak={level.peak_dbfs:.1f} dBFS clipped={level.clipped}"
+    )
+
+
 @click.command()
 @click.option("-i", "--input-file", type=click.File("rb"), default=None)
-def prattle(input_file):
+@click.option(
+    "--queue-size",
+    type=click.IntRange(min=1),
+    default=64,
+    show_default=True,
+    help="Maximum number of audio blocks waiting to be processed.",
+)
+@click.option(
+    "--overload-policy",
+    type=click.Choice(queues.OverloadPolicy, case_sensitive=False),
+    default=queues.OverloadPolicy.BLOCK,
+    show_default=True,
+    help="What to do with audio that arrives while the queue is full.",
+)
+@click.option(
+    "--latency-report",
+    is_flag=True,
+    help="Report latency percentiles of each traced stage on exit.",
+)
+@click.option(
+    "--speed",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help=(
+        "Read the input file at this multiple of real time rather than as fast as possible."
+        " Pipes are read as the audio arrives."
+    ),
+)
+@click.option(
+    "--loop",
+    "loop_implementation",
+    type=click.Choice(loops.LoopImplementation, case_sensitive=False),
+    default=loops.LoopImplementation.ASYNCIO,
+    show_default=True,
+    help="Event loop to run on. auto uses uvloop if it is installed.",
+)
+@click.option(
+    "--monitor-lag",
+    is_flag=True,
+    help="Warn when the event loop lags by more than the lag threshold and report lag on exit.",
+)
+@click.option(
+    "--lag-threshold",
+    type=click.FloatRange(min=0, min_open=True),
+    default=0.02,
+    show_default=True,
+    help="Seconds of event loop lag to warn about, by default the period of an audio frame.",
+)
+@click.option(
+    "--level-interval",
+    type=click.FloatRange(min=0),
+    default=0.05,
+    show_default=True,
+    help="Minimum seconds between updates of the input level.",
+)
+def prattle(
+    input_file,
+    queue_size,
+    overload_policy,
+    latency_report,
+    speed,
+    loop_implementation,
+    monitor_lag,
+    lag_threshold,
+    level_interval,
+):
     """Have a prattle with the language golem"""
-    audio_queue = asyncio.Queue[asyncaudio.RawAudio]()
+    try:
+        loop_factory = loops.loop_factory(loop_implementation)
+    except ValueError as error:
+        click.secho(f"Cannot run on {loop_implementation}: {error}", fg="red", err=True)
+        exit(1)
+    audio_queue = asyncaudio.capture_queue(queue_size, overload_policy)
+    tracer = tracing.LatencyTracer()
 
-    if input_file:
-        queuer = asyncaudio.stream_queuer(input_file, audio_queue)
+    stream = input_file
+    if input_file and _is_pipe(input_file):
+        # Audio streamed in by another process is queued as it arrives.
+        queuer = asyncaudio.pipe_queuer(input_file, audio_queue)
+    elif input_file:
+        if _is_wav_file(input_file):
+            # WAV files are mapped and converted as they are read rather than loaded whole.
+            try:
+                stream = wavfile.WavReader(input_file)
+            except ValueError as error:
+                click.secho(f"Cannot read {input_file.name}: {error}", fg="red", err=True)
+                exit(1)
+        queuer = asyncaudio.stream_queuer(stream, audio_queue, speed=speed)
     else:
         click.secho("Audio input devices not supported.", fg="red", err=True)
         exit(1)
 
-    async def read_queue():
+    async def read_queue(echo_executor: futures.Executor):
         loop = asyncio.get_event_loop()
-        while audio := await audio_queue.get():
-            loop.run_in_executor(None, click.echo, audio.frames)
+
+        def echo_level(level: meter.Level):
+            loop.run_in_executor(echo_executor, click.echo, _format_level(level))
+
+        level_meter = meter.LevelMeter(echo_level, interval=level_interval)
+        try:
+            while True:
+                for audio in await queues.get_many(audio_queue):
+                    tracer.record(tracing.Stage.QUEUE, misc.time() - audio.time)
+                    level_meter.process(audio.buffer)
+                    audio.release()
+                    audio_queue.task_done()
+        finally:
+            level_meter.flush()
 
     async def queue_audio():
         await queuer
+        # End once the reader has taken all of the input rather than cut it short.
+        await audio_queue.join()
         raise EndProgram()
 
-    async def run():
+    def warn_lag(lag: float):
+        click.secho(
+            f"Event loop lagged {lag * 1000:.1f} ms, over {lag_threshold * 1000:.1f} ms.",
+            fg="yellow",
+            err=True,
+        )
+
+    monitor = loops.LagMonitor(threshold=lag_threshold, on_late=warn_lag)
+
+    async def run(echo_executor: futures.Executor):
         try:
             async with asyncio.TaskGroup() as task_group:
-                task_group.create_task(read_queue())
+                task_group.create_task(read_queue(echo_executor))
                 task_group.create_task(queue_audio())
+                if monitor_lag:
+                    task_group.create_task(monitor.run())
         except* EndProgram:
             pass
 
-    asyncio.run(run())
+    try:
+        # A single thread echoes blocks in the order they were queued.
+        with futures.ThreadPoolExecutor(max_workers=1) as echo_executor:
+            asyncio.run(run(echo_executor), loop_factory=loop_factory)
+    finally:
+        # The queuer has finished reading by the time the run ends, even if interrupted.
+        if isinstance(stream, wavfile.WavReader):
+            stream.close()
+
+    if audio_queue.dropped_count:
+        click.secho(
+            f"Dropped {audio_queue.dropped_count} audio blocks"
+            f" ({audio_queue.dropped_size} bytes).",
+            fg="yellow",
+            err=True,
+        )
+
+    if latency_report:
+        for line in tracer.report():
+            click.echo(line, err=True)
+
+    if monitor_lag:
+        click.echo(monitor.report(), err=True)
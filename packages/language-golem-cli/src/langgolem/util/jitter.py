@@ -0,0 +1,183 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Adaptive jitter buffering of streamed audio."""
+
+from collections.abc import Callable
+
+from langgolem.util import misc
+
+# Fractions by which the jitter estimate moves towards the lateness of each chunk. The estimate
+# rises quickly so that late chunks soon enlarge the buffer and falls slowly so that it
+# remembers them for a while.
+_JITTER_RISE = 1 / 2
+_JITTER_FALL = 1 / 16
+
+
+class JitterBuffer:
+    """Buffer that delays the start of playback by as much as arrivals jitter.
+
+    Audio arrives in chunks with `put` and is taken at the playback rate with `get`. Each
+    chunk's lateness is how much later it arrives, relative to its position in the stream, than
+    the earliest chunk of the stream did. Chunks that arrive in a burst ahead of time are not
+    late, so only delays that would starve playback count. Jitter is a smoothed estimate of the
+    lateness. Playback of each stream only starts once the buffer holds `target_delay` of
+    audio, which is the jitter estimate times `jitter_multiplier` kept between `min_delay` and
+    `max_delay`. Timely audio is thus played almost at once while late audio is smoothed out.
+
+    Running out of audio before a stream ends is an underrun. Playback then waits for the
+    buffer to refill to the target delay. A stream ends with `end`, after which its remaining
+    audio is played without waiting, or is discarded at once with `flush`.
+
+    Not thread safe. Put and get audio from the same thread.
+
+    Args:
+        bytes_per_second: Rate at which audio is played.
+        min_delay: Minimum seconds of audio to buffer before playback starts.
+        max_delay: Maximum seconds of audio to buffer before playback starts.
+        jitter_multiplier: Multiple of the jitter estimate to buffer.
+        clock: Clock to measure arrival times with, by default that of audio timestamps.
+    """
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.__bytes_per_second
+
+    @property
+    def jitter(self) -> float:
+        """Estimated lateness of arriving chunks in seconds."""
+        return self.__jitter
+
+    @property
+    def target_delay(self) -> float:
+        """Seconds of audio to buffer before playback starts."""
+        delay = self.__jitter * self.__jitter_multiplier
+        return min(max(delay, self.__min_delay), self.__max_delay)
+
+    @property
+    def buffered_bytes(self) -> int:
+        return len(self.__buffer)
+
+    @property
+    def buffered_duration(self) -> float:
+        return len(self.__buffer) / self.__bytes_per_second
+
+    @property
+    def playing(self) -> bool:
+        """Whether a stream is being played rather than buffered."""
+        return self.__playing
+
+    @property
+    def underrun_count(self) -> int:
+        return self.__underrun_count
+
+    @property
+    def flush_count(self) -> int:
+        return self.__flush_count
+
+    @property
+    def added_latencies(self) -> tuple[float, ...]:
+        """Seconds that buffering delayed the start of each stream and each recovery."""
+        return tuple(self.__added_latencies)
+
+    def __init__(
+        self,
+        *,
+        bytes_per_second: float,
+        min_delay: float = 0.02,
+        max_delay: float = 0.5,
+        jitter_multiplier: float = 2.0,
+        clock: Callable[[], float] = misc.time,
+    ):
+        if not bytes_per_second > 0:
+            raise ValueError("bytes_per_second must be positive")
+        if min_delay < 0:
+            raise ValueError("min_delay must not be negative")
+        if max_delay < min_delay:
+            raise ValueError("max_delay must be at least min_delay")
+        self.__bytes_per_second = bytes_per_second
+        self.__min_delay = min_delay
+        self.__max_delay = max_delay
+        self.__jitter_multiplier = jitter_multiplier
+        self.__clock = clock
+        self.__buffer = bytearray()
+        self.__jitter = 0.0
+        self.__underrun_count = 0
+        self.__flush_count = 0
+        self.__added_latencies: list[float] = []
+        self.__reset_stream()
+
+    def __reset_stream(self):
+        self.__stream_start: float | None = None
+        self.__stream_bytes = 0
+        self.__min_transit: float | None = None
+        self.__buffering_since = 0.0
+        self.__playing = False
+        self.__ended = False
+
+    def put(self, chunk: bytes, received: float | None = None):
+        """Add the next chunk of the current stream, starting a stream if there is none.
+
+        Args:
+            chunk: Audio to buffer.
+            received: Time on the buffer's clock the chunk arrived, or None for now.
+        """
+        if received is None:
+            received = self.__clock()
+        if self.__stream_start is None:
+            self.__buffering_since = received
+        if self.__stream_start is None or self.__ended:
+            # Arrivals are timed relative to the start of their own stream, even when it
+            # follows an ended stream that is still playing.
+            self.__stream_start = received
+            self.__stream_bytes = 0
+            self.__min_transit = None
+            self.__ended = False
+
+        transit = received - self.__stream_start - self.__stream_bytes / self.__bytes_per_second
+        if self.__min_transit is None or transit < self.__min_transit:
+            self.__min_transit = transit
+        lateness = transit - self.__min_transit
+        rate = _JITTER_RISE if lateness > self.__jitter else _JITTER_FALL
+        self.__jitter += (lateness - self.__jitter) * rate
+        self.__stream_bytes += len(chunk)
+        self.__buffer.extend(chunk)
+
+    def end(self):
+        """End the current stream once its buffered audio has played."""
+        if self.__stream_start is not None:
+            self.__ended = True
+
+    def flush(self):
+        """Discard buffered audio and end the current stream, such as on an interruption."""
+        self.__buffer.clear()
+        self.__reset_stream()
+        self.__flush_count += 1
+
+    def get(self, size: int) -> bytes:
+        """Take the next audio to play.
+
+        Args:
+            size: Number of bytes to take.
+
+        Returns:
+            Exactly `size` bytes. Silence is played while buffering or when the buffer runs out.
+        """
+        if self.__stream_start is None:
+            return bytes(size)
+        if not self.__playing:
+            if not self.__ended and self.buffered_duration < self.target_delay:
+                return bytes(size)
+            self.__playing = True
+            self.__added_latencies.append(self.__clock() - self.__buffering_since)
+
+        result = bytes(self.__buffer[:size])
+        del self.__buffer[:size]
+        if not self.__buffer:
+            if self.__ended:
+                self.__reset_stream()
+            elif len(result) < size:
+                self.__underrun_count += 1
+                self.__playing = False
+                self.__buffering_since = self.__clock()
+        return result + bytes(size - len(result))
@@ -0,0 +1,147 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Choice of event loop implementation and monitoring of event loop lag."""
+
+import asyncio
+import collections
+import enum
+import importlib
+from collections.abc import Callable
+
+from langgolem.util import stats
+
+
+class LoopImplementation(enum.StrEnum):
+    """Event loop implementation to run on."""
+
+    ASYNCIO = "asyncio"
+    """The standard library's event loop."""
+
+    UVLOOP = "uvloop"
+    """The libuv-based event loop of the uvloop package, which must be installed."""
+
+    AUTO = "auto"
+    """uvloop if it is installed, otherwise the standard library's event loop."""
+
+
+def loop_factory(
+    implementation: LoopImplementation,
+) -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Find the factory of an event loop implementation.
+
+    Args:
+        implementation: Implementation to create loops of.
+
+    Returns:
+        Factory to pass to `asyncio.run` or `asyncio.Runner`, or None for the standard
+        library's event loop.
+
+    Raises:
+        ValueError: If uvloop is required but not installed.
+    """
+    if implementation == LoopImplementation.ASYNCIO:
+        return None
+    try:
+        uvloop = importlib.import_module("uvloop")
+    except ImportError:
+        if implementation == LoopImplementation.AUTO:
+            return None
+        raise ValueError("uvloop is not installed") from None
+    return uvloop.new_event_loop
+
+
+class LagMonitor:
+    """Samples event loop scheduling delay.
+
+    The monitor repeatedly sleeps for a fixed interval and records how much later than
+    requested it was woken up. Sustained lag means something is blocking the event loop.
+    Samples above a threshold, such as the period of an audio block, are counted as late and
+    reported as they happen, which tells jitter caused by the loop apart from network jitter.
+
+    Samples are counted in a `stats.Histogram` and only the most recent are kept, so the
+    monitor runs in constant memory however long it runs.
+
+    Args:
+        interval: Seconds between samples.
+        threshold: Seconds of lag above which a sample is late, or None to not check.
+        on_late: Called with the lag of each late sample.
+        window: Number of recent samples to keep.
+    """
+
+    @property
+    def interval(self) -> float:
+        return self.__interval
+
+    @property
+    def histogram(self) -> stats.Histogram:
+        """Histogram of all samples."""
+        return self.__histogram
+
+    @property
+    def samples(self) -> tuple[float, ...]:
+        """Most recent samples, oldest first."""
+        return tuple(self.__samples)
+
+    @property
+    def count(self) -> int:
+        return self.__histogram.count
+
+    @property
+    def max_lag(self) -> float:
+        return self.__histogram.max if self.__histogram.count else 0.0
+
+    @property
+    def threshold(self) -> float | None:
+        return self.__threshold
+
+    @property
+    def late_count(self) -> int:
+        """Number of samples whose lag exceeded the threshold."""
+        return self.__late_count
+
+    def __init__(
+        self,
+        interval: float = 0.01,
+        *,
+        threshold: float | None = None,
+        on_late: Callable[[float], None] | None = None,
+        window: int = 1000,
+    ):
+        if not interval > 0:
+            raise ValueError("interval must be positive")
+        if threshold is not None and not threshold > 0:
+            raise ValueError("threshold must be positive")
+        if window < 0:
+            raise ValueError("window must not be negative")
+        self.__interval = interval
+        self.__threshold = threshold
+        self.__on_late = on_late
+        self.__histogram = stats.Histogram()
+        self.__samples = collections.deque[float](maxlen=window)
+        self.__late_count = 0
+
+    def report(self) -> str:
+        """Summarize all samples in one line with percentiles in milliseconds."""
+        percentiles = " ".join(
+            f"{name}={self.__histogram.percentile(fraction) * 1000:.1f}"
+            for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+        )
+        line = f"loop lag: n={self.count} {percentiles} max={self.max_lag * 1000:.1f} ms"
+        if self.__threshold is not None:
+            line += f", {self.__late_count} over {self.__threshold * 1000:.1f} ms"
+        return line
+
+    async def run(self):
+        """Sample loop lag until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.__interval)
+            lag = max(loop.time() - start - self.__interval, 0.0)
+            self.__histogram.record(lag)
+            self.__samples.append(lag)
+            if self.__threshold is not None and lag > self.__threshold:
+                self.__late_count += 1
+                if self.__on_late is not None:
+                    self.__on_late(lag)
@@ -5,4 +5,10 @@ import time as tm
 
 
 def time() -> float:
-    return tm.time()
+    """Monotonic time in seconds.
+
+    The timebase of all audio timestamps and latency measurements, which must take the times
+    they compare with these timestamps from this function too. The `time` of an event loop is
+    a separate clock: uvloop's, for one, is cached per loop iteration and has another origin.
+    """
+    return tm.monotonic()
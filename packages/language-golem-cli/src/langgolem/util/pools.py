@@ -0,0 +1,73 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Recycling of buffers that would otherwise be allocated for every block of a stream."""
+
+import threading
+
+
+class BufferPool:
+    """Free lists of buffers that are recycled rather than reallocated.
+
+    Buffers are kept by exact size, which suits streams of equally sized blocks: after the
+    first few blocks, every block reuses the storage of one that has been consumed. A buffer is
+    returned for reuse with `release`. Buffers that are never released are reclaimed by the
+    garbage collector as usual, so forgetting to release one only costs a later allocation.
+
+    Thread safe, so buffers may be acquired on a reader thread and released on the event loop.
+
+    Args:
+        max_free: Number of released buffers to keep for reuse.
+    """
+
+    @property
+    def max_free(self) -> int:
+        return self.__max_free
+
+    @property
+    def allocated_count(self) -> int:
+        """Number of buffers allocated because no released buffer was free."""
+        return self.__allocated_count
+
+    @property
+    def reused_count(self) -> int:
+        """Number of buffers handed out again after being released."""
+        return self.__reused_count
+
+    @property
+    def free_count(self) -> int:
+        """Number of released buffers waiting to be reused."""
+        return self.__free_count
+
+    def __init__(self, *, max_free: int = 64):
+        if max_free < 0:
+            raise ValueError("max_free must not be negative")
+        self.__max_free = max_free
+        self.__lock = threading.Lock()
+        self.__free: dict[int, list[bytearray]] = {}
+        self.__free_count = 0
+        self.__allocated_count = 0
+        self.__reused_count = 0
+
+    def acquire(self, size: int) -> bytearray:
+        """Take a buffer of `size` bytes. Its contents are undefined."""
+        if size < 0:
+            raise ValueError("size must not be negative")
+        with self.__lock:
+            free = self.__free.get(size)
+            if free:
+                buffer = free.pop()
+                if not free:
+                    del self.__free[size]
+                self.__free_count -= 1
+                self.__reused_count += 1
+                return buffer
+            self.__allocated_count += 1
+        return bytearray(size)
+
+    def release(self, buffer: bytearray):
+        """Return a buffer taken with `acquire`. The buffer must no longer be used."""
+        with self.__lock:
+            if self.__free_count < self.__max_free:
+                self.__free.setdefault(len(buffer), []).append(buffer)
+                self.__free_count += 1
@@ -2,7 +2,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import collections
+import enum
+import functools
+from collections.abc import Buffer
+from collections.abc import Callable
 from collections.abc import Sequence
+from typing import override
 
 
 def populate_queue[T](queue: asyncio.Queue[T], items: Sequence[T]) -> int:
@@ -35,30 +41,564 @@ def empty_queue[T](queue: asyncio.Queue[T]) -> list[T]:
     return result
 
 
+class _Batch[T]:
+    """Items taken off a queue up to a number of items and of bytes."""
+
+    def __init__(
+        self,
+        max_items: int | None,
+        max_bytes: int | None,
+        size: Callable[[T], int] | None,
+    ):
+        if max_items is not None and max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        if max_bytes is not None and size is None:
+            raise ValueError("size is required to limit bytes")
+        self.__max_items = max_items
+        self.__max_bytes = max_bytes
+        self.__size = size
+        self.__bytes = 0
+        self.items: list[T] = []
+
+    @property
+    def full(self) -> bool:
+        return (self.__max_items is not None and len(self.items) >= self.__max_items) or (
+            self.__max_bytes is not None and self.__bytes >= self.__max_bytes
+        )
+
+    def append(self, item: T):
+        self.items.append(item)
+        if self.__max_bytes is not None and self.__size is not None:
+            self.__bytes += self.__size(item)
+
+    def take_queued(self, queue: asyncio.Queue[T]):
+        """Take items that are already queued until full."""
+        while not self.full and not queue.empty():
+            self.append(queue.get_nowait())
+
+
+def _put_back[T](queue: asyncio.Queue[T], getter: asyncio.Future[T]):
+    if not getter.cancelled() and getter.exception() is None:
+        queue.put_nowait(getter.result())
+
+
+async def _get_within[T](queue: asyncio.Queue[T], timeout: float | None) -> list[T]:
+    """Wait at most `timeout` seconds for an item and take it.
+
+    With `asyncio.wait_for`, an item that the get takes just as the timeout passes is lost.
+    Here the get runs as a task of its own that is only cancelled once the wait is over, and an
+    item it took before the cancellation reached it is returned. An item taken while the caller
+    is cancelled is put back on the queue.
+
+    Returns:
+        The item, or no items if the timeout passed first.
+    """
+    if not queue.empty():
+        return [queue.get_nowait()]
+    getter = asyncio.ensure_future(queue.get())
+    try:
+        await asyncio.wait([getter], timeout=timeout)
+        if not getter.done():
+            getter.cancel()
+            await asyncio.wait([getter])
+    except asyncio.CancelledError:
+        getter.cancel()
+        getter.add_done_callback(functools.partial(_put_back, queue))
+        raise
+    return [] if getter.cancelled() else [getter.result()]
+
+
+async def get_many[T](
+    queue: asyncio.Queue[T],
+    *,
+    max_items: int | None = None,
+    max_bytes: int | None = None,
+    size: Callable[[T], int] | None = None,
+    timeout: float | None = None,
+) -> list[T]:
+    """Wait for an item, then take the items queued behind it in one go.
+
+    A consumer that handles a batch per wakeup rather than an item per wakeup is woken up
+    once per burst of items. Items stop being taken once either limit is reached, so the last
+    item may take the batch over `max_bytes`.
+
+    Args:
+        queue: Queue to take items from.
+        max_items: Maximum number of items to take, or None for no limit.
+        max_bytes: Number of bytes after which to stop taking items, or None for no limit.
+        size: Measures an item in bytes. Required with `max_bytes`.
+        timeout: Seconds to wait for the first item, or None to wait indefinitely.
+
+    Returns:
+        Items in queue order, or no items if the timeout passed first.
+    """
+    batch = _Batch(max_items, max_bytes, size)
+    for item in await _get_within(queue, timeout):
+        batch.append(item)
+    if not batch.items:
+        return []
+    batch.take_queued(queue)
+    return batch.items
+
+
+async def drain_until[T](
+    queue: asyncio.Queue[T],
+    deadline: float,
+    *,
+    max_items: int | None = None,
+    max_bytes: int | None = None,
+    size: Callable[[T], int] | None = None,
+) -> list[T]:
+    """Take items as they are queued until a deadline or a limit is reached.
+
+    Args:
+        queue: Queue to take items from.
+        deadline: Event loop time to stop waiting for items at. Items already queued are
+            taken even if the deadline has passed.
+        max_items: Maximum number of items to take, or None for no limit.
+        max_bytes: Number of bytes after which to stop taking items, or None for no limit.
+        size: Measures an item in bytes. Required with `max_bytes`.
+
+    Returns:
+        Items in queue order.
+    """
+    loop = asyncio.get_running_loop()
+    batch = _Batch(max_items, max_bytes, size)
+    while True:
+        batch.take_queued(queue)
+        remaining = deadline - loop.time()
+        if batch.full or remaining <= 0:
+            return batch.items
+        items = await _get_within(queue, remaining)
+        if not items:
+            return batch.items
+        batch.append(items[0])
+
+
+class OverloadPolicy(enum.StrEnum):
+    """What a bounded queue does with an item put while it is full."""
+
+    BLOCK = "block"
+    """Block the producer until there is room."""
+
+    DROP_OLDEST = "drop-oldest"
+    """Discard the oldest queued item to make room."""
+
+    DROP_NEWEST = "drop-newest"
+    """Discard the item being put."""
+
+    COALESCE = "coalesce"
+    """Merge the item being put into the newest queued item."""
+
+
+class BoundedQueue[T](asyncio.Queue[T]):
+    """Bounded queue that applies an overload policy when full.
+
+    With any policy other than `OverloadPolicy.BLOCK`, `put` and `put_nowait` never block or
+    raise `asyncio.QueueFull`, keeping the latency and memory of queued items bounded when the
+    consumer falls behind.
+
+    Args:
+        maxsize: Maximum number of queued items.
+        policy: What to do with items put while the queue is full.
+        size: Measures an item for the `dropped_size` counter. Items count as 1 by default.
+        merge: Combines the newest queued item with a new item. Required to coalesce.
+        on_drop: Called with each dropped item, such as to release storage it borrowed.
+    """
+
+    @property
+    def policy(self) -> OverloadPolicy:
+        return self.__policy
+
+    @property
+    def dropped_count(self) -> int:
+        return self.__dropped_count
+
+    @property
+    def dropped_size(self) -> int:
+        return self.__dropped_size
+
+    @property
+    def coalesced_count(self) -> int:
+        return self.__coalesced_count
+
+    def __init__(
+        self,
+        maxsize: int,
+        *,
+        policy: OverloadPolicy = OverloadPolicy.BLOCK,
+        size: Callable[[T], int] | None = None,
+        merge: Callable[[T, T], T] | None = None,
+        on_drop: Callable[[T], None] | None = None,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if policy == OverloadPolicy.COALESCE and merge is None:
+            raise ValueError("merge is required to coalesce")
+        super().__init__(maxsize)
+        self.__policy = policy
+        self.__size = size
+        self.__merge = merge
+        self.__on_drop = on_drop
+        self.__dropped_count = 0
+        self.__dropped_size = 0
+        self.__coalesced_count = 0
+
+    @override
+    def _init(self, maxsize: int):
+        # Declared here to give coalescing typed access to the newest item.
+        self._queue: collections.deque[T] = collections.deque()
+
+    def __drop(self, item: T):
+        self.__dropped_count += 1
+        self.__dropped_size += 1 if self.__size is None else self.__size(item)
+        if self.__on_drop is not None:
+            self.__on_drop(item)
+
+    @override
+    async def put(self, item: T):
+        if self.__policy == OverloadPolicy.BLOCK:
+            await super().put(item)
+        else:
+            self.put_nowait(item)
+
+    @override
+    def put_nowait(self, item: T):
+        if not self.full() or self.__policy == OverloadPolicy.BLOCK:
+            super().put_nowait(item)
+            return
+        match self.__policy:
+            case OverloadPolicy.DROP_OLDEST:
+                self.__drop(self.get_nowait())
+                self.task_done()
+                super().put_nowait(item)
+            case OverloadPolicy.DROP_NEWEST:
+                self.__drop(item)
+            case OverloadPolicy.COALESCE:
+                assert self.__merge is not None
+                self._queue[-1] = self.__merge(self._queue[-1], item)
+                self.__coalesced_count += 1
+
+
+class ThreadWakeup:
+    """Wakeups of an event loop task by another thread, coalesced while one is pending.
+
+    The thread calls `notify` whenever it has made something available and the task awaits
+    `wait`. Only the first notification after the task woke up schedules a wakeup, so a burst of
+    notifications costs a single callback on the event loop. The task must take everything
+    that is available after each wakeup, since later notifications of the same burst are lost.
+
+    Args:
+        loop: Event loop of the task that waits.
+    """
+
+    @property
+    def wakeup_count(self) -> int:
+        return self.__wakeup_count
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.__loop = loop
+        self.__ready = asyncio.Event()
+        self.__pending = False
+        self.__wakeup_count = 0
+
+    def notify(self):
+        """Wake up the task unless a wakeup is already pending. Called from the thread."""
+        if self.__pending:
+            return
+        self.__pending = True
+        try:
+            self.__loop.call_soon_threadsafe(self.__ready.set)
+        except RuntimeError:
+            # The event loop closed, so there is no task left to wake up.
+            pass
+
+    async def wait(self):
+        """Wait until notified since the last wakeup."""
+        await self.__ready.wait()
+        self.__ready.clear()
+        # Reset before the task looks for what is available, so that anything made available
+        # from here on notifies again.
+        self.__pending = False
+        self.__wakeup_count += 1
+
+
+class ThreadChannel[T]:
+    """Single-producer, single-consumer channel of items from a thread to the event loop.
+
+    The producer thread puts items with `put` and ends the channel with `close`. The consumer
+    task takes all items put since its last call with `get_many`. Wakeups are coalesced by a
+    `ThreadWakeup`, so a burst of items costs one event loop wakeup rather than one callback
+    per item.
+
+    Args:
+        loop: Event loop of the consumer.
+    """
+
+    @property
+    def wakeup_count(self) -> int:
+        return self.__wakeup.wakeup_count
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.__items = collections.deque[T]()
+        self.__wakeup = ThreadWakeup(loop)
+        self.__closed = False
+        self.__error: BaseException | None = None
+
+    def put(self, item: T):
+        """Send an item to the consumer. Called from the producer thread."""
+        self.__items.append(item)
+        self.__wakeup.notify()
+
+    def close(self, error: BaseException | None = None):
+        """End the channel. Called from the producer thread.
+
+        Args:
+            error: Error to raise in the consumer once it has taken the remaining items.
+        """
+        self.__error = error
+        self.__closed = True
+        self.__wakeup.notify()
+
+    def take_nowait(self) -> list[T]:
+        """Take the items put so far without waiting, such as after the producer stopped."""
+        items: list[T] = []
+        while self.__items:
+            items.append(self.__items.popleft())
+        return items
+
+    async def get_many(self) -> list[T]:
+        """Wait for items and take all of them.
+
+        Returns:
+            Items in the order they were put, or no items once the channel is closed.
+
+        Raises:
+            BaseException: The error the channel was closed with.
+        """
+        while True:
+            # Look at the end of the channel before taking items, since the producer may put
+            # its last items and close in between.
+            closed = self.__closed
+            items = self.take_nowait()
+            if items:
+                return items
+            if closed:
+                if self.__error is not None:
+                    raise self.__error
+                return items
+            await self.__wakeup.wait()
+
+
 class QueueStream:
+    """Reader of the chunks of bytes on a queue as one stream, without waiting for more.
+
+    Chunks are taken off the queue as reads need them and kept as memoryviews, so that partly
+    read chunks are sliced rather than copied. `readinto` copies each byte once, straight into
+    the caller's buffer, and `read` copies each byte once into the bytes it returns.
+
+    Args:
+        queue: Queue of chunks. Chunks must not be modified once queued.
+    """
+
     def __init__(self, queue: asyncio.Queue[bytes]):
         self.__queue = queue
-        self.__current_bytes = b""
-        self.__offset = 0
+        self.__chunks = collections.deque[memoryview]()
+        self.__buffered = 0
+
+    def __fill(self, count: int | None) -> int:
+        """Take chunks off the queue until `count` bytes are buffered or the queue is empty."""
+        while count is None or self.__buffered < count:
+            try:
+                chunk = memoryview(self.__queue.get_nowait()).cast("B")
+            except asyncio.QueueEmpty:
+                break
+            if chunk:
+                self.__chunks.append(chunk)
+                self.__buffered += len(chunk)
+        return self.__buffered if count is None else min(count, self.__buffered)
+
+    def __take(self, count: int) -> list[memoryview]:
+        """Remove the views of the next `count` buffered bytes."""
+        views: list[memoryview] = []
+        self.__buffered -= count
+        while count:
+            chunk = self.__chunks[0]
+            if len(chunk) <= count:
+                views.append(self.__chunks.popleft())
+                count -= len(chunk)
+            else:
+                views.append(chunk[:count])
+                self.__chunks[0] = chunk[count:]
+                count = 0
+        return views
 
     def read(self, count: int | None = -1, /) -> bytes:
+        """Read up to `count` bytes, or all queued bytes if count is None or negative."""
         if count is not None and count < 0:
             count = None
-        result = bytearray()
-        while count is None or count > 0:
-            if self.__offset >= len(self.__current_bytes):
-                self.__offset = 0
-                try:
-                    self.__current_bytes = self.__queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    self.__current_bytes = b""
-                    break
-            if count is None:
-                next_bytes = self.__current_bytes[self.__offset :]
-            else:
-                next_bytes = self.__current_bytes[self.__offset : self.__offset + count]
-            self.__offset += len(next_bytes)
-            result.extend(next_bytes)
-            if count is not None:
-                count -= len(next_bytes)
-        return bytes(result)
+        return b"".join(self.__take(self.__fill(count)))
+
+    def readinto(self, buffer: Buffer, /) -> int:
+        """Read queued bytes into a buffer.
+
+        Returns:
+            Number of bytes read, which is less than the size of the buffer only if the queue
+            ran out of bytes.
+        """
+        with memoryview(buffer).cast("B") as output:
+            count = self.__fill(len(output))
+            self.__buffered -= count
+            chunks = self.__chunks
+            offset = 0
+            while offset < count:
+                chunk = chunks.popleft()
+                end = offset + len(chunk)
+                if end > count:
+                    # Put back the part of the chunk that does not fit.
+                    chunks.appendleft(chunk[count - offset :])
+                    chunk = chunk[: count - offset]
+                    end = count
+                output[offset:end] = chunk
+                offset = end
+        return count
+
+    def peek(self, count: int = -1, /) -> bytes:
+        """Return up to `count` bytes, or all queued bytes if negative, without reading them."""
+        count = self.__fill(None if count < 0 else count)
+        views: list[memoryview] = []
+        for chunk in self.__chunks:
+            if len(chunk) >= count:
+                views.append(chunk[:count])
+                break
+            views.append(chunk)
+            count -= len(chunk)
+        return b"".join(views)
+
+
+class ByteRing:
+    """Bounded ring of bytes for passing a stream between asyncio tasks.
+
+    Bytes are copied into and out of a single preallocated buffer, so a stream of any length
+    passes through without allocating per chunk, and capacity is bounded in bytes rather than
+    in items. Writers wait for room with `write` and readers wait for bytes with `read` or
+    `read_exactly`. The non-waiting variants suit a task that both writes and reads.
+
+    Args:
+        capacity: Number of bytes the ring can hold.
+    """
+
+    @property
+    def capacity(self) -> int:
+        return len(self.__buffer)
+
+    @property
+    def size(self) -> int:
+        """Number of bytes waiting to be read."""
+        return self.__write_offset - self.__read_offset
+
+    @property
+    def free(self) -> int:
+        """Number of bytes that can be written without waiting."""
+        return len(self.__buffer) - self.size
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.__buffer = bytearray(capacity)
+        self.__view = memoryview(self.__buffer)
+        # Byte positions only ever increase and are taken modulo the capacity.
+        self.__read_offset = 0
+        self.__write_offset = 0
+        self.__closed = False
+        self.__readable = asyncio.Event()
+        self.__writable = asyncio.Event()
+
+    def close(self):
+        """End the stream. Readers get the bytes left in the ring, then the end."""
+        self.__closed = True
+        self.__readable.set()
+        self.__writable.set()
+
+    def write_nowait(self, data: Buffer) -> int:
+        """Write as many bytes as fit.
+
+        Returns:
+            Number of bytes written.
+
+        Raises:
+            RuntimeError: If the ring is closed.
+        """
+        if self.__closed:
+            raise RuntimeError("ring is closed")
+        with memoryview(data).cast("B") as source:
+            count = min(len(source), self.free)
+            capacity = len(self.__buffer)
+            start = self.__write_offset % capacity
+            first = min(count, capacity - start)
+            self.__view[start : start + first] = source[:first]
+            self.__view[: count - first] = source[first:count]
+        self.__write_offset += count
+        if count:
+            self.__readable.set()
+        return count
+
+    async def write(self, data: Buffer):
+        """Write all bytes, waiting for room as needed.
+
+        Raises:
+            RuntimeError: If the ring is closed.
+        """
+        with memoryview(data).cast("B") as source:
+            offset = self.write_nowait(source)
+            while offset < len(source):
+                self.__writable.clear()
+                await self.__writable.wait()
+                offset += self.write_nowait(source[offset:])
+
+    def read_nowait(self, count: int = -1) -> bytes:
+        """Read up to `count` bytes, or all bytes in the ring if negative, without waiting."""
+        size = self.size if count < 0 else min(count, self.size)
+        capacity = len(self.__buffer)
+        start = self.__read_offset % capacity
+        first = min(size, capacity - start)
+        if first == size:
+            data = bytes(self.__view[start : start + size])
+        else:
+            data = b"".join((self.__view[start:], self.__view[: size - first]))
+        self.__read_offset += size
+        if size:
+            self.__writable.set()
+        return data
+
+    async def read(self, count: int = -1) -> bytes:
+        """Read up to `count` bytes, or all bytes in the ring if negative.
+
+        Waits until there is at least one byte to read. Returns no bytes only at the end of the
+        stream.
+        """
+        while not self.size and not self.__closed:
+            self.__readable.clear()
+            await self.__readable.wait()
+        return self.read_nowait(count)
+
+    async def read_exactly(self, count: int) -> bytes:
+        """Read exactly `count` bytes, waiting for them as needed.
+
+        Raises:
+            ValueError: If the ring cannot hold `count` bytes.
+            asyncio.IncompleteReadError: If the stream ended first. The error holds the bytes
+                that were read.
+        """
+        if count > len(self.__buffer):
+            raise ValueError("count must not exceed capacity")
+        while self.size < count and not self.__closed:
+            self.__readable.clear()
+            await self.__readable.wait()
+        if self.size < count:
+            raise asyncio.IncompleteReadError(self.read_nowait(), count)
+        return self.read_nowait(count)
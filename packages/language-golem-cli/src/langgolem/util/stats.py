@@ -0,0 +1,162 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import math
+from collections.abc import Sequence
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of a sequence of values.
+
+    Args:
+        values: Values to take the percentile of. Need not be sorted.
+        fraction: Percentile as a fraction between 0 and 1.
+
+    Returns:
+        The smallest value such that at least `fraction` of values are less than or equal to
+        it, or NaN if there are no values.
+
+    Raises:
+        ValueError: If fraction is not between 0 and 1.
+    """
+    if not 0.0 <= fraction <= 1.0:
+        raise ValueError("fraction must be between 0 and 1")
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class Histogram:
+    """Histogram of non-negative values with bounded relative error, in the style of HDR.
+
+    Values are counted in buckets whose width doubles with each power of two of the value, and
+    each bucket is split into enough linear sub-buckets to keep `significant_figures` digits.
+    Recording is constant time and memory is fixed by the range, no matter how many values are
+    recorded, so latencies can be recorded for every audio block of a long session.
+
+    Args:
+        lowest: Smallest distinguishable value. Smaller values count as zero.
+        highest: Largest value that is counted precisely. Larger values count as `highest`.
+        significant_figures: Number of significant decimal digits to keep.
+    """
+
+    @property
+    def lowest(self) -> float:
+        return self.__lowest
+
+    @property
+    def highest(self) -> float:
+        return self.__highest
+
+    @property
+    def significant_figures(self) -> int:
+        return self.__significant_figures
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    @property
+    def min(self) -> float:
+        """Smallest recorded value, or NaN if there are none."""
+        return self.__min if self.__count else math.nan
+
+    @property
+    def max(self) -> float:
+        """Largest recorded value, or NaN if there are none."""
+        return self.__max if self.__count else math.nan
+
+    @property
+    def mean(self) -> float:
+        """Mean of the recorded values, or NaN if there are none."""
+        return self.__total / self.__count if self.__count else math.nan
+
+    def __init__(
+        self, *, lowest: float = 1e-6, highest: float = 3600.0, significant_figures: int = 2
+    ):
+        if not lowest > 0:
+            raise ValueError("lowest must be positive")
+        if not highest >= 2 * lowest:
+            raise ValueError("highest must be at least twice lowest")
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        self.__lowest = lowest
+        self.__highest = highest
+        self.__significant_figures = significant_figures
+        self.__sub_bucket_bits = math.ceil(math.log2(2 * 10**significant_figures))
+        self.__sub_bucket_half = 1 << (self.__sub_bucket_bits - 1)
+        self.__highest_units = int(highest / lowest)
+        self.__counts = [0] * (self.__index(self.__highest_units) + 1)
+        self.__count = 0
+        self.__total = 0.0
+        self.__min = math.inf
+        self.__max = -math.inf
+
+    def __index(self, units: int) -> int:
+        bucket = max(units.bit_length() - self.__sub_bucket_bits, 0)
+        return bucket * self.__sub_bucket_half + (units >> bucket)
+
+    def __highest_equivalent(self, index: int) -> float:
+        bucket = max(index // self.__sub_bucket_half - 1, 0)
+        sub_bucket = index - bucket * self.__sub_bucket_half
+        return (((sub_bucket + 1) << bucket) - 1) * self.__lowest
+
+    def record(self, value: float):
+        """Count a value.
+
+        Raises:
+            ValueError: If the value is negative.
+        """
+        if value < 0:
+            raise ValueError("value must not be negative")
+        self.__counts[self.__index(min(int(value / self.__lowest), self.__highest_units))] += 1
+        self.__count += 1
+        self.__total += value
+        self.__min = min(self.__min, value)
+        self.__max = max(self.__max, value)
+
+    def merge(self, other: "Histogram"):
+        """Add the counts of another histogram with the same range and precision.
+
+        Raises:
+            ValueError: If the histograms differ in range or precision.
+        """
+        if (other.lowest, other.highest, other.significant_figures) != (
+            self.__lowest,
+            self.__highest,
+            self.__significant_figures,
+        ):
+            raise ValueError("Histograms must have the same range and precision")
+        for index, count in enumerate(other.__counts):
+            self.__counts[index] += count
+        self.__count += other.__count
+        self.__total += other.__total
+        self.__min = min(self.__min, other.__min)
+        self.__max = max(self.__max, other.__max)
+
+    def percentile(self, fraction: float) -> float:
+        """Nearest-rank percentile of the recorded values.
+
+        Args:
+            fraction: Percentile as a fraction between 0 and 1.
+
+        Returns:
+            The upper end of the bucket holding the percentile, kept within the recorded
+            minimum and maximum, or NaN if there are no values.
+
+        Raises:
+            ValueError: If fraction is not between 0 and 1.
+        """
+        if not 0.0 <= fraction <= 1.0:
+            raise ValueError("fraction must be between 0 and 1")
+        if not self.__count:
+            return math.nan
+        rank = max(math.ceil(fraction * self.__count), 1)
+        seen = 0
+        for index, count in enumerate(self.__counts):
+            seen += count
+            if seen >= rank:
+                return min(max(self.__highest_equivalent(index), self.__min), self.__max)
+        raise AssertionError("Rank beyond recorded count")  # pragma: no cover
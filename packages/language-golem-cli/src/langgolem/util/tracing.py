@@ -0,0 +1,114 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Latency tracing of the stages of a conversational turn.
+
+All times are `misc.time` values, which captured audio is stamped with. `misc.time` returns
+`time.monotonic()`, which is not necessarily the clock of the event loop.
+"""
+
+import collections
+import enum
+from collections.abc import Iterable
+
+from langgolem.util import stats
+
+
+class Stage(enum.StrEnum):
+    """Traced interval of the path from captured audio to played response."""
+
+    QUEUE = "queue"
+    """From capturing a block until the sender takes it off the queue."""
+
+    UPLOAD = "upload"
+    """From capturing a block until its last byte is sent to the session."""
+
+    ACK = "ack"
+    """From sending a commit of the input audio buffer until the server acknowledges it."""
+
+    RESPONSE = "response"
+    """From the server acknowledging a commit until the first audio of the response arrives."""
+
+    TURN = "turn"
+    """From capturing the last committed audio until the first audio of the response arrives."""
+
+    PLAYBACK = "playback"
+    """From the first audio of a response arriving until the output device plays it."""
+
+
+class LatencyTracer:
+    """Records the latency of each stage in a histogram.
+
+    Stage latencies are recorded directly with `record`. Latencies that span the client and the
+    server are traced by reporting the events they are made of as they happen: commits as they
+    are sent, acknowledgements as they arrive and the first audio of each response.
+
+    Args:
+        significant_figures: Precision of the histograms.
+    """
+
+    @property
+    def histograms(self) -> dict[Stage, stats.Histogram]:
+        return dict(self.__histograms)
+
+    def __init__(self, *, significant_figures: int = 2):
+        self.__histograms = {
+            stage: stats.Histogram(significant_figures=significant_figures) for stage in Stage
+        }
+        # Capture and send times of commits waiting to be acknowledged, oldest first.
+        self.__pending_commits = collections.deque[tuple[float, float]]()
+        # Capture and acknowledgement times of the latest commit without a response.
+        self.__awaiting_response: tuple[float, float] | None = None
+
+    def record(self, stage: Stage, latency: float):
+        """Record one latency of a stage, ignoring negative latencies from clock skew."""
+        self.__histograms[stage].record(max(latency, 0.0))
+
+    def record_all(self, stage: Stage, latencies: Iterable[float]):
+        for latency in latencies:
+            self.record(stage, latency)
+
+    def commit_sent(self, captured: float, sent: float):
+        """Report sending a commit.
+
+        Args:
+            captured: Capture time of the last audio the commit includes.
+            sent: Time the commit was sent.
+        """
+        self.__pending_commits.append((captured, sent))
+
+    def commit_acknowledged(self, acknowledged: float):
+        """Report the server acknowledging the oldest unacknowledged commit."""
+        if not self.__pending_commits:
+            return
+        captured, sent = self.__pending_commits.popleft()
+        self.record(Stage.ACK, acknowledged - sent)
+        self.__awaiting_response = (captured, acknowledged)
+
+    def response_started(self, received: float):
+        """Report the first audio of a response arriving."""
+        if self.__awaiting_response is None:
+            return
+        captured, acknowledged = self.__awaiting_response
+        self.__awaiting_response = None
+        self.record(Stage.RESPONSE, received - acknowledged)
+        self.record(Stage.TURN, received - captured)
+
+    def report(self) -> list[str]:
+        """Summarize the stages with recorded latencies.
+
+        Returns:
+            One line per stage with its count and percentiles in milliseconds.
+        """
+        lines: list[str] = []
+        for stage, histogram in self.__histograms.items():
+            if not histogram.count:
+                continue
+            percentiles = " ".join(
+                f"{name}={histogram.percentile(fraction) * 1000:.1f}"
+                for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+            )
+            lines.append(
+                f"{stage}: n={histogram.count} {percentiles} max={histogram.max * 1000:.1f} ms"
+            )
+        return lines
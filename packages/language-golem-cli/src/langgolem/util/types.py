@@ -2,7 +2,19 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import typing
+from collections.abc import Buffer
 
 
 class BytesReader(typing.Protocol):
     def read(self, count: int | None = -1, /) -> bytes: ...
+
+
+@typing.runtime_checkable
+class ReadIntoReader(BytesReader, typing.Protocol):
+    """Reader that can also read straight into a caller's buffer."""
+
+    def readinto(self, buffer: Buffer, /) -> int: ...
+
+
+class HasFileno(typing.Protocol):
+    def fileno(self) -> int: ...
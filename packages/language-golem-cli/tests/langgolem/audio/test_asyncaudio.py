@@ -3,11 +3,27 @@
 
 import asyncio
 import io
+import os
+import threading
+from collections.abc import AsyncIterator
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Iterator
 
+import numpy as np
 import pytest
+from agents import realtime as rt
+from fakeopenai.agents import model as fake_model
+from fakesd import streaming
 from fakesd import waves
 from langgolem.audio import asyncaudio
+from langgolem.audio import g711
+from langgolem.audio import playback
+from langgolem.audio import vad
+from langgolem.util import misc
+from langgolem.util import pools
 from langgolem.util import queues
+from langgolem.util import tracing
 
 
 @pytest.fixture(autouse=True)
@@ -15,7 +31,98 @@ def enable_fake_soundevice(fake_sd):
     pass
 
 
-async def test_default_input_queuer():
+class TestRawAudio:
+    @staticmethod
+    def test_from_pool():
+        pool = pools.BufferPool()
+        audio = asyncaudio.RawAudio.from_pool(pool, bytearray(b"abcd"), 2, 1.0)
+
+        assert audio == asyncaudio.RawAudio(buffer=b"abcd", frames=2, time=1.0)
+        assert isinstance(audio.buffer, bytearray)
+        assert pool.allocated_count == 1
+
+    @staticmethod
+    def test_release():
+        pool = pools.BufferPool()
+        audio = asyncaudio.RawAudio.from_pool(pool, b"abcd", 2, 1.0)
+
+        audio.release()
+        audio.release()
+
+        assert audio.buffer == b""
+        assert audio.time == 1.0
+        assert pool.free_count == 1
+        asyncaudio.RawAudio.from_pool(pool, b"efgh", 2, 2.0)
+        assert pool.reused_count == 1
+
+    @staticmethod
+    def test_release_unpooled():
+        audio = asyncaudio.RawAudio(buffer=b"abcd", frames=2, time=1.0)
+        audio.release()
+        assert audio.buffer == b""
+
+    @staticmethod
+    def test_repr():
+        audio = asyncaudio.RawAudio.from_pool(pools.BufferPool(), b"ab", 1, 0.5)
+        assert repr(audio) == "RawAudio(buffer=b'ab', frames=1, time=0.5)"
+
+
+def test_coalesce_audio():
+    pool = pools.BufferPool()
+    earlier = asyncaudio.RawAudio.from_pool(pool, b"ab", 1, 1.0)
+    later = asyncaudio.RawAudio(buffer=b"cdef", frames=2, time=2.0)
+
+    assert asyncaudio.coalesce_audio(earlier, later) == asyncaudio.RawAudio(
+        buffer=b"abcdef", frames=3, time=1.0
+    )
+    assert pool.free_count == 1
+    assert later.buffer == b""
+
+
+class TestCaptureQueue:
+    @staticmethod
+    def test_defaults():
+        queue = asyncaudio.capture_queue()
+        assert queue.maxsize == 64
+        assert queue.policy == queues.OverloadPolicy.DROP_OLDEST
+
+    @staticmethod
+    def test_dropped_bytes():
+        queue = asyncaudio.capture_queue(1, queues.OverloadPolicy.DROP_NEWEST)
+        queue.put_nowait(asyncaudio.RawAudio(buffer=b"ab", frames=1, time=0.0))
+        queue.put_nowait(asyncaudio.RawAudio(buffer=b"cdef", frames=2, time=1.0))
+
+        assert queue.dropped_count == 1
+        assert queue.dropped_size == 4
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "policy", [queues.OverloadPolicy.DROP_OLDEST, queues.OverloadPolicy.DROP_NEWEST]
+    )
+    def test_dropped_released(policy):
+        pool = pools.BufferPool()
+        queue = asyncaudio.capture_queue(2, policy)
+
+        for index in range(100):
+            queue.put_nowait(asyncaudio.RawAudio.from_pool(pool, b"abcd", 2, float(index)))
+
+        # Storage of each dropped block is reused for a later block.
+        assert queue.dropped_count == 98
+        assert pool.allocated_count == 3
+        assert pool.reused_count == 97
+
+    @staticmethod
+    def test_coalesce():
+        queue = asyncaudio.capture_queue(1, queues.OverloadPolicy.COALESCE)
+        queue.put_nowait(asyncaudio.RawAudio(buffer=b"ab", frames=1, time=0.0))
+        queue.put_nowait(asyncaudio.RawAudio(buffer=b"cdef", frames=2, time=1.0))
+
+        assert queues.empty_queue(queue) == [
+            asyncaudio.RawAudio(buffer=b"abcdef", frames=3, time=0.0)
+        ]
+
+
+async def test_default_input_queuer(fake_clock):
     queue = asyncio.Queue[asyncaudio.RawAudio]()
     task = asyncio.create_task(asyncaudio.default_input_queuer(queue))
     audio_records: list[asyncaudio.RawAudio] = []
@@ -39,40 +146,129 @@ async def test_default_input_queuer():
     assert len(audio_records) == 375
     for index, record in enumerate(audio_records):
         assert record.frames == 128
-        assert record.time == index / 2 / 24000.0
+        # ADC times are converted to misc.time once, when the stream starts.
+        assert record.time == fake_clock.dt_at_step(0).timestamp() + index / 2 / 24000.0
 
     all_sound = b"".join(r.buffer for r in audio_records)
     assert all_sound == waves.create_sawtooth_wave(0.1, 2.0, 24000.0, 2)
 
 
+async def test_default_input_queuer_pool():
+    queue = asyncio.Queue[asyncaudio.RawAudio]()
+    pool = pools.BufferPool()
+    task = asyncio.create_task(asyncaudio.default_input_queuer(queue, pool=pool))
+    sound = bytearray()
+
+    try:
+        while (audio := await queue.get()).frames:
+            sound += audio.buffer
+            audio.release()
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert sound == waves.create_sawtooth_wave(0.1, 2.0, 24000.0, 2)
+    # The fake stream's blocks arrive in one batch, so the released storage is kept for later.
+    assert pool.allocated_count == 376
+    assert pool.free_count == pool.max_free
+
+
+async def test_default_input_queuer_block():
+    queue = asyncaudio.capture_queue(4, queues.OverloadPolicy.BLOCK)
+    pool = pools.BufferPool(max_free=1024)
+    task = asyncio.create_task(asyncaudio.default_input_queuer(queue, pool=pool))
+    sound = bytearray()
+
+    try:
+        while (audio := await queue.get()).frames:
+            sound += audio.buffer
+            audio.release()
+            await asyncio.sleep(0)
+        audio.release()
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    # Blocks wait in the ring while the queue is full rather than failing the capture.
+    assert sound == waves.create_sawtooth_wave(0.1, 2.0, 24000.0, 2)
+    assert queue.dropped_count == 0
+    assert pool.free_count == pool.allocated_count
+
+
+async def test_default_input_queuer_native_rate():
+    queue = asyncio.Queue[asyncaudio.RawAudio]()
+    task = asyncio.create_task(asyncaudio.default_input_queuer(queue, native_rate=True))
+    audio_records: list[asyncaudio.RawAudio] = []
+
+    try:
+        while True:
+            next_record = await queue.get()
+            if next_record.frames == 0 and not next_record.buffer:
+                break
+            audio_records.append(next_record)
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    # The fake device captures 2 seconds at its default rate of 48kHz.
+    assert len(audio_records) == 750
+    assert sum(r.frames for r in audio_records) == 48000
+    for record in audio_records:
+        assert len(record.buffer) == record.frames * 2
+
+
+async def test_default_input_queuer_format():
+    queue = asyncio.Queue[asyncaudio.RawAudio]()
+    task = asyncio.create_task(
+        asyncaudio.default_input_queuer(queue, channels=None, dtype="int32")
+    )
+    audio_records: list[asyncaudio.RawAudio] = []
+
+    try:
+        while True:
+            next_record = await queue.get()
+            if next_record.frames == 0:
+                break
+            audio_records.append(next_record)
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert len(audio_records) == 375
+    for record in audio_records:
+        assert record.frames == 128
+        assert len(record.buffer) == 256
+
+    all_sound = np.frombuffer(b"".join(r.buffer for r in audio_records), dtype="<i2")
+    expected = np.frombuffer(waves.create_sawtooth_wave(0.1, 2.0, 24000.0, 4), dtype="<i4")
+    assert np.abs(all_sound - np.rint(expected / 65536)).max() <= 1
+
+
 async def test_stream_queuer(fake_clock):
     queue = asyncio.Queue[asyncaudio.RawAudio]()
     input = io.BytesIO(b"abcdefghijklmnopqr")
 
     await asyncaudio.stream_queuer(input, queue, block_size=4)
 
-    block1, block2, block3, block4, block5 = queues.empty_queue(queue)
-    assert block1 == asyncaudio.RawAudio(
-        buffer=b"abcd", frames=2, time=fake_clock.dt_at_step(0).timestamp()
-    )
-    assert block2 == asyncaudio.RawAudio(
-        buffer=b"efgh", frames=2, time=fake_clock.dt_at_step(1).timestamp()
-    )
-    assert block3 == asyncaudio.RawAudio(
-        buffer=b"ijkl", frames=2, time=fake_clock.dt_at_step(2).timestamp()
-    )
-    assert block4 == asyncaudio.RawAudio(
-        buffer=b"mnop", frames=2, time=fake_clock.dt_at_step(3).timestamp()
-    )
-    assert block5 == asyncaudio.RawAudio(
-        buffer=b"qr", frames=1, time=fake_clock.dt_at_step(4).timestamp()
-    )
+    # Without a speed, blocks are stamped as they are queued, after the start time.
+    assert queues.empty_queue(queue) == [
+        asyncaudio.RawAudio(buffer=b"abcd", frames=2, time=fake_clock.dt_at_step(1).timestamp()),
+        asyncaudio.RawAudio(buffer=b"efgh", frames=2, time=fake_clock.dt_at_step(2).timestamp()),
+        asyncaudio.RawAudio(buffer=b"ijkl", frames=2, time=fake_clock.dt_at_step(3).timestamp()),
+        asyncaudio.RawAudio(buffer=b"mnop", frames=2, time=fake_clock.dt_at_step(4).timestamp()),
+        asyncaudio.RawAudio(buffer=b"qr", frames=1, time=fake_clock.dt_at_step(5).timestamp()),
+    ]
 
 
-async def test_default_input_iterator():
+async def test_default_input_iterator(fake_clock):
     audio_records: list[asyncaudio.RawAudio] = []
 
-    async for audio_record in asyncaudio.default_input_iterator():
+    # The fake device captures all of its audio at once.
+    async for audio_record in asyncaudio.default_input_iterator(maxsize=400):
         if audio_record.frames == 0:
             break
         audio_records.append(audio_record)
@@ -80,16 +276,335 @@ async def test_default_input_iterator():
     assert len(audio_records) == 375
     for index, record in enumerate(audio_records):
         assert record.frames == 128
-        assert record.time == index / 2 / 24000.0
+        # ADC times are converted to misc.time once, when the stream starts.
+        assert record.time == fake_clock.dt_at_step(0).timestamp() + index / 2 / 24000.0
 
     all_sound = b"".join(r.buffer for r in audio_records)
     assert all_sound == waves.create_sawtooth_wave(0.1, 2.0, 24000.0, 2)
 
 
+async def test_default_input_iterator_overloaded():
+    audio_records: list[asyncaudio.RawAudio] = []
+
+    async for audio_record in asyncaudio.default_input_iterator(
+        maxsize=1, policy=queues.OverloadPolicy.COALESCE
+    ):
+        audio_records.append(audio_record)
+        if sum(r.frames for r in audio_records) >= 375 * 128:
+            break
+
+    assert len(audio_records) < 375
+    all_sound = b"".join(r.buffer for r in audio_records)
+    assert all_sound == waves.create_sawtooth_wave(0.1, 2.0, 24000.0, 2)
+
+
+class ChunkedReader:
+    """Reader without readinto that returns at most a few bytes per read."""
+
+    def __init__(self, data: bytes, chunk_size: int):
+        self.__stream = io.BytesIO(data)
+        self.__chunk_size = chunk_size
+        self.read_count = 0
+        self.ended = threading.Event()
+
+    def read(self, count: int | None = -1, /) -> bytes:
+        self.read_count += 1
+        if count is None or count < 0:
+            count = self.__chunk_size
+        data = self.__stream.read(min(count, self.__chunk_size))
+        if not data:
+            self.ended.set()
+        return data
+
+
+class FailingReader:
+    def read(self, count: int | None = -1, /) -> bytes:
+        raise OSError("read failed")
+
+
+class BlockingReader:
+    """Reader whose first read waits until it is let go."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.proceed = threading.Event()
+        self.returned = False
+
+    def read(self, count: int | None = -1, /) -> bytes:
+        self.started.set()
+        self.proceed.wait()
+        self.returned = True
+        return b""
+
+
+class TestStreamQueuer:
+    @staticmethod
+    async def test_pool():
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+        pool = pools.BufferPool()
+
+        await asyncaudio.stream_queuer(io.BytesIO(b"abcdefghij"), queue, block_size=4, pool=pool)
+
+        blocks = queues.empty_queue(queue)
+        assert [bytes(b.buffer) for b in blocks] == [b"abcd", b"efgh", b"ij"]
+        assert all(isinstance(b.buffer, bytearray) for b in blocks)
+        # The storage that the short last block was read into is released at once.
+        assert pool.free_count == 1
+        for block in blocks:
+            block.release()
+        assert pool.free_count == 4
+
+    @staticmethod
+    async def test_read():
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+        reader = ChunkedReader(b"abcdefghij", 3)
+
+        await asyncaudio.stream_queuer(reader, queue, block_size=8)
+
+        # Short reads are combined into whole blocks.
+        assert [bytes(b.buffer) for b in queues.empty_queue(queue)] == [b"abcdefgh", b"ij"]
+
+    @staticmethod
+    @pytest.mark.parametrize("data", [b"", b"abcdefgh"])
+    async def test_end_of_stream(data):
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+        pool = pools.BufferPool()
+
+        await asyncaudio.stream_queuer(io.BytesIO(data), queue, block_size=4, pool=pool)
+
+        # The storage of the read that found the end of the stream is released.
+        for block in queues.empty_queue(queue):
+            block.release()
+        assert pool.free_count == pool.allocated_count
+
+    @staticmethod
+    async def test_speed():
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+
+        start = loop.time()
+        # Four blocks of 10ms at twice real time.
+        await asyncaudio.stream_queuer(io.BytesIO(bytes(1920)), queue, block_size=480, speed=2.0)
+        elapsed = loop.time() - start
+
+        blocks = queues.empty_queue(queue)
+        assert elapsed >= 3 * 0.005
+        assert [b.time - blocks[0].time for b in blocks] == pytest.approx(
+            [0.0, 0.005, 0.01, 0.015]
+        )
+
+    @staticmethod
+    async def test_read_ahead():
+        queue = asyncio.Queue[asyncaudio.RawAudio](maxsize=1)
+        reader = ChunkedReader(bytes(100), 4)
+
+        task = asyncio.create_task(
+            asyncaudio.stream_queuer(reader, queue, block_size=4, max_blocks=2)
+        )
+        await asyncio.sleep(0.05)
+        # One block is queued, one waits to be queued and one has been read ahead.
+        assert reader.read_count == 3
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        await asyncio.sleep(0.01)
+        assert reader.read_count == 3
+
+    @staticmethod
+    async def test_wakeups(monkeypatch):
+        channels: list[queues.ThreadChannel[asyncaudio.RawAudio]] = []
+
+        class RecordingChannel[T](queues.ThreadChannel[T]):
+            def __init__(self, loop: asyncio.AbstractEventLoop):
+                super().__init__(loop)
+                channels.append(self)
+
+        monkeypatch.setattr(queues, "ThreadChannel", RecordingChannel)
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+        data = bytes(range(256)) * 16
+        reader = ChunkedReader(data, 4)
+
+        task = asyncio.create_task(
+            asyncaudio.stream_queuer(reader, queue, block_size=4, max_blocks=len(data))
+        )
+        await asyncio.sleep(0)
+        # Hold up the event loop while the thread reads the whole stream.
+        assert reader.ended.wait(timeout=10)
+        await task
+
+        blocks = queues.empty_queue(queue)
+        assert b"".join(b.buffer for b in blocks) == data
+        # Blocks read while the event loop was busy are taken together, in order.
+        assert len(blocks) == 1024
+        assert channels[0].wakeup_count < len(blocks)
+
+    @staticmethod
+    async def test_cancel_during_read():
+        reader = BlockingReader()
+        task = asyncio.create_task(
+            asyncaudio.stream_queuer(reader, asyncio.Queue[asyncaudio.RawAudio]())
+        )
+        await asyncio.to_thread(reader.started.wait)
+
+        task.cancel()
+        asyncio.get_running_loop().call_later(0.02, reader.proceed.set)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # The queuer waited for the read to finish, after which the stream may be closed.
+        assert reader.returned
+
+    @staticmethod
+    async def test_cancel_releases():
+        queue = asyncio.Queue[asyncaudio.RawAudio](maxsize=1)
+        pool = pools.BufferPool()
+        task = asyncio.create_task(
+            asyncaudio.stream_queuer(
+                io.BytesIO(bytes(100)), queue, block_size=4, max_blocks=4, pool=pool
+            )
+        )
+        # One block is queued and the thread reads as many ahead as it may.
+        async with asyncio.timeout(1.0):
+            while pool.allocated_count < 5:
+                await asyncio.sleep(0.001)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # Blocks waiting for room in the queue or still in the channel are released.
+        assert pool.allocated_count == 5
+        queue.get_nowait().release()
+        assert pool.free_count == 5
+
+    @staticmethod
+    async def test_error():
+        with pytest.raises(OSError, match="^read failed$"):
+            await asyncaudio.stream_queuer(FailingReader(), asyncio.Queue[asyncaudio.RawAudio]())
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "kwargs, message",
+        [
+            ({"block_size": 1}, "^block_size must hold at least one frame$"),
+            ({"speed": 0.0}, "^speed must be positive$"),
+            ({"max_blocks": 0}, "^max_blocks must be at least 1$"),
+        ],
+    )
+    async def test_invalid(kwargs, message):
+        with pytest.raises(ValueError, match=message):
+            await asyncaudio.stream_queuer(
+                io.BytesIO(), asyncio.Queue[asyncaudio.RawAudio](), **kwargs
+            )
+
+
+@pytest.fixture
+def pipe() -> Iterator[tuple[int, int]]:
+    read_fd, write_fd = os.pipe()
+    yield read_fd, write_fd
+    for fd in read_fd, write_fd:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+class TestPipeQueuer:
+    @staticmethod
+    async def test_pipe(fake_clock, pipe):
+        read_fd, write_fd = pipe
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+        task = asyncio.create_task(asyncaudio.pipe_queuer(read_fd, queue))
+
+        os.write(write_fd, b"abcde")
+        first = await queue.get()
+        # The part of a frame that arrived waits for the rest.
+        os.write(write_fd, b"fgh")
+        second = await queue.get()
+        os.close(write_fd)
+        await task
+
+        assert first == asyncaudio.RawAudio(b"abcd", 2, fake_clock.dt_at_step(0).timestamp())
+        assert second == asyncaudio.RawAudio(b"efgh", 2, fake_clock.dt_at_step(1).timestamp())
+        assert queue.empty()
+        # The pipe is left as blocking as it was.
+        assert os.get_blocking(read_fd)
+
+    @staticmethod
+    async def test_block_size(pipe):
+        read_fd, write_fd = pipe
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+        pool = pools.BufferPool()
+        os.write(write_fd, b"abcdefghij")
+        os.close(write_fd)
+
+        await asyncaudio.pipe_queuer(read_fd, queue, block_size=5, pool=pool)
+
+        blocks = queues.empty_queue(queue)
+        assert [bytes(b.buffer) for b in blocks] == [b"abcd", b"efgh", b"ij"]
+        assert [b.frames for b in blocks] == [2, 2, 1]
+        for block in blocks:
+            block.release()
+        assert pool.allocated_count == pool.free_count
+
+    @staticmethod
+    async def test_full_queue(pipe):
+        read_fd, write_fd = pipe
+        queue = asyncio.Queue[asyncaudio.RawAudio](maxsize=1)
+        os.write(write_fd, b"abcdefghijkl")
+        task = asyncio.create_task(asyncaudio.pipe_queuer(read_fd, queue, block_size=4))
+        await asyncio.sleep(0.01)
+
+        # The pipe is not read while a block waits for room in the queue.
+        assert queue.qsize() == 1
+        blocks = [await queue.get(), await queue.get(), await queue.get()]
+        os.close(write_fd)
+        await task
+
+        assert [bytes(b.buffer) for b in blocks] == [b"abcd", b"efgh", b"ijkl"]
+
+    @staticmethod
+    async def test_cancel(pipe):
+        read_fd, _ = pipe
+        task = asyncio.create_task(
+            asyncaudio.pipe_queuer(read_fd, asyncio.Queue[asyncaudio.RawAudio]())
+        )
+        await asyncio.sleep(0)
+        assert not os.get_blocking(read_fd)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert os.get_blocking(read_fd)
+
+    @staticmethod
+    async def test_invalid(pipe):
+        with pytest.raises(ValueError, match="^block_size must hold at least one frame$"):
+            await asyncaudio.pipe_queuer(
+                pipe[0], asyncio.Queue[asyncaudio.RawAudio](), block_size=1
+            )
+
+
+async def test_stream_queuer_frame_size(fake_clock):
+    queue = asyncio.Queue[asyncaudio.RawAudio]()
+
+    await asyncaudio.stream_queuer(
+        io.BytesIO(b"abcdefghij"), queue, block_size=8, bytes_per_frame=4
+    )
+
+    block1, block2 = queues.empty_queue(queue)
+    assert block1.frames == 2
+    assert block2.frames == 0
+
+
 async def test_audio_sender(realtime_session, realtime_model):
     queue = asyncio.Queue[asyncaudio.RawAudio]()
 
-    task = asyncio.create_task(asyncaudio.audio_sender(realtime_session, queue, commit_size=7))
+    task = asyncio.create_task(
+        asyncaudio.audio_sender(realtime_session, queue, commit_size=7, frame_duration=None)
+    )
 
     async def do_test():
         try:
@@ -110,3 +625,307 @@ async def test_audio_sender(realtime_session, realtime_model):
             task.cancel()
 
     await asyncio.gather(task, do_test())
+
+
+async def test_default_output_player():
+    player = playback.Player()
+    task = asyncio.create_task(asyncaudio.default_output_player(player))
+    try:
+        await asyncio.sleep(0.01)
+        player.write(b"\x01\x02" * 480)
+        player.end()
+        async with asyncio.timeout(1.0):
+            while player.played_bytes < 960:
+                await asyncio.sleep(0.005)
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert player.underrun_count == 0
+    (latency,) = player.latencies
+    # At least the device's output latency.
+    assert latency >= 0.01
+
+
+class TestAudioReceiver:
+    @staticmethod
+    async def receive(
+        model: fake_model.FakeRealtimeModel,
+        player: playback.Player,
+        action: Callable[[fake_model.FakeRealtimeModel, rt.RealtimeSession], Awaitable[None]],
+        until: str,
+        tracer: tracing.LatencyTracer | None = None,
+    ) -> list[str]:
+        """Run the receiver until it has received an event of the given type."""
+        runner = rt.RealtimeRunner(rt.RealtimeAgent(name="agent"), model=model)
+        received: list[str] = []
+        async with await runner.run() as session:
+
+            async def events() -> AsyncIterator[rt.RealtimeSessionEvent]:
+                async for event in session:
+                    received.append(event.type)
+                    yield event
+                    if event.type == until:
+                        break
+
+            task = asyncio.create_task(asyncaudio.audio_receiver(events(), player, tracer=tracer))
+            await action(model, session)
+            await asyncio.wait_for(task, 1.0)
+        return received
+
+    @staticmethod
+    async def test_response():
+        model = fake_model.FakeRealtimeModel(response_audio=b"ab" * 2400, audio_delta_size=960)
+        player = playback.Player()
+
+        async def action(model, session):
+            await session.send_message("hello")
+
+        received = await TestAudioReceiver.receive(model, player, action, "audio_end")
+
+        assert received.count("audio") == 5
+        assert received.count("audio_end") == 1
+        assert player.pending_bytes == 4800
+        assert player.dropped_bytes == 0
+        # The response's audio ended, so playing past it is not an underrun.
+        player.callback(bytearray(9600), 4800, streaming.TimeStruct(0.0, 0.0, 0.0), None)
+        assert player.underrun_count == 0
+
+    @staticmethod
+    async def test_interrupted():
+        model = fake_model.FakeRealtimeModel(
+            delays=fake_model.ProcessingDelays(audio_delta=0.01, response=10.0),
+            response_audio=b"ab" * 24000,
+            audio_delta_size=960,
+        )
+        player = playback.Player()
+
+        async def action(model, session):
+            await session.send_message("hello")
+            await asyncio.sleep(0.05)
+            model.start_user_speech()
+
+        received = await TestAudioReceiver.receive(model, player, action, "audio_interrupted")
+
+        assert received[-1] == "audio_interrupted"
+        assert player.pending_bytes == 0
+        assert player.latencies == ()
+
+    @staticmethod
+    async def test_tracer():
+        model = fake_model.FakeRealtimeModel(response_audio=b"ab" * 2400, audio_delta_size=960)
+        player = playback.Player()
+        tracer = tracing.LatencyTracer()
+
+        async def action(model, session):
+            tracer.commit_sent(misc.time() - 0.5, misc.time())
+            await session.send_audio(b"ab" * 2400, commit=True)
+            await session.send_message("hello")
+
+        await TestAudioReceiver.receive(model, player, action, "audio_end", tracer)
+
+        histograms = tracer.histograms
+        assert histograms[tracing.Stage.ACK].count == 1
+        assert histograms[tracing.Stage.RESPONSE].count == 1
+        assert histograms[tracing.Stage.TURN].count == 1
+        assert histograms[tracing.Stage.TURN].min >= 0.5
+
+
+class TestAudioSender:
+    @staticmethod
+    async def run_sender(
+        session: rt.RealtimeSession,
+        blocks: list[bytes],
+        *,
+        delay: float = 0.0,
+        captured: float = 0.0,
+        pool: pools.BufferPool | None = None,
+        **kwargs,
+    ) -> asyncaudio.UploadStats:
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+        stats = asyncaudio.UploadStats()
+        task = asyncio.create_task(asyncaudio.audio_sender(session, queue, stats=stats, **kwargs))
+        try:
+            for block in blocks:
+                if pool is None:
+                    audio = asyncaudio.RawAudio(block, len(block) // 2, captured)
+                else:
+                    audio = asyncaudio.RawAudio.from_pool(pool, block, len(block) // 2, captured)
+                await queue.put(audio)
+            for _ in range(10):
+                await asyncio.sleep(0)
+            if delay:
+                await asyncio.sleep(delay)
+                for _ in range(10):
+                    await asyncio.sleep(0)
+        finally:
+            task.cancel()
+            await task
+        return stats
+
+    @staticmethod
+    async def test_coalesce(realtime_session, realtime_model):
+        stats = await TestAudioSender.run_sender(
+            realtime_session,
+            [b"a" * 300, b"b" * 300, b"c" * 300, b"d" * 300],
+            commit_size=None,
+            frame_duration=0.01,
+        )
+
+        # 10ms of 24kHz audio is 480 bytes.
+        assert stats.sends == 2
+        assert stats.bytes_sent == 960
+        assert realtime_model.pending_audio == b"a" * 300 + b"b" * 300 + b"c" * 300 + b"d" * 60
+
+    @staticmethod
+    async def test_block_larger_than_ring(realtime_session, realtime_model):
+        audio = bytes(range(250)) * 8
+        stats = await TestAudioSender.run_sender(
+            realtime_session, [audio], commit_size=None, frame_duration=0.001
+        )
+
+        # 1ms of 24kHz audio is 48 bytes, and the ring of pending audio holds 16 messages.
+        assert stats.sends == 41
+        assert realtime_model.pending_audio == audio[: 41 * 48]
+
+    @staticmethod
+    async def test_flush(realtime_session, realtime_model):
+        stats = await TestAudioSender.run_sender(
+            realtime_session, [b"a" * 100], commit_size=None, frame_duration=0.01, delay=0.05
+        )
+
+        assert stats.sends == 1
+        assert realtime_model.pending_audio == b"a" * 100
+
+    @staticmethod
+    async def test_commit_size_resets(realtime_session, realtime_model):
+        stats = await TestAudioSender.run_sender(
+            realtime_session,
+            [b"a" * 480] * 5,
+            commit_size=960,
+            frame_duration=0.01,
+        )
+
+        assert stats.sends == 5
+        assert stats.commits == 2
+        assert realtime_model.committed_audio == b"a" * 1920
+        assert realtime_model.pending_audio == b"a" * 480
+
+    @staticmethod
+    async def test_commit_interval(realtime_session, realtime_model):
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+        stats = asyncaudio.UploadStats()
+        task = asyncio.create_task(
+            asyncaudio.audio_sender(
+                realtime_session,
+                queue,
+                commit_size=None,
+                commit_interval=0.02,
+                frame_duration=None,
+                stats=stats,
+            )
+        )
+        try:
+            await queue.put(asyncaudio.RawAudio(buffer=b"block1", frames=3, time=0.0))
+            await asyncio.sleep(0.03)
+            await queue.put(asyncaudio.RawAudio(buffer=b"block2", frames=3, time=0.0))
+            for _ in range(10):
+                await asyncio.sleep(0)
+        finally:
+            task.cancel()
+            await task
+
+        assert stats.commits == 1
+        assert realtime_model.committed_audio == b"block1block2"
+        assert stats.elapsed >= 0.03
+        assert stats.sends_per_second == 2 / stats.elapsed
+        assert stats.bytes_per_second == 12 / stats.elapsed
+
+    @staticmethod
+    async def test_gate(realtime_session, realtime_model):
+        gate = vad.VoiceGate(pre_roll=0.0, hangover=0.0)
+        speech = b"\x00\x40" * 240
+
+        stats = await TestAudioSender.run_sender(
+            realtime_session,
+            [bytes(480), speech, bytes(480)],
+            commit_size=None,
+            frame_duration=0.01,
+            gate=gate,
+        )
+
+        assert stats.bytes_sent == 480
+        assert realtime_model.pending_audio == speech
+        assert gate.suppressed_bytes == 960
+
+    @staticmethod
+    async def test_encoder(realtime_session, realtime_model):
+        encoder = g711.Encoder(g711.Law.ULAW, input_rate=8000.0)
+
+        stats = await TestAudioSender.run_sender(
+            realtime_session,
+            [bytes(240), bytes(100)],
+            commit_size=None,
+            frame_duration=0.01,
+            encoder=encoder,
+        )
+
+        # 10ms of 8kHz G.711 audio is 80 bytes.
+        assert stats.sends == 2
+        assert stats.bytes_sent == 160
+        assert realtime_model.pending_audio == b"\xff" * 160
+
+    @staticmethod
+    async def test_tracer(realtime_session, fake_clock):
+        tracer = tracing.LatencyTracer()
+        captured = misc.time()
+
+        await TestAudioSender.run_sender(
+            realtime_session,
+            [b"a" * 300] * 4,
+            commit_size=480,
+            frame_duration=0.01,
+            captured=captured,
+            tracer=tracer,
+        )
+        tracer.commit_acknowledged(captured + 1.0)
+
+        histograms = tracer.histograms
+        assert histograms[tracing.Stage.QUEUE].count == 4
+        # Latencies are measured on the fake clock, which advances on every reading.
+        assert 0.0 < histograms[tracing.Stage.QUEUE].min < 1.0
+        # The last block is only partly sent.
+        assert histograms[tracing.Stage.UPLOAD].count == 3
+        assert 0.0 < histograms[tracing.Stage.UPLOAD].max < 2.0
+        assert histograms[tracing.Stage.ACK].count == 1
+
+    @staticmethod
+    @pytest.mark.parametrize("frame_duration", [0.01, None])
+    async def test_release(realtime_session, realtime_model, frame_duration):
+        pool = pools.BufferPool()
+
+        await TestAudioSender.run_sender(
+            realtime_session,
+            [b"a" * 300, b"b" * 300],
+            commit_size=None,
+            frame_duration=frame_duration,
+            pool=pool,
+        )
+
+        assert pool.allocated_count == 2
+        assert pool.free_count == 2
+        assert realtime_model.pending_audio.startswith(b"a" * 300 + b"b" * 180)
+
+    @staticmethod
+    async def test_invalid_frame_duration(realtime_session):
+        with pytest.raises(ValueError, match="^frame_duration must be positive$"):
+            await asyncaudio.audio_sender(
+                realtime_session, asyncio.Queue[asyncaudio.RawAudio](), frame_duration=0.0
+            )
+
+
+def test_upload_stats_no_time():
+    stats = asyncaudio.UploadStats(sends=1, bytes_sent=2)
+    assert stats.sends_per_second == 0.0
+    assert stats.bytes_per_second == 0.0
@@ -0,0 +1,115 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import threading
+
+import pytest
+from langgolem.audio import capture
+
+
+def as_tuple(buffer: memoryview, frames: int, time: float) -> tuple[bytes, int, float]:
+    return bytes(buffer), frames, time
+
+
+@pytest.fixture
+async def ring() -> capture.CaptureRing:
+    return capture.CaptureRing(asyncio.get_running_loop(), capacity=8, max_blocks=3)
+
+
+class TestCaptureRing:
+    @staticmethod
+    async def test_constructor(ring):
+        assert ring.capacity == 8
+        assert ring.max_blocks == 3
+        assert ring.pending_blocks == 0
+        assert ring.dropped_blocks == 0
+        assert ring.dropped_bytes == 0
+        assert ring.wakeup_count == 0
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "kwargs, message",
+        [
+            ({"capacity": 0}, "^capacity must be at least 1$"),
+            ({"max_blocks": 0}, "^max_blocks must be at least 1$"),
+        ],
+    )
+    async def test_invalid(kwargs, message):
+        with pytest.raises(ValueError, match=message):
+            capture.CaptureRing(asyncio.get_running_loop(), **kwargs)
+
+    @staticmethod
+    async def test_drain(ring):
+        assert ring.write(b"ab", 1, 0.5)
+        assert ring.write(b"", 0, 0.75)
+        assert ring.pending_blocks == 2
+
+        assert ring.drain(as_tuple) == [(b"ab", 1, 0.5), (b"", 0, 0.75)]
+        assert ring.pending_blocks == 0
+        assert ring.drain(as_tuple) == []
+
+    @staticmethod
+    async def test_wrap_around(ring):
+        assert ring.write(b"abcdef", 3, 0.0)
+        assert ring.drain(as_tuple) == [(b"abcdef", 3, 0.0)]
+
+        assert ring.write(bytearray(b"ghijkl"), 3, 1.0)
+        assert ring.drain(as_tuple) == [(b"ghijkl", 3, 1.0)]
+
+    @staticmethod
+    async def test_full(ring):
+        assert ring.write(b"abcd", 2, 0.0)
+        assert not ring.write(b"efghij", 3, 1.0)
+        assert ring.write(b"ef", 1, 2.0)
+        assert ring.write(b"gh", 1, 3.0)
+        assert not ring.write(b"", 0, 4.0)
+
+        assert ring.dropped_blocks == 2
+        assert ring.dropped_bytes == 6
+        assert ring.drain(as_tuple) == [(b"abcd", 2, 0.0), (b"ef", 1, 2.0), (b"gh", 1, 3.0)]
+
+    @staticmethod
+    async def test_coalesced_wakeup():
+        ring = capture.CaptureRing(asyncio.get_running_loop())
+
+        def produce():
+            for index in range(100):
+                ring.write(bytes([index]), 1, float(index))
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        thread.join()
+
+        await asyncio.wait_for(ring.wait(), 1.0)
+        blocks = ring.drain(as_tuple)
+        assert [b for b, _, _ in blocks] == [bytes([i]) for i in range(100)]
+        assert ring.wakeup_count == 1
+
+        ring.write(b"x", 1, 100.0)
+        await asyncio.wait_for(ring.wait(), 1.0)
+        assert ring.drain(as_tuple) == [(b"x", 1, 100.0)]
+        assert ring.wakeup_count == 2
+
+    @staticmethod
+    async def test_concurrent():
+        ring = capture.CaptureRing(asyncio.get_running_loop(), capacity=64, max_blocks=4)
+        block_count = 2000
+
+        def produce():
+            index = 0
+            while index < block_count:
+                if ring.write(index.to_bytes(2), 1, float(index)):
+                    index += 1
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        received: list[int] = []
+        try:
+            while len(received) < block_count:
+                await asyncio.wait_for(ring.wait(), 1.0)
+                received.extend(int.from_bytes(b) for b, _, _ in ring.drain(as_tuple))
+        finally:
+            thread.join()
+
+        assert received == list(range(block_count))
@@ -0,0 +1,99 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+from langgolem.audio import convert
+from langgolem.bench import dsp
+
+
+def interleave(dtype: str, *frames: tuple[float, ...]) -> bytes:
+    return np.array(frames, dtype=np.dtype(dtype).newbyteorder("<")).tobytes()
+
+
+def mono(buffer: bytes) -> list[int]:
+    return np.frombuffer(buffer, dtype="<i2").tolist()
+
+
+class TestDownmixer:
+    @staticmethod
+    def test_constructor():
+        downmixer = convert.Downmixer(4, "int32", channel=2)
+        assert downmixer.channels == 4
+        assert downmixer.dtype == "int32"
+        assert downmixer.channel == 2
+        assert downmixer.bytes_per_frame == 16
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "channels, dtype, channel, message",
+        [
+            (0, "int16", None, "^channels must be at least 1$"),
+            (2, "float64", None, "^Unsupported dtype: 'float64'$"),
+            (2, "int16", 2, "^channel must be between 0 and 1$"),
+            (2, "int16", -1, "^channel must be between 0 and 1$"),
+        ],
+    )
+    def test_invalid(channels, dtype, channel, message):
+        with pytest.raises(ValueError, match=message):
+            convert.Downmixer(channels, dtype, channel=channel)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "dtype, scale",
+        [("int8", 1 / 256), ("int16", 1), ("int32", 65536), ("float32", 1 / 32768)],
+    )
+    def test_average(dtype, scale):
+        downmixer = convert.Downmixer(2, dtype)
+
+        output = downmixer.process(
+            interleave(dtype, (1024 * scale, 512 * scale), (-256 * scale, -768 * scale))
+        )
+
+        assert mono(output) == [768, -512]
+
+    @staticmethod
+    def test_unsigned():
+        downmixer = convert.Downmixer(2, "uint8")
+
+        output = downmixer.process(interleave("uint8", (128, 128), (0, 0), (255, 255), (129, 131)))
+
+        assert mono(output) == [0, -32768, 32512, 512]
+
+    @staticmethod
+    def test_select_channel():
+        downmixer = convert.Downmixer(3, "int16", channel=1)
+
+        output = downmixer.process(interleave("int16", (1, 2, 3), (4, 5, 6)))
+
+        assert mono(output) == [2, 5]
+
+    @staticmethod
+    def test_clip():
+        downmixer = convert.Downmixer(1, "float32")
+
+        output = downmixer.process(interleave("float32", (2.0,), (-2.0,), (0.5,)))
+
+        assert mono(output) == [32767, -32768, 16384]
+
+    @staticmethod
+    def test_grow():
+        downmixer = convert.Downmixer(2, "int16", max_frames=1)
+
+        assert mono(downmixer.process(interleave("int16", (1, 3), (5, 7), (9, 11)))) == [2, 6, 10]
+        assert mono(downmixer.process(interleave("int16", (2, 4)))) == [3]
+
+    @staticmethod
+    def test_partial_frame():
+        downmixer = convert.Downmixer(2, "int16")
+
+        assert mono(downmixer.process(interleave("int16", (1, 3)) + b"\x00\x00")) == [2]
+
+    @staticmethod
+    def test_block_cost():
+        downmixer = convert.Downmixer(64, "int32")
+        block = bytes(480 * 64 * 4)
+
+        timing = dsp.time_stage(downmixer.process, block, block_duration=0.01, block_count=100)
+
+        assert timing.real_time_factor < 0.5
@@ -0,0 +1,119 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+from langgolem.audio import g711
+from langgolem.audio import resample
+from langgolem.bench import dsp
+
+
+def tone(frequency: float, rate: float, duration: float = 1.0) -> bytes:
+    times = np.arange(int(rate * duration)) / rate
+    return (10000 * np.sin(2 * np.pi * frequency * times)).astype("<i2").tobytes()
+
+
+def samples(buffer: bytes) -> np.ndarray:
+    return np.frombuffer(buffer, dtype="<i2").astype(np.float64)
+
+
+ALL_SAMPLES = np.arange(1 << 16, dtype=np.uint16).view("<i2").tobytes()
+
+
+@pytest.mark.parametrize(
+    "law, encoded",
+    [
+        # Zero, the largest positive and the largest negative sample.
+        (g711.Law.ULAW, b"\xff\x80\x00"),
+        (g711.Law.ALAW, b"\xd5\xaa\x2a"),
+    ],
+)
+def test_encode(law, encoded):
+    buffer = np.array([0, 32767, -32768], dtype="<i2").tobytes()
+    assert g711.encode(buffer, law) == encoded
+
+
+@pytest.mark.parametrize(
+    "law, decoded",
+    [
+        (g711.Law.ULAW, [-32124, 32124, 0, 716]),
+        (g711.Law.ALAW, [-5504, 5504, 848, 8]),
+    ],
+)
+def test_decode(law, decoded):
+    assert samples(g711.decode(b"\x00\x80\xff\xd5", law)).tolist() == decoded
+
+
+@pytest.mark.parametrize("law", list(g711.Law))
+def test_round_trip(law):
+    codes = bytes(range(256))
+    decoded = g711.decode(codes, law)
+    assert g711.decode(g711.encode(decoded, law), law) == decoded
+
+
+@pytest.mark.parametrize("law", list(g711.Law))
+def test_quantization_error(law):
+    original = samples(ALL_SAMPLES)
+    decoded = samples(g711.decode(g711.encode(ALL_SAMPLES, law), law))
+
+    # Companding keeps the error proportional to the sample's magnitude.
+    loud = np.abs(original) >= 1024
+    assert np.all(np.abs(decoded - original)[loud] <= np.abs(original)[loud] / 16)
+    assert np.abs(decoded - original)[~loud].max() <= 64
+
+
+@pytest.mark.parametrize("law", list(g711.Law))
+def test_empty(law):
+    assert g711.encode(b"", law) == b""
+    assert g711.decode(b"", law) == b""
+
+
+class TestEncoder:
+    @staticmethod
+    def test_constructor():
+        encoder = g711.Encoder(g711.Law.ALAW)
+        assert encoder.law == g711.Law.ALAW
+        assert encoder.input_rate == 24000.0
+        assert encoder.sample_rate == 8000.0
+        assert encoder.bytes_per_frame == 1
+
+    @staticmethod
+    def test_no_resampling():
+        audio = tone(440.0, 8000.0, 0.1)
+        encoder = g711.Encoder(g711.Law.ULAW, input_rate=8000.0)
+        assert encoder.process(audio) == g711.encode(audio, g711.Law.ULAW)
+
+    @staticmethod
+    @pytest.mark.parametrize("law", list(g711.Law))
+    def test_tone(law):
+        encoder = g711.Encoder(law)
+
+        encoded = encoder.process(tone(440.0, 24000.0))
+
+        assert len(encoded) == 8000
+        output = samples(g711.decode(encoded, law))
+        times = np.arange(output.size) / 8000.0 - resample.Resampler(24000.0, 8000.0).delay
+        expected = 10000 * np.sin(2 * np.pi * 440.0 * times)
+        # Skip the resampler's warm up.
+        assert np.abs(output[100:] - expected[100:]).max() < 400.0
+
+    @staticmethod
+    @pytest.mark.parametrize("law", list(g711.Law))
+    def test_real_time_factor(law):
+        encoder = g711.Encoder(law)
+        block = tone(440.0, 24000.0, 0.01)
+
+        timing = dsp.time_stage(encoder.process, block, block_duration=0.01, block_count=100)
+
+        assert timing.real_time_factor < 0.5
+
+    @staticmethod
+    @pytest.mark.parametrize("law", list(g711.Law))
+    def test_encode_real_time_factor(law):
+        block = tone(440.0, 8000.0, 0.01)
+
+        timing = dsp.time_stage(
+            lambda b: g711.encode(b, law), block, block_duration=0.01, block_count=100
+        )
+
+        assert timing.real_time_factor < 0.05
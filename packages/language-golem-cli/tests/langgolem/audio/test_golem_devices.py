@@ -36,3 +36,31 @@ def test_default_input_stream():
     assert input_stream.channels == 1
     assert input_stream.device == 0
     assert input_stream._callback == callback  # pyright: ignore[reportPrivateUsage]
+
+
+def test_default_input_stream_samplerate():
+    def callback(*args):
+        pytest.fail("Unexpected callback")
+
+    input_stream = devices.default_input_stream(callback, samplerate=48000.0)
+    assert input_stream.samplerate == 48000.0
+
+
+def test_default_output_device():
+    audio_device = devices.default_output_device()
+    assert audio_device.name == "Output device 1"
+    assert audio_device.index == 1
+    assert audio_device.max_output_channels == 1
+
+
+def test_default_output_stream():
+    def callback(*args):
+        pytest.fail("Unexpected callback")
+
+    output_stream = devices.default_output_stream(callback)
+    assert output_stream.samplerate == devices.AUDIO_SAMPLE_RATE
+    assert output_stream.dtype == "int16"
+    assert output_stream.channels == 1
+    assert output_stream.device == 1
+    assert output_stream.latency == 0.01
+    assert output_stream._callback == callback  # pyright: ignore[reportPrivateUsage]
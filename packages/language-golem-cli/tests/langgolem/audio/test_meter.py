@@ -0,0 +1,113 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import math
+
+import numpy as np
+import pytest
+from langgolem.audio import meter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def levels() -> list[meter.Level]:
+    return []
+
+
+@pytest.fixture
+def level_meter(clock, levels) -> meter.LevelMeter:
+    return meter.LevelMeter(levels.append, interval=0.05, clock=clock, max_frames=4)
+
+
+def int16(*values: int) -> bytes:
+    return np.array(values, dtype="<i2").tobytes()
+
+
+class TestLevel:
+    @staticmethod
+    def test_dbfs():
+        level = meter.Level(frames=10, rms=0.1, peak=1.0, clipped=0)
+        assert level.rms_dbfs == pytest.approx(-20.0)
+        assert level.peak_dbfs == 0.0
+
+    @staticmethod
+    def test_silence():
+        level = meter.Level(frames=10, rms=0.0, peak=0.0, clipped=0)
+        assert level.rms_dbfs == -math.inf
+        assert level.peak_dbfs == -math.inf
+
+
+class TestLevelMeter:
+    @staticmethod
+    def test_constructor(level_meter):
+        assert level_meter.interval == 0.05
+        assert level_meter.update_count == 0
+
+    @staticmethod
+    def test_invalid_interval():
+        with pytest.raises(ValueError, match="^interval must not be negative$"):
+            meter.LevelMeter(lambda level: None, interval=-1.0)
+
+    @staticmethod
+    def test_level(level_meter, levels):
+        level_meter.process(int16(16384, -16384, 8192, -8192))
+
+        (level,) = levels
+        assert level.frames == 4
+        assert level.rms == pytest.approx(math.sqrt((0.25 + 0.25 + 0.0625 + 0.0625) / 4))
+        assert level.peak == 0.5
+        assert level.clipped == 0
+
+    @staticmethod
+    def test_clipped(level_meter, levels):
+        level_meter.process(int16(32767, -32768, 0, 32767))
+
+        (level,) = levels
+        assert level.peak == 1.0
+        assert level.clipped == 3
+
+    @staticmethod
+    def test_throttled(level_meter, levels, clock):
+        level_meter.process(int16(100))
+        # Blocks within the interval are metered together in the next update.
+        clock.now = 0.02
+        level_meter.process(int16(200, -300))
+        clock.now = 0.04
+        level_meter.process(int16(400))
+        assert len(levels) == 1
+
+        clock.now = 0.06
+        level_meter.process(int16(*range(10)))
+
+        assert [level.frames for level in levels] == [1, 13]
+        assert levels[1].peak == 400 / 32768
+        assert level_meter.update_count == 2
+
+    @staticmethod
+    def test_flush(level_meter, levels, clock):
+        level_meter.process(int16(100))
+        level_meter.process(int16(-200))
+
+        level_meter.flush()
+        level_meter.flush()
+
+        assert [level.frames for level in levels] == [1, 1]
+        assert levels[1].peak == 200 / 32768
+
+    @staticmethod
+    def test_empty(level_meter, levels):
+        level_meter.process(b"")
+        level_meter.flush()
+        assert levels == []
@@ -0,0 +1,149 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+import sounddevice
+from fakesd import streaming
+from langgolem.audio import playback
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def player(clock) -> playback.Player:
+    return playback.Player(capacity=8, sample_rate=1000.0, clock=clock)
+
+
+def pull(player: playback.Player, size: int, *, latency: float = 0.0) -> bytes:
+    buffer = streaming.FakeCffiBuffer(b"\xff" * size)
+    time = streaming.TimeStruct(10.0, 0.0, 10.0 + latency)
+    player.callback(buffer, size // 2, time, sounddevice.CallbackFlags())
+    return bytes(buffer)
+
+
+class TestPlayer:
+    @staticmethod
+    def test_constructor(player):
+        assert player.capacity == 8
+        assert player.sample_rate == 1000.0
+        assert player.pending_bytes == 0
+        assert player.played_bytes == 0
+        assert player.dropped_bytes == 0
+        assert player.underrun_count == 0
+        assert player.latencies == ()
+
+    @staticmethod
+    def test_invalid():
+        with pytest.raises(ValueError, match="^capacity must be at least 1$"):
+            playback.Player(capacity=0)
+
+    @staticmethod
+    def test_play(player):
+        assert player.write(b"abcd")
+        assert player.pending_bytes == 4
+
+        assert pull(player, 2) == b"ab"
+        assert pull(player, 2) == b"cd"
+        assert player.pending_bytes == 0
+        assert player.played_bytes == 4
+
+    @staticmethod
+    def test_silence(player):
+        assert pull(player, 4) == bytes(4)
+        assert player.underrun_count == 0
+
+    @staticmethod
+    def test_wrap_around(player):
+        assert player.write(b"abcdef")
+        assert pull(player, 6) == b"abcdef"
+
+        assert player.write(b"ghijkl")
+        assert pull(player, 6) == b"ghijkl"
+
+    @staticmethod
+    def test_full(player):
+        assert player.write(b"abcdef")
+        assert not player.write(b"ghij")
+        assert player.write(b"gh")
+
+        assert player.dropped_bytes == 4
+        assert pull(player, 8) == b"abcdefgh"
+
+    @staticmethod
+    def test_underrun(player):
+        player.write(b"ab")
+
+        assert pull(player, 4) == b"ab\x00\x00"
+        assert player.underrun_count == 1
+
+        player.write(b"cd")
+        player.end()
+        assert pull(player, 4) == b"cd\x00\x00"
+        assert player.underrun_count == 1
+
+    @staticmethod
+    def test_underrun_episodes(player):
+        player.write(b"ab")
+
+        # Device buffers that keep running out count as a single underrun.
+        assert pull(player, 4) == b"ab\x00\x00"
+        assert pull(player, 4) == bytes(4)
+        assert player.underrun_count == 1
+
+        player.write(b"cdef")
+        assert pull(player, 4) == b"cdef"
+        player.write(b"gh")
+        assert pull(player, 4) == b"gh\x00\x00"
+        assert player.underrun_count == 2
+
+    @staticmethod
+    def test_long_silence(player):
+        player.write(b"ab")
+        assert pull(player, 10000) == b"ab" + bytes(9998)
+
+    @staticmethod
+    def test_flush(player):
+        player.write(b"abcd")
+        assert pull(player, 2) == b"ab"
+
+        player.flush()
+
+        assert player.pending_bytes == 0
+        assert pull(player, 2) == bytes(2)
+        assert player.underrun_count == 0
+        assert player.played_bytes == 2
+        assert player.write(b"efghijkl")
+        assert pull(player, 8) == b"efghijkl"
+
+    @staticmethod
+    def test_latency(player, clock):
+        player.write(b"ab", received=99.5)
+        player.write(b"cd")
+        assert pull(player, 2, latency=0.25) == b"ab"
+        player.end()
+
+        # The second stream starts 1 frame into the next device buffer.
+        player.write(b"ef", received=100.5)
+        clock.now = 101.0
+        assert pull(player, 4, latency=0.25) == b"cdef"
+
+        assert player.latencies == pytest.approx((0.75, 0.751))
+
+    @staticmethod
+    def test_flushed_latency(player):
+        player.write(b"ab")
+        player.flush()
+        pull(player, 2)
+
+        assert player.latencies == ()
@@ -0,0 +1,95 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+from langgolem.audio import resample
+from langgolem.bench import dsp
+
+
+def tone(frequency: float, rate: float, duration: float = 1.0) -> bytes:
+    times = np.arange(int(rate * duration)) / rate
+    return (10000 * np.sin(2 * np.pi * frequency * times)).astype("<i2").tobytes()
+
+
+def samples(buffer: bytes) -> np.ndarray:
+    return np.frombuffer(buffer, dtype="<i2").astype(np.float64)
+
+
+class TestResampler:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "input_rate, up, down",
+        [(48000.0, 1, 2), (44100.0, 80, 147), (16000.0, 3, 2), (24000.0, 1, 1)],
+    )
+    def test_constructor(input_rate, up, down):
+        resampler = resample.Resampler(input_rate, 24000.0)
+        assert resampler.input_rate == input_rate
+        assert resampler.output_rate == 24000.0
+        assert resampler.up == up
+        assert resampler.down == down
+        assert resampler.delay > 0.0
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "input_rate, output_rate, kwargs, message",
+        [
+            (0.0, 24000.0, {}, "^Sample rates must be positive$"),
+            (48000.0, -1.0, {}, "^Sample rates must be positive$"),
+            (44100.5, 24000.0, {}, "^Sample rates must be whole numbers$"),
+            (48000.0, 24000.0, {"taps_per_phase": 0}, "^taps_per_phase must be at least 1$"),
+        ],
+    )
+    def test_invalid(input_rate, output_rate, kwargs, message):
+        with pytest.raises(ValueError, match=message):
+            resample.Resampler(input_rate, output_rate, **kwargs)
+
+    @staticmethod
+    @pytest.mark.parametrize("input_rate", [48000.0, 44100.0, 16000.0])
+    def test_tone(input_rate):
+        resampler = resample.Resampler(input_rate, 24000.0)
+
+        output = samples(resampler.process(tone(1000.0, input_rate)))
+
+        assert output.size == 24000
+        times = np.arange(output.size) / 24000.0 - resampler.delay
+        expected = 10000 * np.sin(2 * np.pi * 1000.0 * times)
+        # Skip the filter's warm up.
+        assert np.abs(output[100:] - expected[100:]).max() < 5.0
+
+    @staticmethod
+    @pytest.mark.parametrize("input_rate", [48000.0, 44100.0])
+    def test_anti_aliasing(input_rate):
+        resampler = resample.Resampler(input_rate, 24000.0)
+
+        output = samples(resampler.process(tone(15000.0, input_rate)))
+
+        assert np.abs(output[100:]).max() < 100.0
+
+    @staticmethod
+    @pytest.mark.parametrize("block_size", [2, 962, 4410])
+    def test_blocks(block_size):
+        audio = tone(440.0, 44100.0, 0.25)
+        whole = resample.Resampler(44100.0, 24000.0).process(audio)
+
+        resampler = resample.Resampler(44100.0, 24000.0)
+        blocks = [
+            resampler.process(audio[offset : offset + block_size])
+            for offset in range(0, len(audio), block_size)
+        ]
+
+        assert b"".join(blocks) == whole
+
+    @staticmethod
+    def test_empty():
+        resampler = resample.Resampler(48000.0, 24000.0)
+        assert resampler.process(b"") == b""
+
+    @staticmethod
+    def test_real_time_factor():
+        resampler = resample.Resampler(44100.0, 24000.0)
+        block = tone(440.0, 44100.0, 0.01)
+
+        timing = dsp.time_stage(resampler.process, block, block_duration=0.01, block_count=100)
+
+        assert timing.real_time_factor < 0.5
@@ -0,0 +1,105 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+from langgolem.audio import vad
+from langgolem.bench import dsp
+
+# 10ms of 24kHz 16-bit audio.
+FRAME_SIZE = 480
+
+
+def silence(frames: int) -> bytes:
+    return bytes(frames * FRAME_SIZE)
+
+
+def speech(frames: int) -> bytes:
+    times = np.arange(frames * FRAME_SIZE // 2) / 24000.0
+    return (8000 * np.sin(2 * np.pi * 300.0 * times)).astype("<i2").tobytes()
+
+
+@pytest.fixture
+def gate() -> vad.VoiceGate:
+    return vad.VoiceGate(pre_roll=0.03, hangover=0.02)
+
+
+class TestVoiceGate:
+    @staticmethod
+    def test_constructor(gate):
+        assert not gate.active
+        assert gate.noise_db == -62.0
+        assert gate.onsets == 0
+        assert gate.passed_bytes == 0
+        assert gate.suppressed_bytes == 0
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "kwargs, message",
+        [
+            ({"frame_duration": 0.0}, "^frame_duration must be positive$"),
+            ({"pre_roll": -0.1}, "^pre_roll must not be negative$"),
+            ({"hangover": -0.1}, "^hangover must not be negative$"),
+        ],
+    )
+    def test_invalid(kwargs, message):
+        with pytest.raises(ValueError, match=message):
+            vad.VoiceGate(**kwargs)
+
+    @staticmethod
+    def test_silence(gate):
+        assert gate.process(silence(10)) == b""
+        assert not gate.active
+        assert gate.suppressed_bytes == 7 * FRAME_SIZE
+        assert gate.noise_db < -62.0
+
+    @staticmethod
+    def test_speech(gate):
+        audio = silence(10) + speech(5) + silence(10)
+
+        output = gate.process(audio)
+
+        # Three frames of pre-roll, the speech and two frames of hangover.
+        assert output == audio[7 * FRAME_SIZE : 17 * FRAME_SIZE]
+        assert not gate.active
+        assert gate.onsets == 1
+        assert gate.passed_bytes == 10 * FRAME_SIZE
+        assert gate.suppressed_bytes == 7 * FRAME_SIZE + 5 * FRAME_SIZE
+
+    @staticmethod
+    def test_active(gate):
+        gate.process(speech(1))
+        assert gate.active
+
+    @staticmethod
+    def test_partial_frames(gate):
+        audio = silence(10) + speech(5) + silence(10)
+
+        output = b"".join(gate.process(audio[o : o + 100]) for o in range(0, len(audio), 100))
+
+        assert output == audio[7 * FRAME_SIZE : 17 * FRAME_SIZE]
+
+    @staticmethod
+    def test_no_pre_roll():
+        gate = vad.VoiceGate(pre_roll=0.0, hangover=0.0)
+        audio = silence(2) + speech(1) + silence(2)
+
+        assert gate.process(audio) == speech(1)
+        assert gate.suppressed_bytes == 4 * FRAME_SIZE
+
+    @staticmethod
+    def test_noise_floor():
+        gate = vad.VoiceGate(pre_roll=0.0, hangover=0.0)
+        noise = np.random.default_rng(1).normal(0, 2000, 48000).astype("<i2").tobytes()
+
+        # Steady noise above the absolute threshold is learned as the noise floor.
+        gate.process(noise)
+
+        assert gate.noise_db > -40.0
+        assert gate.process(noise[: 50 * FRAME_SIZE]) == b""
+
+    @staticmethod
+    def test_block_cost(gate):
+        timing = dsp.time_stage(gate.process, speech(2), block_duration=0.02, block_count=100)
+
+        assert timing.real_time_factor < 0.5
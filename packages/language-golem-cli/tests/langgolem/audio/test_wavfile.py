@@ -0,0 +1,198 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import pathlib
+import struct
+import wave
+
+import numpy as np
+import pytest
+from langgolem.audio import wavfile
+
+
+def write_wav(path: pathlib.Path, frames: bytes, *, channels=1, width=2, rate=24000):
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(channels)
+        writer.setsampwidth(width)
+        writer.setframerate(rate)
+        writer.writeframes(frames)
+    return path
+
+
+def write_float_wav(path: pathlib.Path, samples: np.ndarray, *, extensible=False, rate=24000):
+    data = samples.astype("<f4").tobytes()
+    if extensible:
+        fmt = struct.pack("<HHIIHHHHI", 0xFFFE, 1, rate, rate * 4, 4, 32, 22, 32, 4)
+        fmt += struct.pack("<H", 3) + bytes(14)
+    else:
+        fmt = struct.pack("<HHIIHH", 3, 1, rate, rate * 4, 4, 32)
+    chunks = (
+        b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        # Unknown chunks of odd size are padded and skipped.
+        + b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+        + b"data" + struct.pack("<I", len(data)) + data
+    )  # fmt: skip
+    path.write_bytes(b"RIFF" + struct.pack("<I", 4 + len(chunks)) + b"WAVE" + chunks)
+    return path
+
+
+def int16(*values: int) -> bytes:
+    return np.array(values, dtype="<i2").tobytes()
+
+
+class TestParseHeader:
+    @staticmethod
+    def test_pcm(tmp_path):
+        path = write_wav(tmp_path / "a.wav", int16(1, 2, 3, 4, 5, 6), channels=2, rate=48000)
+
+        wav_format = wavfile.parse_header(path.read_bytes())
+
+        assert wav_format == wavfile.WavFormat(2, 48000, "int16", 44, 12)
+        assert wav_format.bytes_per_frame == 4
+        assert wav_format.frames == 3
+        assert wav_format.duration == 3 / 48000
+
+    @staticmethod
+    @pytest.mark.parametrize("width, dtype", [(1, "uint8"), (3, "int24"), (4, "int32")])
+    def test_widths(tmp_path, width, dtype):
+        path = write_wav(tmp_path / "a.wav", bytes(width * 4), width=width)
+
+        wav_format = wavfile.parse_header(path.read_bytes())
+
+        assert wav_format.dtype == dtype
+        assert wav_format.bytes_per_frame == width
+        assert wav_format.frames == 4
+
+    @staticmethod
+    @pytest.mark.parametrize("extensible", [False, True])
+    def test_float(tmp_path, extensible):
+        path = write_float_wav(tmp_path / "a.wav", np.zeros(5), extensible=extensible)
+
+        wav_format = wavfile.parse_header(path.read_bytes())
+
+        assert wav_format.dtype == "float32"
+        assert wav_format.frames == 5
+
+    @staticmethod
+    def test_truncated(tmp_path):
+        path = write_wav(tmp_path / "a.wav", int16(*range(10)))
+
+        # The sizes in the header claim more audio than the file holds, and half a frame.
+        wav_format = wavfile.parse_header(path.read_bytes()[:-3])
+
+        assert wav_format.data_size == 16
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "data, message",
+        [
+            (b"", "^Not a WAV file$"),
+            (b"RIFF\x00\x00\x00\x00AVI ", "^Not a WAV file$"),
+            (b"RIFF\x00\x00\x00\x00WAVE", "^WAV file has no audio$"),
+            (
+                b"RIFF\x00\x00\x00\x00WAVEdata\x00\x00\x00\x00",
+                "^WAV data chunk precedes the format chunk$",
+            ),
+            (b"RIFF\x00\x00\x00\x00WAVEfmt \x08\x00\x00\x00", "^WAV format chunk is too short$"),
+            (
+                b"RIFF\x00\x00\x00\x00WAVEfmt \x10\x00\x00\x00"
+                + struct.pack("<HHIIHH", 2, 1, 8000, 4000, 1, 4)
+                + b"data\x00\x00\x00\x00",
+                "^Unsupported WAV sample format 0x0002 with 4 bits$",
+            ),
+        ],
+    )
+    def test_invalid(data, message):
+        with pytest.raises(ValueError, match=message):
+            wavfile.parse_header(data)
+
+
+class TestIsWav:
+    @staticmethod
+    def test_is_wav():
+        assert wavfile.is_wav(b"RIFF\x24\x00\x00\x00WAVEfmt ")
+        assert not wavfile.is_wav(b"RIFF\x24\x00\x00\x00WAV")
+        assert not wavfile.is_wav(b"\x00\x01" * 8)
+
+
+class TestWavReader:
+    @staticmethod
+    def test_mono(tmp_path):
+        audio = int16(*range(-50, 50))
+        path = write_wav(tmp_path / "a.wav", audio)
+
+        with path.open("rb") as file, wavfile.WavReader(file) as reader:
+            assert reader.format.frames == 100
+            assert reader.sample_rate == 24000
+            assert reader.read(10) == audio[:10]
+            assert reader.position == 5
+            assert reader.read() == audio[10:]
+            assert reader.read(10) == b""
+
+    @staticmethod
+    def test_readinto(tmp_path):
+        audio = int16(*range(7))
+        path = write_wav(tmp_path / "a.wav", audio)
+
+        with path.open("rb") as file, wavfile.WavReader(file) as reader:
+            buffer = bytearray(9)
+            # Only whole frames are read.
+            assert reader.readinto(buffer) == 8
+            assert buffer[:8] == audio[:8]
+            assert reader.readinto(buffer) == 6
+            assert buffer[:6] == audio[8:]
+            assert reader.readinto(buffer) == 0
+
+    @staticmethod
+    @pytest.mark.parametrize("channel, expected", [(None, (2, -4)), (1, (3, -6))])
+    def test_stereo(tmp_path, channel, expected):
+        path = write_wav(tmp_path / "a.wav", int16(1, 3, -2, -6), channels=2)
+
+        with path.open("rb") as file, wavfile.WavReader(file, channel=channel) as reader:
+            assert reader.read() == int16(*expected)
+
+    @staticmethod
+    def test_int24(tmp_path):
+        # 0x123456 and -2 in 24 bits read as their top 16 bits.
+        path = write_wav(tmp_path / "a.wav", b"\x56\x34\x12\xfe\xff\xff", width=3)
+
+        with path.open("rb") as file, wavfile.WavReader(file) as reader:
+            assert reader.read() == int16(0x1234, 0)
+
+    @staticmethod
+    def test_float(tmp_path):
+        path = write_float_wav(tmp_path / "a.wav", np.array([0.5, -0.25]), extensible=True)
+
+        with path.open("rb") as file, wavfile.WavReader(file) as reader:
+            assert reader.read() == int16(16384, -8192)
+
+    @staticmethod
+    def test_resample(tmp_path):
+        times = np.arange(48000) / 48000
+        tone = (10000 * np.sin(2 * np.pi * 440 * times)).astype("<i2")
+        path = write_wav(tmp_path / "a.wav", tone.tobytes(), rate=48000)
+
+        with path.open("rb") as file, wavfile.WavReader(file) as reader:
+            chunks = []
+            while chunk := reader.read(1000):
+                chunks.append(chunk)
+
+        # Reads of any size convert the whole file to half as many frames.
+        assert all(len(chunk) == 1000 for chunk in chunks[:-1])
+        assert len(b"".join(chunks)) == 24000 * 2
+        with path.open("rb") as file, wavfile.WavReader(file) as reader:
+            assert reader.read() == b"".join(chunks)
+
+    @staticmethod
+    def test_not_mappable():
+        with pytest.raises(ValueError, match="^WAV input must be a regular file$"):
+            wavfile.WavReader(io.BytesIO(b"RIFF"))  # type: ignore[arg-type]
+
+    @staticmethod
+    def test_invalid(tmp_path):
+        path = tmp_path / "a.wav"
+        path.write_bytes(b"RIFF\x00\x00\x00\x00WAVE")
+
+        with path.open("rb") as file, pytest.raises(ValueError, match="^WAV file has no audio$"):
+            wavfile.WavReader(file)
@@ -0,0 +1,47 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import math
+
+import pytest
+from langgolem.bench import dsp
+
+
+class TestStageTiming:
+    @staticmethod
+    def test_aggregates():
+        timing = dsp.StageTiming(block_duration=0.01, block_times=(0.001, 0.003, 0.002))
+        assert timing.mean_block_time == pytest.approx(0.002)
+        assert timing.p99_block_time == 0.003
+        assert timing.real_time_factor == pytest.approx(0.2)
+
+    @staticmethod
+    def test_no_blocks():
+        timing = dsp.StageTiming(block_duration=0.01, block_times=())
+        assert timing.mean_block_time == 0.0
+        assert math.isnan(timing.p99_block_time)
+        assert timing.real_time_factor == 0.0
+
+
+class TestTimeStage:
+    @staticmethod
+    def test_time_stage():
+        ticks = iter(range(100))
+        blocks: list[bytes] = []
+
+        timing = dsp.time_stage(
+            blocks.append,
+            b"block",
+            block_duration=0.5,
+            block_count=3,
+            clock=lambda: float(next(ticks)),
+        )
+
+        assert blocks == [b"block"] * 3
+        assert timing == dsp.StageTiming(block_duration=0.5, block_times=(1.0, 1.0, 1.0))
+        assert timing.real_time_factor == 2.0
+
+    @staticmethod
+    def test_invalid_block_duration():
+        with pytest.raises(ValueError, match="^block_duration must be positive$"):
+            dsp.time_stage(len, b"", block_duration=0.0)
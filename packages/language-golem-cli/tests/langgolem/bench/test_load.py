@@ -0,0 +1,254 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import math
+
+import pytest
+from fakeopenai.agents import model as fake_model
+from langgolem.audio import asyncaudio
+from langgolem.bench import load
+from langgolem.util import pools
+from langgolem.util import queues
+from langgolem.util import stats
+
+
+def histogram(*values: float) -> stats.Histogram:
+    result = stats.Histogram()
+    for value in values:
+        result.record(value)
+    return result
+
+
+def test_tone_block():
+    block = load.tone_block(4)
+    assert block == b"\x00\x80\x00\x82\x00\x84\x00\x86"
+
+
+class TestSessionStats:
+    @staticmethod
+    def test_percentiles():
+        session_stats = load.SessionStats(
+            index=0, blocks_queued=4, bytes_sent=8, latencies=(0.4, 0.1, 0.3, 0.2)
+        )
+        assert session_stats.p50 == 0.2
+        assert session_stats.p99 == 0.4
+
+    @staticmethod
+    def test_no_latencies():
+        session_stats = load.SessionStats(index=0, blocks_queued=0, bytes_sent=0, latencies=())
+        assert math.isnan(session_stats.p50)
+        assert math.isnan(session_stats.p99)
+
+
+class TestLoadReport:
+    @staticmethod
+    def test_aggregates():
+        report = load.LoadReport(
+            elapsed=2.0,
+            sessions=(
+                load.SessionStats(
+                    index=0,
+                    blocks_queued=4,
+                    bytes_sent=100,
+                    latencies=(),
+                    sends=2,
+                    buffers_allocated=1,
+                    buffers_reused=3,
+                ),
+                load.SessionStats(
+                    index=1,
+                    blocks_queued=6,
+                    bytes_sent=300,
+                    latencies=(),
+                    sends=4,
+                    buffers_allocated=6,
+                ),
+            ),
+            loop_lag=histogram(0.001, 0.003, 0.002),
+        )
+        assert report.bytes_sent == 400
+        assert report.bytes_per_second == 200.0
+        assert report.blocks_per_second == 5.0
+        assert report.sends_per_second == 3.0
+        assert report.buffers_allocated == 7
+        assert report.buffers_reused == 3
+        assert report.loop_lag_p99 == 0.003
+        assert report.loop_lag_max == 0.003
+
+    @staticmethod
+    def test_memory():
+        report = load.LoadReport(
+            elapsed=1.0,
+            sessions=(
+                load.SessionStats(index=0, blocks_queued=0, bytes_sent=0, latencies=()),
+                load.SessionStats(index=1, blocks_queued=0, bytes_sent=0, latencies=()),
+            ),
+            loop_lag=histogram(),
+            peak_traced=3000,
+        )
+        assert report.peak_traced_per_session == 1500.0
+
+    @staticmethod
+    def test_no_time():
+        report = load.LoadReport(elapsed=0.0, sessions=(), loop_lag=histogram())
+        assert report.bytes_per_second == 0.0
+        assert report.blocks_per_second == 0.0
+        assert report.sends_per_second == 0.0
+        assert report.loop_lag_max == 0.0
+        assert report.peak_traced_per_session == 0.0
+
+
+class TestFakeAudioSource:
+    @staticmethod
+    async def test_blocks(fake_clock):
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+        sizes: list[int] = []
+
+        await load.fake_audio_source(
+            queue, duration=0.1, block_frames=480, speed=100.0, on_queued=sizes.append
+        )
+
+        blocks = queues.empty_queue(queue)
+        assert len(blocks) == 5
+        assert sizes == [960] * 5
+        for block in blocks:
+            assert block.frames == 480
+            assert block.buffer == load.tone_block(480)
+        # Each block is a copy, as if captured.
+        assert blocks[0].buffer is not blocks[1].buffer
+
+    @staticmethod
+    async def test_pool():
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+        pool = pools.BufferPool()
+
+        await load.fake_audio_source(queue, duration=0.1, block_frames=480, speed=100.0, pool=pool)
+
+        blocks = queues.empty_queue(queue)
+        assert pool.allocated_count == 5
+        for block in blocks:
+            assert block.buffer == load.tone_block(480)
+
+    @staticmethod
+    async def test_pool_reuse():
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+        pool = pools.BufferPool()
+
+        await load.fake_audio_source(
+            queue,
+            duration=0.1,
+            block_frames=480,
+            speed=100.0,
+            # Released as soon as queued, like by a sender that keeps up.
+            on_queued=lambda size: queue.get_nowait().release(),
+            pool=pool,
+        )
+
+        assert pool.allocated_count == 1
+        assert pool.reused_count == 4
+
+    @staticmethod
+    async def test_pacing():
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue[asyncaudio.RawAudio]()
+
+        start = loop.time()
+        await load.fake_audio_source(queue, duration=0.1, block_frames=480, speed=2.0)
+
+        # The last of 5 blocks is due 4 block periods after the first.
+        assert loop.time() - start >= 4 * 0.02 / 2.0
+
+    @staticmethod
+    async def test_invalid_speed():
+        with pytest.raises(ValueError, match="^speed must be positive$"):
+            await load.fake_audio_source(
+                asyncio.Queue[asyncaudio.RawAudio](), duration=0.1, block_frames=480, speed=0.0
+            )
+
+
+class TestRunLoad:
+    @staticmethod
+    async def test_sessions(starting_agent):
+        models: list[fake_model.FakeRealtimeModel] = []
+
+        def model_factory() -> fake_model.FakeRealtimeModel:
+            models.append(fake_model.FakeRealtimeModel())
+            return models[-1]
+
+        report = await load.run_load(
+            model_factory,
+            starting_agent,
+            session_count=3,
+            duration=0.1,
+            block_frames=480,
+            speed=10.0,
+            lag_interval=0.001,
+        )
+
+        assert len(models) == 3
+        assert [s.index for s in report.sessions] == [0, 1, 2]
+        for session_stats, model in zip(report.sessions, models, strict=True):
+            assert session_stats.blocks_queued == 5
+            assert session_stats.bytes_sent == 5 * 960
+            assert len(session_stats.latencies) == 5
+            assert session_stats.sends == 5
+            assert all(latency >= 0.0 for latency in session_stats.latencies)
+            assert len(model.pending_audio) + len(model.committed_audio) == 5 * 960
+            assert not model.is_connected
+        assert report.bytes_sent == 3 * 5 * 960
+        assert report.sends_per_second > 0.0
+        assert report.elapsed > 0.0
+        assert report.bytes_per_second > 0.0
+        assert report.loop_lag.count
+        assert report.peak_rss > 0
+        assert report.peak_traced == 0
+
+    @staticmethod
+    @pytest.mark.parametrize("pool_buffers", [True, False])
+    async def test_trace_memory(starting_agent, pool_buffers):
+        report = await load.run_load(
+            fake_model.FakeRealtimeModel,
+            starting_agent,
+            session_count=2,
+            duration=0.1,
+            speed=10.0,
+            pool_buffers=pool_buffers,
+            trace_memory=True,
+        )
+
+        assert report.bytes_sent == 2 * 5 * 960
+        assert report.peak_traced > 0
+        for session_stats in report.sessions:
+            if pool_buffers:
+                # How many buffers the sender releases in time for reuse depends on scheduling,
+                # but every block takes either a new or a reused buffer.
+                assert session_stats.buffers_allocated <= 5
+                assert session_stats.buffers_allocated + session_stats.buffers_reused == 5
+            else:
+                assert session_stats.buffers_allocated == 5
+                assert session_stats.buffers_reused == 0
+
+    @staticmethod
+    async def test_coalesced(starting_agent):
+        report = await load.run_load(
+            fake_model.FakeRealtimeModel,
+            starting_agent,
+            session_count=1,
+            duration=0.2,
+            block_frames=120,
+            speed=10.0,
+            frame_duration=0.04,
+        )
+
+        (session_stats,) = report.sessions
+        assert session_stats.blocks_queued == 40
+        assert session_stats.bytes_sent == 40 * 240
+        assert session_stats.sends == 5
+
+    @staticmethod
+    async def test_invalid_session_count(starting_agent):
+        with pytest.raises(ValueError, match="^session_count must be at least 1$"):
+            await load.run_load(
+                fake_model.FakeRealtimeModel, starting_agent, session_count=0, duration=0.1
+            )
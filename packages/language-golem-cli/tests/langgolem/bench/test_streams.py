@@ -0,0 +1,77 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import math
+
+import pytest
+from langgolem.bench import streams
+from langgolem.util import queues
+
+
+class TestCopyingQueueStream:
+    @staticmethod
+    def test_read():
+        stream = streams.CopyingQueueStream(queues.populated_queue([b"abcd", b"efgh"]))
+        assert stream.read(3) == b"abc"
+        assert stream.read(3) == b"def"
+        assert stream.read() == b"gh"
+        assert stream.read() == b""
+
+
+class TestReadTiming:
+    @staticmethod
+    def test_aggregates():
+        timing = streams.ReadTiming(bytes_per_pass=1000, pass_times=(0.1, 0.3, 0.2))
+        assert timing.mean_pass_time == pytest.approx(0.2)
+        assert timing.p99_pass_time == 0.3
+        assert timing.throughput == pytest.approx(5000.0)
+
+    @staticmethod
+    def test_no_passes():
+        timing = streams.ReadTiming(bytes_per_pass=1000, pass_times=())
+        assert timing.mean_pass_time == 0.0
+        assert math.isnan(timing.p99_pass_time)
+        assert timing.throughput == 0.0
+
+
+class TestTimeReads:
+    @staticmethod
+    @pytest.mark.parametrize(
+        "stream_factory, readinto",
+        [
+            (queues.QueueStream, False),
+            (queues.QueueStream, True),
+            (streams.CopyingQueueStream, False),
+        ],
+    )
+    def test_time_reads(stream_factory, readinto):
+        ticks = iter(range(100))
+        read_streams = []
+
+        def factory(queue):
+            read_streams.append(stream_factory(queue))
+            return read_streams[-1]
+
+        timing = streams.time_reads(
+            factory,
+            chunk_size=10,
+            chunk_count=3,
+            read_size=4,
+            readinto=readinto,
+            pass_count=2,
+            clock=lambda: float(next(ticks)),
+        )
+
+        assert timing == streams.ReadTiming(bytes_per_pass=30, pass_times=(1.0, 1.0))
+        assert len(read_streams) == 2
+        assert all(stream.read() == b"" for stream in read_streams)
+
+    @staticmethod
+    def test_readinto_unsupported():
+        with pytest.raises(ValueError, match="^stream does not support readinto$"):
+            streams.time_reads(streams.CopyingQueueStream, readinto=True)
+
+    @staticmethod
+    def test_invalid_read_size():
+        with pytest.raises(ValueError, match="^read_size must be at least 1$"):
+            streams.time_reads(queues.QueueStream, read_size=0)
@@ -1,8 +1,27 @@
 # Copyright 2025 The Milton Hirsch Institute, B.V.
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+import re
+import sys
+import threading
+import wave
+
+import numpy as np
 from langgolem.cli import main
 
+LEVEL = re.compile(r"frames=(\d+) rms=-?[\d.]+ dBFS peak=-?[\d.]+ dBFS clipped=\d+")
+
+
+def level_frames(stdout: str) -> list[int]:
+    """Frames of each level update printed by prattle."""
+    frames = []
+    for line in stdout.splitlines():
+        match = LEVEL.fullmatch(line)
+        assert match, line
+        frames.append(int(match[1]))
+    return frames
+
 
 class TestPrattle:
     @staticmethod
@@ -17,6 +36,176 @@ class TestPrattle:
     def test_input_file(runner, audio_file):
         result = runner.invoke(main.langgolem, ["prattle", "-i", str(audio_file)])
 
-        assert result.stdout == "32768\n32768\n32768\n32768\n32768\n32768\n32768\n10624\n"
+        # How many blocks share an update depends on how fast they are read.
+        assert sum(level_frames(result.stdout)) == 240000
+        assert result.stderr == ""
+        assert result.exit_code == 0
+
+    @staticmethod
+    def test_level_throttled(runner, audio_file):
+        result = runner.invoke(
+            main.langgolem, ["prattle", "-i", str(audio_file), "--level-interval", "3600"]
+        )
+
+        # The first block is reported at once and the rest when the input ends.
+        assert level_frames(result.stdout) == [32768, 240000 - 32768]
+        assert result.stderr == ""
+        assert result.exit_code == 0
+
+    @staticmethod
+    def test_stdin(runner, audio_content):
+        # Input that is not a regular file is read as raw audio.
+        result = runner.invoke(main.langgolem, ["prattle", "-i", "-"], input=audio_content)
+
+        assert sum(level_frames(result.stdout)) == 240000
+        assert result.stderr == ""
+        assert result.exit_code == 0
+
+    @staticmethod
+    def test_level_interval(runner, audio_file):
+        result = runner.invoke(
+            main.langgolem, ["prattle", "-i", str(audio_file), "--level-interval", "0"]
+        )
+
+        assert result.stdout == (
+            "frames=32768 rms=-4.8 dBFS peak=-0.0 dBFS clipped=0\n" * 7
+            + "frames=10624 rms=-4.8 dBFS peak=-0.0 dBFS clipped=0\n"
+        )
+        assert result.stderr == ""
+        assert result.exit_code == 0
+
+    @staticmethod
+    def test_fifo(runner, tmp_path, audio_content):
+        fifo_path = tmp_path / "audio.fifo"
+        os.mkfifo(fifo_path)
+
+        def write():
+            with fifo_path.open("wb") as fifo:
+                for start in range(0, len(audio_content), 4801):
+                    fifo.write(audio_content[start : start + 4801])
+                    fifo.flush()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        result = runner.invoke(main.langgolem, ["prattle", "-i", str(fifo_path)])
+        writer.join()
+
+        # Blocks are queued as they arrive, so their sizes depend on the writer.
+        assert sum(level_frames(result.stdout)) == 240000
+        assert result.stderr == ""
+        assert result.exit_code == 0
+
+    @staticmethod
+    def test_wav_file(runner, tmp_path, audio_content):
+        # The same audio in stereo at twice the rate reads as the same number of frames.
+        samples = np.frombuffer(audio_content, dtype="<i2")
+        wav_path = tmp_path / "audio.wav"
+        with wave.open(str(wav_path), "wb") as writer:
+            writer.setnchannels(2)
+            writer.setsampwidth(2)
+            writer.setframerate(48000)
+            writer.writeframes(np.repeat(samples, 4).tobytes())
+
+        result = runner.invoke(main.langgolem, ["prattle", "-i", str(wav_path)])
+
+        assert sum(level_frames(result.stdout)) == 240000
+        assert result.stderr == ""
+        assert result.exit_code == 0
+
+    @staticmethod
+    def test_invalid_wav_file(runner, tmp_path):
+        wav_path = tmp_path / "audio.wav"
+        wav_path.write_bytes(b"RIFF\x04\x00\x00\x00WAVE")
+
+        result = runner.invoke(main.langgolem, ["prattle", "-i", str(wav_path)])
+
+        assert result.stdout == ""
+        assert result.stderr == f"Cannot read {wav_path}: WAV file has no audio\n"
+        assert result.exit_code == 1
+
+    @staticmethod
+    def test_speed(runner, audio_file):
+        result = runner.invoke(
+            main.langgolem, ["prattle", "-i", str(audio_file), "--speed", "100"]
+        )
+
+        assert sum(level_frames(result.stdout)) == 240000
+        assert result.stderr == ""
+        assert result.exit_code == 0
+
+    @staticmethod
+    def test_invalid_speed(runner, audio_file):
+        result = runner.invoke(main.langgolem, ["prattle", "-i", str(audio_file), "--speed", "0"])
+
+        assert result.exit_code == 2
+        assert "Invalid value for '--speed'" in result.stderr
+
+    @staticmethod
+    def test_overload_policy(runner, audio_file):
+        result = runner.invoke(
+            main.langgolem,
+            [
+                "prattle",
+                "-i",
+                str(audio_file),
+                "--queue-size",
+                "1",
+                "--overload-policy",
+                "coalesce",
+            ],
+        )
+
         assert result.stderr == ""
         assert result.exit_code == 0
+        assert sum(level_frames(result.stdout)) == 240000
+
+    @staticmethod
+    def test_invalid_queue_size(runner, audio_file):
+        result = runner.invoke(
+            main.langgolem, ["prattle", "-i", str(audio_file), "--queue-size", "0"]
+        )
+
+        assert result.exit_code == 2
+        assert "Invalid value for '--queue-size'" in result.stderr
+
+    @staticmethod
+    def test_latency_report(runner, audio_file):
+        result = runner.invoke(
+            main.langgolem, ["prattle", "-i", str(audio_file), "--latency-report"]
+        )
+
+        assert result.exit_code == 0
+        (line,) = result.stderr.splitlines()
+        assert re.fullmatch(r"queue: n=8 p50=[\d.]+ p90=[\d.]+ p99=[\d.]+ max=[\d.]+ ms", line)
+
+    @staticmethod
+    def test_monitor_lag(runner, audio_file):
+        result = runner.invoke(main.langgolem, ["prattle", "-i", str(audio_file), "--monitor-lag"])
+
+        assert result.exit_code == 0
+        line = result.stderr.splitlines()[-1]
+        assert re.fullmatch(
+            r"loop lag: n=\d+ p50=[\w.]+ p90=[\w.]+ p99=[\w.]+ max=[\d.]+ ms, \d+ over 20.0 ms",
+            line,
+        )
+
+    @staticmethod
+    def test_loop(runner, audio_file):
+        result = runner.invoke(
+            main.langgolem, ["prattle", "-i", str(audio_file), "--loop", "auto"]
+        )
+
+        assert sum(level_frames(result.stdout)) == 240000
+        assert result.exit_code == 0
+
+    @staticmethod
+    def test_uvloop_not_installed(runner, audio_file, monkeypatch):
+        monkeypatch.setitem(sys.modules, "uvloop", None)
+
+        result = runner.invoke(
+            main.langgolem, ["prattle", "-i", str(audio_file), "--loop", "uvloop"]
+        )
+
+        assert result.stdout == ""
+        assert result.stderr == "Cannot run on uvloop: uvloop is not installed\n"
+        assert result.exit_code == 1
@@ -0,0 +1,154 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from langgolem.util import jitter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def buffer(clock) -> jitter.JitterBuffer:
+    # One byte per millisecond.
+    return jitter.JitterBuffer(bytes_per_second=1000.0, min_delay=0.01, max_delay=0.1, clock=clock)
+
+
+class TestJitterBuffer:
+    @staticmethod
+    def test_constructor(buffer):
+        assert buffer.bytes_per_second == 1000.0
+        assert buffer.jitter == 0.0
+        assert buffer.target_delay == 0.01
+        assert buffer.buffered_bytes == 0
+        assert buffer.buffered_duration == 0.0
+        assert not buffer.playing
+        assert buffer.underrun_count == 0
+        assert buffer.flush_count == 0
+        assert buffer.added_latencies == ()
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "kwargs, message",
+        [
+            ({"bytes_per_second": 0.0}, "^bytes_per_second must be positive$"),
+            ({"min_delay": -1.0}, "^min_delay must not be negative$"),
+            ({"min_delay": 0.2, "max_delay": 0.1}, "^max_delay must be at least min_delay$"),
+        ],
+    )
+    def test_invalid(kwargs, message):
+        kwargs = {"bytes_per_second": 1000.0} | kwargs
+        with pytest.raises(ValueError, match=message):
+            jitter.JitterBuffer(**kwargs)
+
+    @staticmethod
+    def test_idle(buffer):
+        assert buffer.get(4) == bytes(4)
+        assert buffer.underrun_count == 0
+
+    @staticmethod
+    def test_prebuffer(buffer, clock):
+        buffer.put(b"abcde")
+        assert buffer.get(4) == bytes(4)
+        assert not buffer.playing
+
+        clock.now = 0.005
+        buffer.put(b"fghij")
+        assert buffer.get(4) == b"abcd"
+        assert buffer.playing
+        assert buffer.added_latencies == (0.005,)
+
+    @staticmethod
+    def test_burst_is_not_late(buffer):
+        for _ in range(10):
+            buffer.put(b"a" * 20)
+
+        assert buffer.jitter == 0.0
+
+    @staticmethod
+    def test_late_arrivals(buffer, clock):
+        # Chunks of 20ms that arrive 40ms apart.
+        for index in range(10):
+            clock.now = index * 0.04
+            buffer.put(b"a" * 20)
+
+        assert buffer.jitter > 0.1
+        assert buffer.target_delay == 0.1
+
+    @staticmethod
+    def test_jitter_decays(buffer, clock):
+        buffer.put(b"a" * 20)
+        clock.now = 0.06
+        buffer.put(b"a" * 20)
+        peak = buffer.jitter
+
+        # Back on schedule.
+        for index in range(2, 50):
+            clock.now = index * 0.02
+            buffer.put(b"a" * 20)
+
+        assert 0.0 < buffer.jitter < peak / 4
+
+    @staticmethod
+    def test_underrun(buffer, clock):
+        buffer.put(b"a" * 10)
+        assert buffer.get(6) == b"a" * 6
+
+        assert buffer.get(6) == b"a" * 4 + bytes(2)
+        assert buffer.underrun_count == 1
+        assert not buffer.playing
+
+        # The late arrival raises the target delay.
+        clock.now = 0.5
+        buffer.put(b"b" * 10)
+        assert buffer.get(4) == bytes(4)
+        buffer.put(b"b" * 100)
+        assert buffer.get(4) == b"bbbb"
+        assert buffer.added_latencies == (0.0, 0.5)
+
+    @staticmethod
+    def test_end(buffer):
+        buffer.put(b"abc")
+        buffer.end()
+
+        # An ended stream plays at once and running out of it is not an underrun.
+        assert buffer.get(4) == b"abc\x00"
+        assert buffer.underrun_count == 0
+        assert not buffer.playing
+        assert buffer.get(4) == bytes(4)
+
+    @staticmethod
+    def test_next_stream_after_end(buffer, clock):
+        buffer.put(b"a" * 10)
+        buffer.end()
+        assert buffer.get(4) == b"aaaa"
+
+        clock.now = 1.0
+        buffer.put(b"b" * 10)
+
+        assert buffer.jitter == 0.0
+        assert buffer.get(8) == b"aaaaaabb"
+        assert buffer.playing
+
+    @staticmethod
+    def test_flush(buffer):
+        buffer.put(b"a" * 20)
+        assert buffer.get(4) == b"aaaa"
+
+        buffer.flush()
+
+        assert buffer.flush_count == 1
+        assert buffer.buffered_bytes == 0
+        assert not buffer.playing
+        assert buffer.get(4) == bytes(4)
+        assert buffer.underrun_count == 0
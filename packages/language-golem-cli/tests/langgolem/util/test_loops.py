@@ -0,0 +1,138 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import re
+import sys
+import time
+import types
+
+import pytest
+from langgolem.util import loops
+
+
+class TestLoopFactory:
+    @staticmethod
+    @pytest.fixture
+    def fake_uvloop(monkeypatch) -> types.ModuleType:
+        module = types.ModuleType("uvloop")
+        module.new_event_loop = asyncio.new_event_loop  # type: ignore[attr-defined]
+        monkeypatch.setitem(sys.modules, "uvloop", module)
+        return module
+
+    @staticmethod
+    @pytest.fixture
+    def no_uvloop(monkeypatch):
+        # A None entry makes the import fail as if the package were not installed.
+        monkeypatch.setitem(sys.modules, "uvloop", None)
+
+    @staticmethod
+    def test_asyncio(fake_uvloop):
+        assert loops.loop_factory(loops.LoopImplementation.ASYNCIO) is None
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "implementation", [loops.LoopImplementation.UVLOOP, loops.LoopImplementation.AUTO]
+    )
+    def test_uvloop(fake_uvloop, implementation):
+        factory = loops.loop_factory(implementation)
+        assert factory is fake_uvloop.new_event_loop
+
+    @staticmethod
+    def test_auto_without_uvloop(no_uvloop):
+        assert loops.loop_factory(loops.LoopImplementation.AUTO) is None
+
+    @staticmethod
+    def test_uvloop_not_installed(no_uvloop):
+        with pytest.raises(ValueError, match="^uvloop is not installed$"):
+            loops.loop_factory(loops.LoopImplementation.UVLOOP)
+
+
+class TestLagMonitor:
+    @staticmethod
+    def test_constructor():
+        monitor = loops.LagMonitor(0.5)
+        assert monitor.interval == 0.5
+        assert monitor.threshold is None
+        assert monitor.samples == ()
+        assert monitor.count == 0
+        assert monitor.histogram.count == 0
+        assert monitor.max_lag == 0.0
+        assert monitor.late_count == 0
+
+    @staticmethod
+    @pytest.mark.parametrize("interval", [0.0, -1.0])
+    def test_invalid_interval(interval):
+        with pytest.raises(ValueError, match="^interval must be positive$"):
+            loops.LagMonitor(interval)
+
+    @staticmethod
+    def test_invalid_threshold():
+        with pytest.raises(ValueError, match="^threshold must be positive$"):
+            loops.LagMonitor(threshold=0.0)
+
+    @staticmethod
+    def test_invalid_window():
+        with pytest.raises(ValueError, match="^window must not be negative$"):
+            loops.LagMonitor(window=-1)
+
+    @staticmethod
+    async def test_late():
+        late: list[float] = []
+        monitor = loops.LagMonitor(0.001, threshold=0.03, on_late=late.append)
+        task = asyncio.create_task(monitor.run())
+        try:
+            await asyncio.sleep(0.01)
+            time.sleep(0.05)
+            await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert monitor.late_count == 1
+        assert late == [monitor.max_lag]
+        assert re.fullmatch(
+            r"loop lag: n=\d+ p50=[\d.]+ p90=[\d.]+ p99=[\d.]+ max=[\d.]+ ms, 1 over 30.0 ms",
+            monitor.report(),
+        )
+
+    @staticmethod
+    def test_report_without_threshold():
+        assert loops.LagMonitor().report() == "loop lag: n=0 p50=nan p90=nan p99=nan max=0.0 ms"
+
+    @staticmethod
+    async def test_run():
+        monitor = loops.LagMonitor(0.001)
+        task = asyncio.create_task(monitor.run())
+        try:
+            await asyncio.sleep(0.01)
+            # Block the loop so that the next sample is late.
+            time.sleep(0.05)
+            await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert len(monitor.samples) > 1
+        assert all(sample >= 0.0 for sample in monitor.samples)
+        assert monitor.count == len(monitor.samples)
+        assert monitor.max_lag >= 0.04
+        assert monitor.histogram.max == monitor.max_lag
+
+    @staticmethod
+    async def test_window():
+        monitor = loops.LagMonitor(0.001, window=2)
+        task = asyncio.create_task(monitor.run())
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        # Only the latest samples are kept, but all of them are counted.
+        assert len(monitor.samples) == 2
+        assert monitor.count > 2
+        assert monitor.report().startswith(f"loop lag: n={monitor.count} ")
@@ -0,0 +1,56 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from langgolem.util import pools
+
+
+class TestBufferPool:
+    @staticmethod
+    def test_constructor():
+        pool = pools.BufferPool()
+        assert pool.max_free == 64
+        assert pool.allocated_count == 0
+        assert pool.reused_count == 0
+        assert pool.free_count == 0
+
+    @staticmethod
+    def test_invalid():
+        with pytest.raises(ValueError, match="^max_free must not be negative$"):
+            pools.BufferPool(max_free=-1)
+
+    @staticmethod
+    @pytest.mark.parametrize("size", [0, 1, 960])
+    def test_acquire(size):
+        pool = pools.BufferPool()
+        assert len(pool.acquire(size)) == size
+        assert pool.allocated_count == 1
+
+    @staticmethod
+    def test_acquire_negative():
+        with pytest.raises(ValueError, match="^size must not be negative$"):
+            pools.BufferPool().acquire(-1)
+
+    @staticmethod
+    def test_reuse():
+        pool = pools.BufferPool()
+        buffer = pool.acquire(20)
+        pool.release(buffer)
+        assert pool.free_count == 1
+
+        # Only buffers of the same size are reused.
+        assert len(pool.acquire(10)) == 10
+        assert pool.acquire(20) is buffer
+        assert pool.allocated_count == 2
+        assert pool.reused_count == 1
+        assert pool.free_count == 0
+
+    @staticmethod
+    def test_max_free():
+        pool = pools.BufferPool(max_free=1)
+        pool.release(pool.acquire(1))
+        pool.release(pool.acquire(2))
+
+        assert pool.free_count == 1
+        pool.acquire(2)
+        assert pool.reused_count == 0
@@ -3,6 +3,7 @@
 
 import asyncio
 import string
+import threading
 
 import pytest
 from langgolem.util import queues
@@ -65,6 +66,285 @@ class TestEmptyQueue:
         assert q.qsize() == 0
 
 
+class TestGetMany:
+    @staticmethod
+    async def test_waits_for_first_item():
+        q = asyncio.Queue[int]()
+        task = asyncio.create_task(queues.get_many(q))
+        await asyncio.sleep(0)
+        assert not task.done()
+
+        queues.populate_queue(q, [1, 2, 3])
+        assert await task == [1, 2, 3]
+        assert q.empty()
+
+    @staticmethod
+    async def test_max_items():
+        q = queues.populated_queue([1, 2, 3])
+        assert await queues.get_many(q, max_items=2) == [1, 2]
+        assert await queues.get_many(q, max_items=2) == [3]
+
+    @staticmethod
+    async def test_max_bytes():
+        q = queues.populated_queue([b"ab", b"cd", b"ef", b"g"])
+        # The item that reaches the limit is taken.
+        assert await queues.get_many(q, max_bytes=3, size=len) == [b"ab", b"cd"]
+        assert await queues.get_many(q, max_bytes=1, size=len) == [b"ef"]
+        assert await queues.get_many(q, max_bytes=3, size=len) == [b"g"]
+
+    @staticmethod
+    async def test_timeout():
+        q = asyncio.Queue[int]()
+        assert await queues.get_many(q, timeout=0.01) == []
+
+    @staticmethod
+    @pytest.mark.parametrize("attempt", range(20))
+    async def test_item_at_deadline(attempt):
+        loop = asyncio.get_running_loop()
+        q = asyncio.Queue[int]()
+        # The item is queued by a timer due at the same time as the timeout.
+        loop.call_at(loop.time() + 0.005, q.put_nowait, 1)
+
+        async with asyncio.timeout(1.0):
+            batch = await queues.get_many(q, timeout=0.005)
+
+        # The item is either taken or left on the queue, never lost.
+        await asyncio.sleep(0.01)
+        assert batch + queues.empty_queue(q) == [1]
+
+    @staticmethod
+    async def test_cancel():
+        q = asyncio.Queue[int]()
+        task = asyncio.create_task(queues.get_many(q))
+        await asyncio.sleep(0)
+
+        q.put_nowait(1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+
+        # An item taken while the caller was cancelled is put back.
+        assert queues.empty_queue(q) == [1]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "kwargs, message",
+        [
+            ({"max_items": 0}, "^max_items must be at least 1$"),
+            ({"max_bytes": 10}, "^size is required to limit bytes$"),
+        ],
+    )
+    async def test_invalid(kwargs, message):
+        with pytest.raises(ValueError, match=message):
+            await queues.get_many(queues.populated_queue([1]), **kwargs)
+
+
+class TestDrainUntil:
+    @staticmethod
+    async def test_deadline():
+        loop = asyncio.get_running_loop()
+        q = queues.populated_queue([1])
+
+        async def produce():
+            await asyncio.sleep(0.01)
+            q.put_nowait(2)
+            await asyncio.sleep(0.2)
+            q.put_nowait(3)
+
+        task = asyncio.create_task(produce())
+        # Items that arrive before the deadline are taken as they arrive.
+        assert await queues.drain_until(q, loop.time() + 0.1) == [1, 2]
+        task.cancel()
+
+    @staticmethod
+    async def test_passed_deadline():
+        loop = asyncio.get_running_loop()
+        q = queues.populated_queue([1, 2])
+        assert await queues.drain_until(q, loop.time() - 1.0) == [1, 2]
+
+    @staticmethod
+    async def test_limits():
+        loop = asyncio.get_running_loop()
+        q = queues.populated_queue([b"ab", b"cd", b"ef"])
+        deadline = loop.time() + 10.0
+
+        assert await queues.drain_until(q, deadline, max_items=1) == [b"ab"]
+        assert await queues.drain_until(q, deadline, max_bytes=2, size=len) == [b"cd"]
+        assert await queues.drain_until(q, deadline, max_items=1) == [b"ef"]
+
+
+class TestBoundedQueue:
+    @staticmethod
+    def test_constructor():
+        q = queues.BoundedQueue[int](3)
+        assert q.maxsize == 3
+        assert q.policy == queues.OverloadPolicy.BLOCK
+        assert q.dropped_count == 0
+        assert q.dropped_size == 0
+        assert q.coalesced_count == 0
+
+    @staticmethod
+    def test_unbounded():
+        with pytest.raises(ValueError, match="^maxsize must be at least 1$"):
+            queues.BoundedQueue[int](0)
+
+    @staticmethod
+    def test_coalesce_without_merge():
+        with pytest.raises(ValueError, match="^merge is required to coalesce$"):
+            queues.BoundedQueue[int](1, policy=queues.OverloadPolicy.COALESCE)
+
+    @staticmethod
+    async def test_block():
+        q = queues.BoundedQueue[int](2)
+        await q.put(1)
+        await q.put(2)
+        with pytest.raises(asyncio.QueueFull):
+            q.put_nowait(3)
+
+        putter = asyncio.create_task(q.put(3))
+        await asyncio.sleep(0)
+        assert not putter.done()
+        assert await q.get() == 1
+        await putter
+        assert queues.empty_queue(q) == [2, 3]
+
+    @staticmethod
+    async def test_drop_oldest():
+        q = queues.BoundedQueue[str](2, policy=queues.OverloadPolicy.DROP_OLDEST, size=len)
+        for item in ["a", "bb", "ccc", "dddd"]:
+            await q.put(item)
+
+        assert queues.empty_queue(q) == ["ccc", "dddd"]
+        assert q.dropped_count == 2
+        assert q.dropped_size == 3
+
+    @staticmethod
+    async def test_drop_oldest_task_done():
+        q = queues.BoundedQueue[int](1, policy=queues.OverloadPolicy.DROP_OLDEST)
+        q.put_nowait(1)
+        q.put_nowait(2)
+        q.get_nowait()
+        q.task_done()
+
+        await asyncio.wait_for(q.join(), 1.0)
+
+    @staticmethod
+    async def test_drop_newest():
+        q = queues.BoundedQueue[int](2, policy=queues.OverloadPolicy.DROP_NEWEST)
+        for item in [1, 2, 3, 4]:
+            await q.put(item)
+
+        assert queues.empty_queue(q) == [1, 2]
+        assert q.dropped_count == 2
+        assert q.dropped_size == 2
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "policy, expected",
+        [(queues.OverloadPolicy.DROP_OLDEST, [1, 2]), (queues.OverloadPolicy.DROP_NEWEST, [3, 4])],
+    )
+    def test_on_drop(policy, expected):
+        dropped: list[int] = []
+        q = queues.BoundedQueue[int](2, policy=policy, on_drop=dropped.append)
+        for item in [1, 2, 3, 4]:
+            q.put_nowait(item)
+
+        assert dropped == expected
+
+    @staticmethod
+    async def test_coalesce():
+        q = queues.BoundedQueue[str](
+            2, policy=queues.OverloadPolicy.COALESCE, merge=lambda a, b: a + b
+        )
+        for item in ["a", "b", "c", "d"]:
+            await q.put(item)
+
+        assert queues.empty_queue(q) == ["a", "bcd"]
+        assert q.coalesced_count == 2
+        assert q.dropped_count == 0
+
+
+class TestThreadWakeup:
+    @staticmethod
+    async def test_coalesced():
+        wakeup = queues.ThreadWakeup(asyncio.get_running_loop())
+        thread = threading.Thread(target=lambda: [wakeup.notify() for _ in range(100)])
+        thread.start()
+        thread.join()
+
+        await wakeup.wait()
+        assert wakeup.wakeup_count == 1
+
+        # Notifications after a wakeup schedule another.
+        wakeup.notify()
+        await asyncio.wait_for(wakeup.wait(), 1.0)
+        assert wakeup.wakeup_count == 2
+
+    @staticmethod
+    def test_closed_loop():
+        loop = asyncio.new_event_loop()
+        wakeup = queues.ThreadWakeup(loop)
+        loop.close()
+        wakeup.notify()
+
+
+class TestThreadChannel:
+    @staticmethod
+    async def test_burst():
+        channel = queues.ThreadChannel[int](asyncio.get_running_loop())
+
+        def produce():
+            for item in range(100):
+                channel.put(item)
+            channel.close()
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        thread.join()
+
+        assert await channel.get_many() == list(range(100))
+        assert await channel.get_many() == []
+        assert channel.wakeup_count == 0
+
+    @staticmethod
+    async def test_waits_for_items():
+        channel = queues.ThreadChannel[int](asyncio.get_running_loop())
+        task = asyncio.create_task(channel.get_many())
+        await asyncio.sleep(0)
+        assert not task.done()
+
+        thread = threading.Thread(target=lambda: (channel.put(1), channel.put(2)))
+        thread.start()
+        thread.join()
+
+        assert await asyncio.wait_for(task, 1.0) == [1, 2]
+        assert channel.wakeup_count == 1
+
+    @staticmethod
+    async def test_error():
+        channel = queues.ThreadChannel[int](asyncio.get_running_loop())
+        channel.put(1)
+        channel.close(OSError("read failed"))
+
+        # Items put before the error are taken first.
+        assert await channel.get_many() == [1]
+        with pytest.raises(OSError, match="^read failed$"):
+            await channel.get_many()
+
+    @staticmethod
+    async def test_take_nowait():
+        channel = queues.ThreadChannel[int](asyncio.get_running_loop())
+        assert channel.take_nowait() == []
+
+        channel.put(1)
+        channel.put(2)
+        channel.close(OSError("read failed"))
+
+        assert channel.take_nowait() == [1, 2]
+        assert channel.take_nowait() == []
+
+
 class TestQueueStream:
     @staticmethod
     @pytest.fixture
@@ -119,3 +399,129 @@ class TestQueueStream:
     @pytest.mark.parametrize("count", [None, -1, -2])
     def test_read_all(stream, count):
         assert stream.read(None) == b"abcdefghijklmnop"
+
+    @staticmethod
+    @pytest.mark.parametrize("queue_content", [[b"abcd", b"", bytearray(b"efgh"), b"ij"]])
+    def test_readinto(stream):
+        buffer = bytearray(3)
+        assert stream.readinto(buffer) == 3
+        assert buffer == b"abc"
+        assert stream.readinto(buffer) == 3
+        assert buffer == b"def"
+        assert stream.readinto(memoryview(buffer)[:2]) == 2
+        assert buffer == b"ghf"
+        assert stream.readinto(buffer) == 2
+        assert buffer[:2] == b"ij"
+        assert stream.readinto(buffer) == 0
+
+    @staticmethod
+    @pytest.mark.parametrize("queue_content", [[b"abcd", b"efgh"]])
+    def test_peek(stream, queue):
+        assert stream.peek(2) == b"ab"
+        assert queue.qsize() == 1
+        assert stream.peek(6) == b"abcdef"
+        assert queue.empty()
+        assert stream.read(3) == b"abc"
+        assert stream.peek(10) == b"defgh"
+        assert stream.peek() == b"defgh"
+        assert stream.read() == b"defgh"
+        assert stream.peek() == b""
+
+    @staticmethod
+    @pytest.mark.parametrize("queue_content", [[b"abcd"]])
+    def test_read_after_refill(stream, queue):
+        assert stream.read(3) == b"abc"
+        queue.put_nowait(b"ef")
+        assert stream.read(10) == b"def"
+
+
+class TestByteRing:
+    @staticmethod
+    def test_constructor():
+        ring = queues.ByteRing(8)
+        assert ring.capacity == 8
+        assert ring.size == 0
+        assert ring.free == 8
+        assert not ring.closed
+
+    @staticmethod
+    def test_invalid_capacity():
+        with pytest.raises(ValueError, match="^capacity must be at least 1$"):
+            queues.ByteRing(0)
+
+    @staticmethod
+    def test_nowait():
+        ring = queues.ByteRing(8)
+        assert ring.write_nowait(b"abcdef") == 6
+        assert ring.read_nowait(4) == b"abcd"
+        # Writes and reads wrap around the end of the buffer.
+        assert ring.write_nowait(memoryview(b"ghijklmn")) == 6
+        assert ring.size == 8
+        assert ring.free == 0
+        assert ring.write_nowait(b"x") == 0
+        assert ring.read_nowait() == b"efghijkl"
+        assert ring.read_nowait() == b""
+
+    @staticmethod
+    async def test_read():
+        ring = queues.ByteRing(8)
+        task = asyncio.create_task(ring.read())
+        await asyncio.sleep(0)
+        assert not task.done()
+
+        ring.write_nowait(b"abc")
+        assert await task == b"abc"
+
+    @staticmethod
+    async def test_read_exactly():
+        ring = queues.ByteRing(8)
+        task = asyncio.create_task(ring.read_exactly(5))
+        ring.write_nowait(b"abc")
+        await asyncio.sleep(0)
+        assert not task.done()
+
+        ring.write_nowait(b"defg")
+        assert await task == b"abcde"
+        assert ring.read_nowait() == b"fg"
+
+    @staticmethod
+    async def test_write_waits_for_room():
+        ring = queues.ByteRing(4)
+        task = asyncio.create_task(ring.write(b"abcdefghij"))
+        await asyncio.sleep(0)
+        assert ring.size == 4
+        assert not task.done()
+
+        # A reader of the whole stream frees room for the rest of the write.
+        assert await ring.read_exactly(4) == b"abcd"
+        assert await ring.read_exactly(4) == b"efgh"
+        assert await ring.read_exactly(2) == b"ij"
+        await task
+
+    @staticmethod
+    async def test_close():
+        ring = queues.ByteRing(8)
+        ring.write_nowait(b"abc")
+        ring.close()
+
+        assert ring.closed
+        with pytest.raises(RuntimeError, match="^ring is closed$"):
+            ring.write_nowait(b"d")
+        with pytest.raises(asyncio.IncompleteReadError) as error:
+            await ring.read_exactly(4)
+        assert error.value.partial == b"abc"
+        assert await ring.read() == b""
+
+    @staticmethod
+    async def test_close_wakes_reader():
+        ring = queues.ByteRing(8)
+        task = asyncio.create_task(ring.read())
+        await asyncio.sleep(0)
+
+        ring.close()
+        assert await task == b""
+
+    @staticmethod
+    async def test_read_exactly_over_capacity():
+        with pytest.raises(ValueError, match="^count must not exceed capacity$"):
+            await queues.ByteRing(4).read_exactly(5)
@@ -0,0 +1,134 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import math
+
+import pytest
+from langgolem.util import stats
+
+
+class TestPercentile:
+    @staticmethod
+    def test_empty():
+        assert math.isnan(stats.percentile([], 0.5))
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "fraction, expected",
+        [(0.0, 1.0), (0.1, 1.0), (0.5, 5.0), (0.51, 6.0), (0.99, 10.0), (1.0, 10.0)],
+    )
+    def test_nearest_rank(fraction, expected):
+        values = [10.0, 3.0, 1.0, 7.0, 5.0, 2.0, 9.0, 4.0, 8.0, 6.0]
+        assert stats.percentile(values, fraction) == expected
+
+    @staticmethod
+    @pytest.mark.parametrize("fraction", [-0.1, 1.1])
+    def test_invalid_fraction(fraction):
+        with pytest.raises(ValueError, match="^fraction must be between 0 and 1$"):
+            stats.percentile([1.0], fraction)
+
+
+class TestHistogram:
+    @staticmethod
+    def test_constructor():
+        histogram = stats.Histogram()
+        assert histogram.lowest == 1e-6
+        assert histogram.highest == 3600.0
+        assert histogram.significant_figures == 2
+        assert histogram.count == 0
+        assert math.isnan(histogram.min)
+        assert math.isnan(histogram.max)
+        assert math.isnan(histogram.mean)
+        assert math.isnan(histogram.percentile(0.5))
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "kwargs, message",
+        [
+            ({"lowest": 0.0}, "^lowest must be positive$"),
+            ({"lowest": 1.0, "highest": 1.5}, "^highest must be at least twice lowest$"),
+            ({"significant_figures": 0}, "^significant_figures must be between 1 and 5$"),
+            ({"significant_figures": 6}, "^significant_figures must be between 1 and 5$"),
+        ],
+    )
+    def test_invalid(kwargs, message):
+        with pytest.raises(ValueError, match=message):
+            stats.Histogram(**kwargs)
+
+    @staticmethod
+    def test_record():
+        histogram = stats.Histogram()
+        for value in (0.003, 0.001, 0.002):
+            histogram.record(value)
+
+        assert histogram.count == 3
+        assert histogram.min == 0.001
+        assert histogram.max == 0.003
+        assert histogram.mean == pytest.approx(0.002)
+
+    @staticmethod
+    def test_negative():
+        with pytest.raises(ValueError, match="^value must not be negative$"):
+            stats.Histogram().record(-1.0)
+
+    @staticmethod
+    @pytest.mark.parametrize("significant_figures", [1, 2, 3])
+    def test_relative_error(significant_figures):
+        histogram = stats.Histogram(significant_figures=significant_figures)
+        values = [0.01 * 1.1**power for power in range(100)]
+        for value in values:
+            histogram.record(value)
+
+        # Nearest-rank percentiles agree with the exact ones to the requested precision.
+        for fraction in (0.1, 0.25, 0.5, 0.9, 0.99):
+            exact = stats.percentile(values, fraction)
+            assert histogram.percentile(fraction) == pytest.approx(
+                exact, rel=10**-significant_figures
+            )
+
+    @staticmethod
+    def test_percentile_within_range():
+        histogram = stats.Histogram()
+        histogram.record(0.0123)
+
+        assert histogram.percentile(0.0) == 0.0123
+        assert histogram.percentile(1.0) == 0.0123
+
+    @staticmethod
+    def test_out_of_range():
+        histogram = stats.Histogram(lowest=0.001, highest=1.0)
+        histogram.record(0.0001)
+        histogram.record(10.0)
+
+        assert histogram.count == 2
+        assert histogram.max == 10.0
+        assert histogram.percentile(0.5) == 0.0001
+        assert histogram.percentile(1.0) == pytest.approx(1.0, rel=0.01)
+
+    @staticmethod
+    @pytest.mark.parametrize("fraction", [-0.1, 1.1])
+    def test_invalid_fraction(fraction):
+        with pytest.raises(ValueError, match="^fraction must be between 0 and 1$"):
+            stats.Histogram().percentile(fraction)
+
+    @staticmethod
+    def test_merge():
+        histogram = stats.Histogram()
+        histogram.record(0.001)
+        other = stats.Histogram()
+        other.record(0.005)
+        other.record(0.003)
+
+        histogram.merge(other)
+
+        assert histogram.count == 3
+        assert histogram.min == 0.001
+        assert histogram.max == 0.005
+        assert histogram.percentile(0.5) == pytest.approx(0.003, rel=0.01)
+
+    @staticmethod
+    def test_merge_mismatch():
+        with pytest.raises(
+            ValueError, match="^Histograms must have the same range and precision$"
+        ):
+            stats.Histogram().merge(stats.Histogram(significant_figures=3))
@@ -0,0 +1,73 @@
+# Copyright 2025 The Milton Hirsch Institute, B.V.
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from langgolem.util import tracing
+
+
+def counts(tracer: tracing.LatencyTracer) -> dict[tracing.Stage, int]:
+    return {stage: h.count for stage, h in tracer.histograms.items() if h.count}
+
+
+class TestLatencyTracer:
+    @staticmethod
+    def test_constructor():
+        tracer = tracing.LatencyTracer(significant_figures=3)
+        assert set(tracer.histograms) == set(tracing.Stage)
+        for histogram in tracer.histograms.values():
+            assert histogram.count == 0
+            assert histogram.significant_figures == 3
+        assert tracer.report() == []
+
+    @staticmethod
+    def test_record():
+        tracer = tracing.LatencyTracer()
+        tracer.record(tracing.Stage.QUEUE, 0.002)
+        tracer.record_all(tracing.Stage.PLAYBACK, [0.05, 0.07])
+
+        assert counts(tracer) == {tracing.Stage.QUEUE: 1, tracing.Stage.PLAYBACK: 2}
+        assert tracer.histograms[tracing.Stage.QUEUE].max == 0.002
+
+    @staticmethod
+    def test_negative():
+        tracer = tracing.LatencyTracer()
+        tracer.record(tracing.Stage.QUEUE, -0.001)
+        assert tracer.histograms[tracing.Stage.QUEUE].max == 0.0
+
+    @staticmethod
+    def test_turn():
+        tracer = tracing.LatencyTracer()
+        tracer.commit_sent(1.0, 1.25)
+        tracer.commit_sent(2.0, 2.25)
+
+        tracer.commit_acknowledged(1.5)
+        tracer.response_started(3.0)
+        # Only the first audio of a response after an acknowledgement is traced.
+        tracer.response_started(4.0)
+        tracer.commit_acknowledged(2.5)
+
+        histograms = tracer.histograms
+        assert histograms[tracing.Stage.ACK].count == 2
+        assert histograms[tracing.Stage.ACK].max == pytest.approx(0.25)
+        assert histograms[tracing.Stage.RESPONSE].count == 1
+        assert histograms[tracing.Stage.RESPONSE].max == pytest.approx(1.5)
+        assert histograms[tracing.Stage.TURN].count == 1
+        assert histograms[tracing.Stage.TURN].max == pytest.approx(2.0)
+
+    @staticmethod
+    def test_unexpected_events():
+        tracer = tracing.LatencyTracer()
+        tracer.commit_acknowledged(1.0)
+        tracer.response_started(2.0)
+        assert counts(tracer) == {}
+
+    @staticmethod
+    def test_report():
+        tracer = tracing.LatencyTracer()
+        tracer.record_all(tracing.Stage.UPLOAD, [0.01, 0.02, 0.04])
+        tracer.record(tracing.Stage.QUEUE, 0.001)
+
+        assert tracer.report() == [
+            "queue: n=1 p50=1.0 p90=1.0 p99=1.0 max=1.0 ms",
+            "upload: n=3 p50=20.1 p90=40.0 p99=40.0 max=40.0 ms",
+        ]
@@ -14,3 +14,13 @@ def test_bytes_reader():
 
     fn(io.BytesIO())
     fn(queues.QueueStream(asyncio.Queue[bytes]()))
+
+
+def test_read_into_reader():
+    def fn(reader: types.ReadIntoReader):
+        pass
+
+    fn(io.BytesIO())
+    fn(queues.QueueStream(asyncio.Queue[bytes]()))
+    assert isinstance(queues.QueueStream(asyncio.Queue[bytes]()), types.ReadIntoReader)
+    assert not isinstance(object(), types.ReadIntoReader)